@@ -20,6 +20,7 @@ from argus.backend.controller.planner_api import bp as planner_bp
 from argus.backend.service.argus_service import ArgusService, ScheduleUpdateRequest
 from argus.backend.service.results_service import ResultsService
 from argus.backend.service.testrun import TestRunService
+from argus.backend.service.test_lookup import TEST_SEARCH_INDEX
 from argus.backend.service.user import UserService, api_login_required
 from argus.backend.service.stats import ReleaseStatsCollector
 from argus.backend.models.web import ArgusRelease, ArgusGroup, ArgusTest, User, UserOauthToken
@@ -376,6 +377,7 @@ def set_test_plugin(test_id: str):
     test: ArgusTest = ArgusTest.get(id=UUID(test_id))
     test.plugin_name = payload["plugin_name"]
     test.save()
+    TEST_SEARCH_INDEX.entity_changed(test)
 
     return {
         "status": "ok",
@@ -405,6 +407,8 @@ def test_results():
     start_date_str = request.args.get("startDate")
     end_date_str = request.args.get("endDate")
     table_names = request.args.getlist("tableNames[]")
+    max_points = request.args.get("maxPoints", type=int)
+    aggregate = request.args.get("aggregate")
 
     if not test_id:
         raise Exception("No testId provided")
@@ -418,7 +422,8 @@ def test_results():
         return Response(status=200 if exists else 404)
 
     graphs, ticks, releases_filters = service.get_test_graphs(test_id=UUID(
-        test_id), start_date=start_date, end_date=end_date, table_names=table_names)
+        test_id), start_date=start_date, end_date=end_date, table_names=table_names, max_points=max_points,
+        aggregate=aggregate)
     graph_views = service.get_argus_graph_views(test_id=UUID(test_id))
 
     return {
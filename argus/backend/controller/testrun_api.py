@@ -139,6 +139,21 @@ def download_log(plugin_name: str, run_id: str, log_name: str):
     return redirect(result, code=302)
 
 
+@bp.route("/tests/<string:plugin_name>/<string:run_id>/logs/sizes", methods=["GET"])
+@api_login_required
+def log_sizes(plugin_name: str, run_id: str):
+    service = TestRunService()
+    result = service.resolve_run_artifact_sizes(
+        plugin_name=plugin_name,
+        run_id=UUID(run_id),
+    )
+
+    return {
+        "status": "ok",
+        "response": result
+    }
+
+
 @bp.route("/tests/<string:plugin_name>/<string:run_id>/screenshot/<string:image_name>", methods=["GET"])
 @api_login_required
 def proxy_screenshot(plugin_name: str, run_id: str, image_name: str):
@@ -406,6 +406,18 @@ class ReleaseStatsSnapshot(Model):
     generated_at = columns.DateTime()
 
 
+class ReleaseStatsRebuildLease(Model):
+    """Cross-process lease on a ReleaseStatsSnapshot rebuild.
+    Acquired with a lightweight transaction and a TTL, so a crashed owner
+    only blocks other workers until the lease expires.
+    """
+    __table_name__ = "argus_release_stats_rebuild_lease"
+    release_id = columns.UUID(partition_key=True)
+    filter_key = columns.Text(primary_key=True)
+    owner = columns.Text()
+    acquired_at = columns.DateTime()
+
+
 class ReleaseDistinctVersions(Model):
     """Denormalized index: distinct scylla_version values seen for a release.
     Replaces the expensive GSI scan in get_distinct_product_versions.
@@ -424,6 +436,57 @@ class ReleaseDistinctImages(Model):
     image_id = columns.Text(primary_key=True)
 
 
+class ReleaseTestStatus(Model):
+    """Materialized runs deciding the latest worst-case status of a test, per reported version.
+    Updated in place on run status, investigation status, assignee and version changes,
+    so limited release/view dashboards aggregate these rows instead of fanning out over run tables.
+    Runs without a version are stored under an empty version.
+    """
+    __table_name__ = "argus_release_test_status"
+    release_id = columns.UUID(partition_key=True)
+    test_id = columns.UUID(primary_key=True)
+    version = columns.Text(primary_key=True)
+    run_id = columns.UUID(primary_key=True)
+    build_id = columns.Text()
+    build_number = columns.Integer()
+    build_job_url = columns.Text()
+    status = columns.Text()
+    investigation_status = columns.Text()
+    assignee = columns.UUID()
+    start_time = columns.DateTime()
+    updated_at = columns.DateTime()
+
+
+class ArgusActiveRun(Model):
+    """Denormalized index: runs of a plugin that are created or running.
+    Runs enter on submission and leave on a terminal status. Rows are clustered by the bucket
+    of the last heartbeat, so stuck runs are found with a range read of the oldest buckets
+    instead of filtering the whole run table.
+    """
+    __table_name__ = "argus_active_run"
+    plugin_name = columns.Text(partition_key=True)
+    heartbeat_bucket = columns.Integer(primary_key=True, clustering_order="ASC")
+    run_id = columns.UUID(primary_key=True)
+    build_id = columns.Text()
+    start_time = columns.DateTime()
+    release_id = columns.UUID()
+    group_id = columns.UUID()
+    test_id = columns.UUID()
+    status = columns.Text()
+
+
+class ArgusRunLocation(Model):
+    """Lookup table: plugin and primary key of a run by its id.
+    Written when a run is submitted, so a run is found with a single partition read
+    instead of a query on the id index of every plugin table.
+    """
+    __table_name__ = "argus_run_location"
+    run_id = columns.UUID(partition_key=True)
+    plugin_name = columns.Text()
+    build_id = columns.Text()
+    start_time = columns.DateTime()
+
+
 _SNAPSHOT_LOGGER = logging.getLogger(__name__)
 
 
@@ -485,6 +548,10 @@ USED_MODELS: list[Model] = [
     SSHTunnelKey,
     ProxyTunnelConfig,
     ReleaseStatsSnapshot,
+    ReleaseStatsRebuildLease,
+    ReleaseTestStatus,
+    ArgusActiveRun,
+    ArgusRunLocation,
 ]
 
 USED_TYPES: list[UserType] = [
@@ -1,5 +1,6 @@
 import logging
-from collections.abc import Iterable
+from collections import deque
+from collections.abc import Iterable, Iterator
 from datetime import datetime, UTC
 from math import ceil
 from uuid import UUID
@@ -8,10 +9,13 @@ from cassandra.cqlengine import columns
 from cassandra.cqlengine.models import Model
 from cassandra.cqlengine.usertype import UserType
 from cassandra.concurrent import execute_concurrent_with_args
+from cassandra.cluster import ResultSet
 from flask import Blueprint
 from argus.backend.db import ScyllaCluster
 from argus.backend.models.plan import ArgusReleasePlan
+from argus.backend.models.runtime_store import RuntimeStore
 from argus.backend.models.web import (
+    ArgusActiveRun,
     ArgusTest,
     ArgusGroup,
     ArgusRelease,
@@ -22,10 +26,20 @@ from argus.backend.models.web import (
     ReleaseStatsSnapshot,
     ReleaseDistinctVersions,
 )
+from argus.backend.plugins.locator import RUN_LOCATOR
+from argus.backend.util.background import CLIENT_SIDE_EFFECTS
+from argus.backend.util.cache import HEARTBEAT_BUCKET_CACHE, TEST_SEARCH_INDEX_GENERATION_KEY, CacheGeneration
 from argus.backend.util.common import chunk
 from argus.common.enums import TestInvestigationStatus, TestStatus
 
 LOGGER = logging.getLogger(__name__)
+ACTIVE_RUN_STATUSES = (TestStatus.CREATED.value, TestStatus.RUNNING.value)
+ACTIVE_RUN_BUCKET_SECONDS = 300
+ACTIVE_RUN_COLUMNS = ["build_id", "start_time", "id", "status", "heartbeat", "release_id", "group_id", "test_id"]
+
+
+def active_run_bucket(heartbeat: int) -> int:
+    return heartbeat // ACTIVE_RUN_BUCKET_SECONDS
 
 
 class PluginModelBase(Model):
@@ -69,6 +83,8 @@ class PluginModelBase(Model):
             if not test.plugin_name or test.plugin_name != self._plugin_name:
                 test.plugin_name = self._plugin_name
                 test.save()
+                # Test lookup results carry the plugin of the test
+                CacheGeneration(TEST_SEARCH_INDEX_GENERATION_KEY).bump()
         except ArgusTest.DoesNotExist:
             LOGGER.warning("Test entity missing for key \"%s\", run won't be visible until this is corrected", key)
 
@@ -166,10 +182,14 @@ class PluginModelBase(Model):
         return bound_query
 
     @classmethod
-    def get_stats_for_release(cls, release: ArgusRelease, build_ids=list[str]):
+    def get_stats_for_release(cls, release: ArgusRelease, build_ids=list[str], max_in_flight: int = 4) -> Iterator[ResultSet]:
+        """
+            Yield stats rows for build_ids in slices of 90 as each slice query completes,
+            keeping at most max_in_flight queries running at a time.
+        """
         cluster = ScyllaCluster.get()
         query = cluster.prepare(cls._stats_query())
-        futures = []
+        futures = deque()
         step_size = 90
 
         for step in range(0, ceil(len(build_ids) / step_size)):
@@ -177,8 +197,11 @@ class PluginModelBase(Model):
             next_slice = build_ids[start_pos:start_pos+step_size]
             futures.append(cluster.session.execute_async(query=query, parameters=(next_slice,),
                                                          execution_profile="read_fast"))
+            if len(futures) >= max_in_flight:
+                yield futures.popleft().result()
 
-        return futures
+        while futures:
+            yield futures.popleft().result()
 
     @classmethod
     def get_run_meta_by_build_id(cls, build_id: str, limit: int = 10):
@@ -214,7 +237,7 @@ class PluginModelBase(Model):
     @classmethod
     def get_run_response(cls, run_id: UUID) -> dict | None:
         try:
-            run = cls.get(id=run_id)
+            run = cls.get_by_id(run_id)
         except cls.DoesNotExist:
             return None
         return dict(run.items())
@@ -258,6 +281,55 @@ class PluginModelBase(Model):
     def update_heartbeat(self):
         self.heartbeat = int(time())
 
+    @classmethod
+    def get_primary_key(cls, run_id: UUID | str) -> tuple[str, datetime]:
+        """(build_id, start_time) of the run, resolved through the run locator"""
+        location = RUN_LOCATOR.locate(run_id, {cls._plugin_name: cls})
+        if not location or location.plugin_name != cls._plugin_name:
+            raise cls.DoesNotExist(f"Run {run_id} does not exist")
+        return location.build_id, location.start_time
+
+    @classmethod
+    def get_by_id(cls, run_id: UUID | str) -> 'PluginModelBase':
+        """Run by id, read by primary key instead of through the id index"""
+        build_id, start_time = cls.get_primary_key(run_id)
+        return cls.get(build_id=build_id, start_time=start_time)
+
+    def record_location(self) -> None:
+        RUN_LOCATOR.record(self.id, self._plugin_name, self.build_id, self.start_time)
+
+    @classmethod
+    def update_heartbeat_by_id(cls, run_id: UUID) -> int:
+        """
+            Write-only heartbeat: a single UPDATE by primary key, without reading the run. Only when
+            the heartbeat enters a new ArgusActiveRun bucket the previous heartbeat is read, and the
+            run is moved to the new bucket in the background.
+        """
+        build_id, start_time = cls.get_primary_key(run_id)
+        heartbeat = int(time())
+        bucket_key = (cls._plugin_name, run_id)
+        run = None
+        if HEARTBEAT_BUCKET_CACHE.get(bucket_key) != active_run_bucket(heartbeat):
+            run = cls.objects(build_id=build_id, start_time=start_time).only(ACTIVE_RUN_COLUMNS).get()
+        cluster = ScyllaCluster.get()
+        query = cluster.prepare(f"UPDATE {cls.table_name()} SET heartbeat = ? WHERE build_id = ? AND start_time = ?")
+        cluster.session.execute(query=query, parameters=(heartbeat, build_id, start_time))
+        if run:
+            previous_heartbeat = run.heartbeat
+            run.heartbeat = heartbeat
+            CLIENT_SIDE_EFFECTS.submit(("active_run", run_id), run.index_active_run, previous_heartbeat)
+            HEARTBEAT_BUCKET_CACHE.set(bucket_key, active_run_bucket(heartbeat))
+        return heartbeat
+
+    @classmethod
+    def update_status_by_id(cls, run_id: UUID, new_status: TestStatus) -> tuple[str, datetime]:
+        """Write-only status change by primary key, returns the primary key for side effects"""
+        build_id, start_time = cls.get_primary_key(run_id)
+        cluster = ScyllaCluster.get()
+        query = cluster.prepare(f"UPDATE {cls.table_name()} SET status = ? WHERE build_id = ? AND start_time = ?")
+        cluster.session.execute(query=query, parameters=(new_status.value, build_id, start_time))
+        return build_id, start_time
+
     def change_status(self, new_status: TestStatus):
         self.status = new_status.value
 
@@ -300,6 +372,56 @@ class PluginModelBase(Model):
         except Exception:
             LOGGER.warning("Failed to index version %s for release %s", self.scylla_version, self.release_id, exc_info=True)
 
+    def index_active_run(self, previous_heartbeat: int | None = None) -> None:
+        """
+            Keep the run in ArgusActiveRun under the bucket of its last heartbeat while it is active
+            and remove it once it reaches a terminal status. Pass the heartbeat from before an
+            update to move the run between buckets, heartbeats within the same bucket write nothing.
+        """
+        bucket = active_run_bucket(self.heartbeat)
+        previous_bucket = bucket if previous_heartbeat is None else active_run_bucket(previous_heartbeat)
+        active = self.status in ACTIVE_RUN_STATUSES
+        if active and previous_heartbeat is not None and previous_bucket == bucket:
+            return
+        try:
+            if active:
+                ArgusActiveRun.create(plugin_name=self._plugin_name, heartbeat_bucket=bucket, run_id=self.id,
+                                      build_id=self.build_id, start_time=self.start_time, release_id=self.release_id,
+                                      group_id=self.group_id, test_id=self.test_id, status=self.status)
+            if not active or previous_bucket != bucket:
+                ArgusActiveRun.filter(plugin_name=self._plugin_name, heartbeat_bucket=previous_bucket,
+                                      run_id=self.id).delete()
+        except Exception:
+            LOGGER.warning("Failed to index active run %s", self.id, exc_info=True)
+
+    @classmethod
+    def get_active_runs(cls, heartbeat_before: int | None = None) -> list[ArgusActiveRun]:
+        """Created and running runs, optionally only those whose heartbeat bucket starts before the given time"""
+        query = ArgusActiveRun.filter(plugin_name=cls._plugin_name)
+        if heartbeat_before is not None:
+            query = query.filter(heartbeat_bucket__lte=active_run_bucket(heartbeat_before))
+        return list(query.limit(None))
+
+    @classmethod
+    def seed_active_runs(cls) -> None:
+        """
+            One-off fill of ArgusActiveRun with active runs submitted before the index existed,
+            using the filtering scans the index replaces.
+        """
+        ready_key = f"active_runs_ready:{cls._plugin_name}"
+        try:
+            RuntimeStore.get(key=ready_key)
+            return
+        except RuntimeStore.DoesNotExist:
+            pass
+        for status in ACTIVE_RUN_STATUSES:
+            for run in cls.filter(status=status).allow_filtering().all():
+                run.index_active_run()
+        ready = RuntimeStore()
+        ready.key = ready_key
+        ready.value = True
+        ready.save()
+
 
 class PluginInfoBase:
     name: str
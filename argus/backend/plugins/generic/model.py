@@ -51,7 +51,7 @@ class GenericRun(PluginModelBase):
 
     @classmethod
     def load_test_run(cls, run_id: UUID) -> 'GenericRun':
-        return cls.get(id=run_id)
+        return cls.get_by_id(run_id)
 
     @classmethod
     def submit_run(cls, request_data: GenericRunSubmitRequest) -> 'GenericRun':
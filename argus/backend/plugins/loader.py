@@ -1,7 +1,9 @@
 from pathlib import Path
 import typing
+from uuid import UUID
 from argus.backend.plugins.core import PluginInfoBase
 from argus.backend.plugins.core import PluginModelBase
+from argus.backend.plugins.locator import RUN_LOCATOR
 
 
 class PluginModule(typing.Protocol):
@@ -37,3 +39,15 @@ def all_plugin_models(include_all=False) -> list[PluginModelBase]:
 
 def all_plugin_types():
     return [user_type for plugin in AVAILABLE_PLUGINS.values() for user_type in plugin.all_types]
+
+
+def find_run(run_id: UUID | str) -> PluginModelBase | None:
+    """Run of any plugin by id, located through the run locator instead of probing every plugin"""
+    location = RUN_LOCATOR.locate(run_id, {name: plugin.model for name, plugin in AVAILABLE_PLUGINS.items()})
+    if not location or location.plugin_name not in AVAILABLE_PLUGINS:
+        return None
+    model = AVAILABLE_PLUGINS[location.plugin_name].model
+    try:
+        return model.get(build_id=location.build_id, start_time=location.start_time)
+    except model.DoesNotExist:
+        return None
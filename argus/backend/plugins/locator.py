@@ -0,0 +1,66 @@
+import logging
+from datetime import datetime
+from typing import NamedTuple
+from uuid import UUID
+
+from cassandra.cqlengine.models import Model
+
+from argus.backend.db import ScyllaCluster
+from argus.backend.models.web import ArgusRunLocation
+from argus.backend.util.cache import RUN_LOCATION_CACHE, TTLCache
+
+LOGGER = logging.getLogger(__name__)
+
+
+class RunLocation(NamedTuple):
+    plugin_name: str
+    build_id: str
+    start_time: datetime
+
+
+class RunLocator:
+    """
+        Resolves run ids to the plugin and primary key of the run. Locations are written to
+        ArgusRunLocation on submission and kept in a per-worker LRU, so finding a run is a single
+        partition read instead of a query on the id index of each plugin table. Runs submitted
+        before the table existed are searched on the id index once and recorded.
+    """
+
+    def __init__(self, cache: TTLCache[RunLocation]):
+        self.cache = cache
+
+    def record(self, run_id: UUID, plugin_name: str, build_id: str, start_time: datetime) -> RunLocation:
+        location = RunLocation(plugin_name=plugin_name, build_id=build_id, start_time=start_time)
+        ArgusRunLocation.create(run_id=run_id, plugin_name=plugin_name, build_id=build_id, start_time=start_time)
+        self.cache.set(run_id, location)
+        return location
+
+    def locate(self, run_id: UUID | str, models: dict[str, type[Model]]) -> RunLocation | None:
+        """
+            Location of the run, or None if it does not exist. Unrecorded runs are searched
+            on the id index of the given plugin models, keyed by plugin name.
+        """
+        run_id = run_id if isinstance(run_id, UUID) else UUID(run_id)
+        location = self.cache.get(run_id)
+        if location:
+            return location
+
+        cluster = ScyllaCluster.get()
+        query = cluster.prepare(
+            f"SELECT plugin_name, build_id, start_time FROM {ArgusRunLocation.__table_name__} WHERE run_id = ?")
+        row = cluster.session.execute(query=query, parameters=(run_id,)).one()
+        if row:
+            location = RunLocation(**row)
+            self.cache.set(run_id, location)
+            return location
+
+        for plugin_name, model in models.items():
+            query = cluster.prepare(f"SELECT build_id, start_time FROM {model.__table_name__} WHERE id = ?")
+            row = cluster.session.execute(query=query, parameters=(run_id,)).one()
+            if row:
+                LOGGER.info("Recording location of run %s submitted before the run locator", run_id)
+                return self.record(run_id, plugin_name, row["build_id"], row["start_time"])
+        return None
+
+
+RUN_LOCATOR = RunLocator(RUN_LOCATION_CACHE)
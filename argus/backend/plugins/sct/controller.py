@@ -206,12 +206,13 @@ def sct_events_count_by_severity(run_id: str, severity: str):
 @api_login_required
 def sct_event_submit(run_id: str):
     """
-        Submit an event or a collection of events
+        Submit an event or a collection of events.
+        A collection responds with the result of each event, in submission order.
     """
     payload = get_payload(request)
     event_data = payload["data"]
     if isinstance(event_data, list):
-        result = all([SCTService.submit_event(run_id=run_id, raw_event=e) for e in event_data])
+        result = SCTService.submit_event_batch(run_id=run_id, raw_events=event_data)
     else:
         result = SCTService.submit_event(run_id=run_id, raw_event=event_data)
     return {
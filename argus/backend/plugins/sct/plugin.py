@@ -1,6 +1,7 @@
 from flask import Blueprint
 
-from argus.backend.plugins.sct.testrun import SCTEvent, SCTJunitReports, SCTResource, SCTNemesis, SCTTestRun, SCTUnprocessedEvent, StressCommand
+from argus.backend.plugins.sct.testrun import SCTEvent, SCTJunitReports, SCTResource, SCTNemesis, SCTTestRun, SCTUnprocessedEvent, \
+    SCTUnprocessedEventLease, StressCommand
 from argus.backend.plugins.sct.controller import bp as sct_bp
 from argus.backend.plugins.core import PluginInfoBase, PluginModelBase
 from argus.backend.plugins.sct.udt import (
@@ -26,6 +27,7 @@ class PluginInfo(PluginInfoBase):
         SCTNemesis,
         SCTEvent,
         SCTUnprocessedEvent,
+        SCTUnprocessedEventLease,
         StressCommand,
         SCTResource,
     ]
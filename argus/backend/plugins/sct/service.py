@@ -9,6 +9,9 @@ from typing import TypedDict
 from uuid import UUID
 from xml.etree import ElementTree
 from flask import current_app, g
+from cassandra.concurrent import execute_concurrent_with_args
+from cassandra.cqlengine import ValidationError
+from cassandra.query import UNSET_VALUE
 from cassandra.util import uuid_from_time
 from argus.backend.db import ScyllaCluster
 from argus.backend.models.github_issue import GithubIssue, IssueLink
@@ -26,6 +29,8 @@ from argus.backend.plugins.sct.udt import (
     PerformanceHDRHistogram,
 )
 from argus.backend.service.event_service import EventService
+from argus.backend.service import stats
+from argus.backend.util.cache import invalidate_test_results_caches
 from argus.backend.util.common import chunk
 from argus.common.enums import NemesisStatus, ResourceState, TestStatus
 from argus.common.utils import clamp_ts_to_milliseconds
@@ -86,11 +91,12 @@ class CoredumpLink(TypedDict):
 
 
 class SCTService:
+    EVENT_WRITE_CONCURRENCY = 50
 
     @staticmethod
     def submit_packages(run_id: str, packages: list[dict]) -> str:
         try:
-            run: SCTTestRun = SCTTestRun.get(id=run_id)
+            run: SCTTestRun = SCTTestRun.get_by_id(run_id)
             for package_dict in packages:
                 package = PackageVersion(**package_dict)
                 if "target" in package.name:
@@ -98,6 +104,7 @@ class SCTService:
                 if package not in run.packages:
                     run.packages.append(package)
             run.save()
+            invalidate_test_results_caches(run.test_id)
         except SCTTestRun.DoesNotExist as exception:
             LOGGER.error("Run %s not found for SCTTestRun", run_id)
             raise SCTServiceException("Run not found", run_id) from exception
@@ -114,7 +121,7 @@ class SCTService:
     @staticmethod
     def set_sct_runner(run_id: str, public_ip: str, private_ip: str, region: str, backend: str, name: str = None):
         try:
-            run: SCTTestRun = SCTTestRun.get(id=run_id)
+            run: SCTTestRun = SCTTestRun.get_by_id(run_id)
             details = CloudInstanceDetails(
                 public_ip=public_ip,
                 private_ip=private_ip,
@@ -140,7 +147,7 @@ class SCTService:
     @staticmethod
     def submit_screenshots(run_id: str, screenshot_links: list[str]) -> str:
         try:
-            run: SCTTestRun = SCTTestRun.get(id=run_id)
+            run: SCTTestRun = SCTTestRun.get_by_id(run_id)
             for link in screenshot_links:
                 if link not in run.screenshots:
                     run.add_screenshot(link)
@@ -154,7 +161,7 @@ class SCTService:
     @staticmethod
     def submit_gemini_results(run_id: str, gemini_data: GeminiResultsRequest) -> str:
         try:
-            run: SCTTestRun = SCTTestRun.get(id=run_id)
+            run: SCTTestRun = SCTTestRun.get_by_id(run_id)
             run.subtest_name = SubtestType.GEMINI.value
             run.oracle_nodes_count = gemini_data.get("oracle_nodes_count")
             run.oracle_node_ami_id = gemini_data.get("oracle_node_ami_id")
@@ -181,6 +188,8 @@ class SCTService:
                     "gemini_status": run.gemini_status,
                 }, user_id=g.user.id, run_id=run_id, release_id=run.release_id, test_id=run.test_id)
                 run.save()
+                run.index_active_run()
+                stats.refresh_test_status(SCTTestRun, run.build_id, run.release_id, run.test_id)
         except SCTTestRun.DoesNotExist as exception:
             LOGGER.error("Run %s not found for SCTTestRun", run_id)
             raise SCTServiceException("Run not found", run_id) from exception
@@ -190,7 +199,7 @@ class SCTService:
     @staticmethod
     def submit_performance_results(run_id: str, performance_results: PerformanceResultsRequest):
         try:
-            run: SCTTestRun = SCTTestRun.get(id=run_id)
+            run: SCTTestRun = SCTTestRun.get_by_id(run_id)
             run.subtest_name = SubtestType.PERFORMANCE.value
             run.perf_op_rate_average = performance_results.get(
                 "perf_op_rate_average")
@@ -275,6 +284,8 @@ class SCTService:
             if regression_found:
                 run.status = TestStatus.FAILED.value
                 run.save()
+                run.index_active_run()
+                stats.refresh_test_status(SCTTestRun, run.build_id, run.release_id, run.test_id)
                 EventService.create_run_event(kind=ArgusEventTypes.TestRunStatusChanged, body={
                     "message": "[{username}] Setting run status to {status} due to performance metric '{metric}' falling "
                     "below allowed threshold ({threshold_negative}): {delta}% compared to "
@@ -294,6 +305,8 @@ class SCTService:
                 # NOTE: This will override status set by SCT Events.
                 run.status = TestStatus.PASSED.value
                 run.save()
+                run.index_active_run()
+                stats.refresh_test_status(SCTTestRun, run.build_id, run.release_id, run.test_id)
 
         except SCTTestRun.DoesNotExist as exception:
             LOGGER.error("Run %s not found for SCTTestRun", run_id)
@@ -304,7 +317,7 @@ class SCTService:
     @staticmethod
     def get_performance_history_for_test(run_id: str):
         try:
-            run: SCTTestRun = SCTTestRun.get(id=run_id)
+            run: SCTTestRun = SCTTestRun.get_by_id(run_id)
             rows = run.get_perf_results_for_test_name(
                 build_id=run.build_id, start_time=run.start_time, test_name=run.test_name)
             return rows
@@ -326,7 +339,7 @@ class SCTService:
             **resource_details.pop("instance_details"))
         resource_name = resource_details.get("name")
         try:
-            SCTTestRun.get(id=run_id)
+            SCTTestRun.get_by_id(run_id)
             if not SCTResource.objects(run_id=UUID(run_id), name=resource_name).count():
                 SCTResource.create(
                     run_id=UUID(run_id),
@@ -439,7 +452,7 @@ class SCTService:
             target_node=node_desc,
         )
         try:
-            run: SCTTestRun = SCTTestRun.get(id=run_id)
+            run: SCTTestRun = SCTTestRun.get_by_id(run_id)
             nemesis_info.save()
             run.update_nemesis_stats("total")
             run.save()
@@ -453,7 +466,7 @@ class SCTService:
     def finalize_nemesis(run_id: str, nemesis_details: dict) -> str:
         nem_req = NemesisFinalizationRequest(**nemesis_details)
         try:
-            run: SCTTestRun = SCTTestRun.get(id=run_id)
+            run: SCTTestRun = SCTTestRun.get_by_id(run_id)
             nemesis = SCTNemesis.get(
                 run_id=run.id, start_time=int(nem_req.start_time))
             nemesis.status = NemesisStatus(nem_req.status).value
@@ -474,12 +487,12 @@ class SCTService:
 
         return "updated"
 
-    @classmethod
-    def submit_event(cls, run_id: str, raw_event: RawEventPayload):
+    @staticmethod
+    def _build_event(run_id: UUID, raw_event: RawEventPayload) -> SCTEvent:
         req = EventSubmitRequest(**raw_event)
 
         event = SCTEvent()
-        event.run_id = UUID(run_id)
+        event.run_id = run_id
         event.severity = SCTEventSeverity(req.severity.upper()).value
         event.ts = datetime.fromtimestamp(req.ts, tz=UTC)
         event.message = req.message
@@ -498,18 +511,28 @@ class SCTService:
         event.duration = req.duration
 
         event.known_issue = req.known_issue
+        event.validate()
+        return event
+
+    @staticmethod
+    def _is_unprocessed_severity(event: SCTEvent) -> bool:
+        # Events queued for embedding generation
+        return event.severity in (SCTEventSeverity.ERROR.value, SCTEventSeverity.CRITICAL.value)
 
+    @classmethod
+    def submit_event(cls, run_id: str, raw_event: RawEventPayload):
+        event = cls._build_event(UUID(run_id), raw_event)
         event.save()
         try:
             if event.event_type.lower() == "coredumpevent" and (link := cls.create_coredump_link(event.message, event.ts)):
-                run: SCTTestRun = SCTTestRun.get(id=event.run_id)
+                run: SCTTestRun = SCTTestRun.get_by_id(event.run_id)
                 run.submit_logs([link])
                 run.save()
         except Exception:
             LOGGER.warning(
                 "Unable to parse event for coredump links.", exc_info=True)
         # Add to unprocessed events queue for ERROR and CRITICAL events
-        if event.severity in (SCTEventSeverity.ERROR.value, SCTEventSeverity.CRITICAL.value):
+        if cls._is_unprocessed_severity(event):
             try:
                 unprocessed_event = SCTUnprocessedEvent()
                 unprocessed_event.run_id = event.run_id
@@ -524,6 +547,73 @@ class SCTService:
 
         return True
 
+    @classmethod
+    def submit_event_batch(cls, run_id: str, raw_events: list[RawEventPayload]) -> list[dict]:
+        """
+            Submit a list of events at once: every event is validated before anything is written,
+            events and their unprocessed queue entries are written concurrently and coredump links
+            of the whole batch are added to the run with a single update.
+            Returns the result of each event, in submission order.
+        """
+        run_uuid = UUID(run_id)
+        results: list[dict] = []
+        events: list[tuple[int, SCTEvent]] = []
+        for idx, raw_event in enumerate(raw_events):
+            try:
+                events.append((idx, cls._build_event(run_uuid, raw_event)))
+                results.append({"status": "ok"})
+            except (TypeError, ValueError, AttributeError, ValidationError) as exc:
+                results.append({"status": "error", "message": f"Invalid event: {exc}"})
+
+        cluster = ScyllaCluster.get()
+        event_columns = SCTEvent._columns
+        event_query = cluster.prepare(
+            f"INSERT INTO {SCTEvent.column_family_name(include_keyspace=False)} "
+            f"({", ".join(column.db_field_name for column in event_columns.values())}) "
+            f"VALUES ({", ".join("?" * len(event_columns))})")
+        # Unset instead of null, like cqlengine inserts, so missing fields don't write tombstones
+        event_params = [tuple(UNSET_VALUE if (value := getattr(event, column)) is None else value
+                              for column in event_columns) for _, event in events]
+        written: list[SCTEvent] = []
+        for (idx, event), (success, result) in zip(events, execute_concurrent_with_args(
+                cluster.session, event_query, event_params, concurrency=cls.EVENT_WRITE_CONCURRENCY,
+                raise_on_first_error=False)):
+            if success:
+                written.append(event)
+            else:
+                LOGGER.error("Failed to write event for run %s", run_id, exc_info=result)
+                results[idx] = {"status": "error", "message": f"Failed to write event: {result}"}
+
+        unprocessed = [(event.run_id, event.severity, event.ts) for event in written
+                       if cls._is_unprocessed_severity(event)]
+        if unprocessed:
+            queue_query = cluster.prepare(
+                f"INSERT INTO {SCTUnprocessedEvent.column_family_name(include_keyspace=False)} "
+                "(run_id, severity, ts) VALUES (?, ?, ?)")
+            for success, result in execute_concurrent_with_args(cluster.session, queue_query, unprocessed,
+                                                                concurrency=cls.EVENT_WRITE_CONCURRENCY,
+                                                                raise_on_first_error=False):
+                if not success:
+                    LOGGER.error("Failed to add event to unprocessed queue for run %s", run_id, exc_info=result)
+
+        links = []
+        for event in written:
+            try:
+                if event.event_type.lower() == "coredumpevent" and (
+                        link := cls.create_coredump_link(event.message, event.ts)):
+                    links.append(link)
+            except Exception:
+                LOGGER.warning("Unable to parse event for coredump links.", exc_info=True)
+        if links:
+            try:
+                run: SCTTestRun = SCTTestRun.get_by_id(run_uuid)
+                run.submit_logs(links)
+                run.save()
+            except Exception:
+                LOGGER.warning("Unable to add coredump links to run %s", run_id, exc_info=True)
+
+        return results
+
     @staticmethod
     def get_events(run_id: str, limit: int, severities: list[str], before: str | None, after: str | None = None) -> list[dict]:
         before_dt = datetime.fromtimestamp(
@@ -776,7 +866,7 @@ class SCTService:
         if runs_with_issues:
             for run_id in runs_with_issues[:MAX_SIMILARS]:
                 try:
-                    test_run = SCTTestRun.get(id=run_id)
+                    test_run = SCTTestRun.get_by_id(run_id)
                     test_runs[run_id] = test_run
                 except Exception as e:
                     LOGGER.debug(f"Failed to fetch test run {
@@ -849,7 +939,7 @@ class SCTService:
                 additional_test_runs = {}
                 for run_id in additional_run_ids:
                     try:
-                        test_run = SCTTestRun.get(id=run_id)
+                        test_run = SCTTestRun.get_by_id(run_id)
                         additional_test_runs[run_id] = test_run
                     except Exception as e:
                         LOGGER.debug(f"Failed to fetch additional test run {
@@ -960,7 +1050,7 @@ class SCTService:
     @staticmethod
     def add_stress_command(run_id: str, cmd: str, ts: float, loader_name: str, log_name: str):
         try:
-            run: SCTTestRun = SCTTestRun.get(id=run_id)
+            run: SCTTestRun = SCTTestRun.get_by_id(run_id)
             run.add_stress_command(cmd=cmd, ts=clamp_ts_to_milliseconds(
                 ts), loader_name=loader_name, log_name=log_name)
             run.save()
@@ -114,6 +114,18 @@ class SCTUnprocessedEvent(Model):
     ts = columns.DateTime(primary_key=True, clustering_order="DESC")
 
 
+class SCTUnprocessedEventLease(Model):
+    """Lease on a token range shard of sct_unprocessed_events held by one embedding processor worker.
+    Acquired with a lightweight transaction and a TTL that the owner renews on every heartbeat,
+    so the shard of a crashed worker is picked up by another one once the lease expires.
+    """
+    __table_name__ = "sct_unprocessed_event_lease"
+
+    shard = columns.Integer(partition_key=True)
+    owner = columns.Text()
+    heartbeat_at = columns.DateTime()
+
+
 class SCTNemesis(Model):
     __table_name__ = "sct_nemesis"
 
@@ -209,7 +221,7 @@ class SCTTestRun(PluginModelBase):
 
     @classmethod
     def load_test_run(cls, run_id: UUID) -> 'SCTTestRun':
-        return cls.get(id=run_id)
+        return cls.get_by_id(run_id)
 
     @classmethod
     def submit_run(cls, request_data: dict) -> 'SCTTestRun':
@@ -483,7 +495,7 @@ class SCTTestRun(PluginModelBase):
     @classmethod
     def get_run_response(cls, run_id: UUID) -> dict | None:
         try:
-            run = cls.get(id=run_id)
+            run = cls.get_by_id(run_id)
         except cls.DoesNotExist:
             return None
         response = dict(run.items())
@@ -76,7 +76,7 @@ class SirenadaRun(PluginModelBase):
 
     @classmethod
     def load_test_run(cls, run_id: UUID) -> 'SirenadaRun':
-        return cls.get(id=run_id)
+        return cls.get_by_id(run_id)
 
     @classmethod
     def submit_run(cls, request_data: RawSirenadaRequest) -> 'SirenadaRun':
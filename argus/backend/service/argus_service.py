@@ -31,6 +31,7 @@ from argus.backend.models.web import (
 from argus.backend.events.event_processors import EVENT_PROCESSORS
 from argus.backend.service.planner_service import PlanningService
 from argus.backend.service.testrun import TestRunService
+from argus.backend.service.test_lookup import TEST_SEARCH_INDEX
 from argus.backend.util.common import chunk
 
 LOGGER = logging.getLogger(__name__)
@@ -89,6 +90,7 @@ class ArgusService:
             new_release = ArgusRelease()
             new_release.name = release_name
             new_release.save()
+            TEST_SEARCH_INDEX.entity_changed(new_release)
             response[release_name] = {}
             response[release_name]["groups"] = self.create_groups(
                 groups=payload[release_name]["groups"],
@@ -105,6 +107,7 @@ class ArgusService:
             new_group.name = group_name
             new_group.pretty_name = group_definition.get("pretty_name")
             new_group.save()
+            TEST_SEARCH_INDEX.entity_changed(new_group)
             response[group_name] = {}
             response[group_name]["status"] = "created"
             response[group_name]["tests"] = self.create_tests(
@@ -123,6 +126,7 @@ class ArgusService:
             new_test.group_id = parent_group_id
             new_test.name = test_name
             new_test.save()
+            TEST_SEARCH_INDEX.entity_changed(new_test)
             response[test_name] = "created"
 
         return response
@@ -191,7 +195,7 @@ class ArgusService:
 
         for run_id in additional_runs:
             if run_id not in rows_ids:
-                row: SCTTestRun = SCTTestRun.get(id=run_id)
+                row: SCTTestRun = SCTTestRun.get_by_id(run_id)
                 rows.append(row)
 
         for row in rows:
@@ -206,7 +210,7 @@ class ArgusService:
         rows: list[SCTTestRun] = []
         for run_id in runs:
             try:
-                row: SCTTestRun = SCTTestRun.get(id=run_id)
+                row: SCTTestRun = SCTTestRun.get_by_id(run_id)
                 rows.append(row)
             except SCTTestRun.DoesNotExist:
                 pass
@@ -9,6 +9,7 @@ from flask.cli import with_appcontext
 from argus.backend.db import ScyllaCluster
 from argus.backend.models.web import ArgusRelease, ArgusGroup, ArgusTest, ArgusTestException
 from argus.backend.service.release_manager import ReleaseManagerService
+from argus.backend.service.test_lookup import TEST_SEARCH_INDEX
 
 LOGGER = logging.getLogger(__name__)
 
@@ -29,6 +30,7 @@ class ArgusTestsMonitor(ABC):
         release = ArgusRelease()
         release.name = release_name
         release.save()
+        TEST_SEARCH_INDEX.entity_changed(release)
 
         return release
 
@@ -40,6 +42,7 @@ class ArgusTestsMonitor(ABC):
         if group_pretty_name:
             group.pretty_name = group_pretty_name
         group.save()
+        TEST_SEARCH_INDEX.entity_changed(group)
 
         return group
 
@@ -53,6 +56,7 @@ class ArgusTestsMonitor(ABC):
         test.build_system_url = build_url
         test.validate_build_system_id()
         test.save()
+        TEST_SEARCH_INDEX.entity_changed(test)
         ReleaseManagerService().move_test_runs(test)
 
         return test
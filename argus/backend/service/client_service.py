@@ -3,21 +3,25 @@ import json
 import logging
 from dataclasses import asdict
 from datetime import UTC, datetime
-from typing import Any
+from typing import Any, Iterator
 from uuid import UUID
 
-
+from cassandra.concurrent import execute_concurrent_with_args
 from argus.backend.db import ScyllaCluster
 from argus.backend.error_handlers import DataValidationError
 from argus.backend.models.pytest import PytestResultTable, PytestSubmitData, PytestUserField
 from argus.backend.models.result import ArgusGenericResultMetadata, ArgusGenericResultData
 from argus.backend.models.run_config import RunConfigParam, RunConfiguration
 from argus.backend.models.web import ArgusEvent, ArgusTestRunComment, ArgusTest, ArgusGroup, ArgusRelease
-from argus.backend.plugins.core import PluginModelBase
+from argus.backend.plugins.core import ACTIVE_RUN_COLUMNS, PluginModelBase
 from argus.backend.plugins.generic.model import GenericRun
-from argus.backend.plugins.loader import AVAILABLE_PLUGINS
+from argus.backend.plugins.loader import AVAILABLE_PLUGINS, find_run
 from argus.backend.events.event_processors import EVENT_PROCESSORS
 from argus.backend.service.results_service import ResultsService, Cell
+from argus.backend.service.stats import refresh_test_status
+from argus.backend.service.views_widgets.pytest import PYTEST_NAMES
+from argus.backend.util.background import CLIENT_SIDE_EFFECTS
+from argus.backend.util.cache import invalidate_test_results_caches, invalidate_version_matrix
 from argus.common.enums import TestStatus
 
 LOGGER = logging.getLogger(__name__)
@@ -29,6 +33,7 @@ class ClientException(Exception):
 
 class ClientService:
     PLUGINS = {name: plugin.model for name, plugin in AVAILABLE_PLUGINS.items()}
+    CONFIG_PARAM_WRITE_CONCURRENCY = 100
 
     def __init__(self) -> None:
         self.cluster = ScyllaCluster.get()
@@ -42,6 +47,10 @@ class ClientService:
     def submit_run(self, run_type: str, request_data: dict) -> str:
         model = self.get_model(run_type)
         run = model.submit_run(request_data=request_data)
+        run.record_location()
+        run.index_active_run()
+        refresh_test_status(model, run.build_id, run.release_id, run.test_id)
+        invalidate_version_matrix(run.test_id)
         return "Created"
 
     def submit_pytest_result(self, request_data: PytestSubmitData) -> dict[str, str | UUID]:
@@ -75,6 +84,7 @@ class ClientService:
 
         new_result.save()
         [f.save() for f in fields]
+        PYTEST_NAMES.add(new_result.name)
         return {
             "name": new_result.name,
             "id": new_result.id,
@@ -83,17 +93,14 @@ class ClientService:
     def get_run(self, run_type: str, run_id: str):
         model = self.get_model(run_type)
         try:
-            run = model.get(id=run_id)
+            run = model.get_by_id(run_id)
         except model.DoesNotExist:
             return None
         return run
 
     def heartbeat(self, run_type: str, run_id: str) -> int:
         model = self.get_model(run_type)
-        run = model.load_test_run(UUID(run_id))
-        run.update_heartbeat()
-        run.save()
-        return run.heartbeat
+        return model.update_heartbeat_by_id(UUID(run_id))
 
     def get_run_status(self, run_type: str, run_id: str) -> str:
         model = self.get_model(run_type)
@@ -102,17 +109,26 @@ class ClientService:
 
     def update_run_status(self, run_type: str, run_id: str, new_status: str) -> str:
         model = self.get_model(run_type)
-        run = model.load_test_run(UUID(run_id))
-        run.change_status(new_status=TestStatus(new_status))
-        run.save()
+        status = TestStatus(new_status)
+        build_id, start_time = model.update_status_by_id(UUID(run_id), status)
+        CLIENT_SIDE_EFFECTS.submit(("run_status", model._plugin_name, run_id), self._run_status_changed, model,
+                                   build_id, start_time)
 
-        return run.status
+        return status.value
+
+    @staticmethod
+    def _run_status_changed(model: PluginModelBase, build_id: str, start_time: datetime) -> None:
+        run = model.objects(build_id=build_id, start_time=start_time).only(ACTIVE_RUN_COLUMNS).get()
+        run.index_active_run()
+        refresh_test_status(model, run.build_id, run.release_id, run.test_id)
+        invalidate_version_matrix(run.test_id)
 
     def submit_product_version(self, run_type: str, run_id: str, version: str) -> str:
         model = self.get_model(run_type)
         run = model.load_test_run(UUID(run_id))
         run.submit_product_version(version)
         run.save()
+        refresh_test_status(model, run.build_id, run.release_id, run.test_id)
 
         return "Submitted"
 
@@ -129,7 +145,9 @@ class ClientService:
         run = model.load_test_run(UUID(run_id))
         run.finish_run(payload)
         run.save()
-
+        run.index_active_run()
+        refresh_test_status(model, run.build_id, run.release_id, run.test_id)
+        invalidate_version_matrix(run.test_id)
 
         return "Finalized"
 
@@ -143,8 +161,8 @@ class ClientService:
                 "arguments": [run_id]
             }}
         table_name = results["meta"]["name"]
+        cells = self._validate_cells(results["results"], {column["name"] for column in results["meta"]["columns_meta"]})
         results_service = ResultsService()
-        cells = [Cell(**cell) for cell in results["results"]]
         table_metadata = results_service.get_table_metadata(test_id=run.test_id, table_name=table_name)
         if table_metadata:
             table_metadata = table_metadata.update_if_changed(results["meta"])
@@ -157,43 +175,43 @@ class ClientService:
         results["sut_timestamp"] = datetime.fromtimestamp(results["sut_timestamp"])
         best_results = results_service.update_best_results(test_id=run.test_id, table_name=table_name, table_metadata=table_metadata,
                                                            cells=cells, run_id=run_id)
-        table_name = results["meta"]["name"]
-        sut_timestamp = results["sut_timestamp"]
-        result_failed = False
-        for cell in cells:
-            cell.update_cell_status_based_on_rules(table_metadata, best_results)
-            if cell.status == "ERROR":
-                result_failed = True
-            ArgusGenericResultData(test_id=run.test_id,
-                                   run_id=run.id,
-                                   name=table_name,
-                                   sut_timestamp=sut_timestamp,
-                                   **asdict(cell)
-                                   ).save()
+        result_failed = results_service.evaluate_cells(table_metadata, cells, best_results)
+        results_service.save_cells(test_id=run.test_id, run_id=run.id, table_name=table_name,
+                                   sut_timestamp=results["sut_timestamp"], cells=cells)
+        invalidate_test_results_caches(run.test_id)
         if result_failed:
             raise DataValidationError()
         return {"status": "ok", "message": "Results submitted"}
 
+    @staticmethod
+    def _validate_cells(raw_cells: list[dict], columns: set[str]) -> list[Cell]:
+        """Check every cell of a results table before anything is written"""
+        cells = []
+        errors = []
+        for idx, raw_cell in enumerate(raw_cells):
+            try:
+                cell = Cell(**raw_cell)
+            except TypeError as exc:
+                errors.append(f"cell {idx}: {exc}")
+                continue
+            if cell.column not in columns:
+                errors.append(f"cell {idx}: unknown column {cell.column}")
+            elif cell.value is not None and (isinstance(cell.value, bool) or not isinstance(cell.value, int | float)):
+                errors.append(f"cell {idx}: value of {cell.column}:{cell.row} is not a number")
+            cells.append(cell)
+        if errors:
+            raise ClientException("Invalid results cells", errors)
+        return cells
+
     def get_run_info(self, run_id: str) -> dict:
         """Search all plugin models for a test run by run_id and return full details.
 
         Returns the test run itself, test info (test, group, release), comments, and activity.
         """
-        run_uuid = UUID(run_id)
-        run = None
-        plugin_name = None
-
-        for name, plugin in AVAILABLE_PLUGINS.items():
-            model = plugin.model
-            try:
-                run = model.get(id=run_uuid)
-                plugin_name = name
-                break
-            except model.DoesNotExist:
-                continue
-
+        run = find_run(UUID(run_id))
         if not run:
             raise ClientException(f"Test run {run_id} not found in any plugin model")
+        plugin_name = run._plugin_name
 
         run_data = dict(run.items())
 
@@ -257,15 +275,22 @@ class ClientService:
         return list(config_store)
 
     @staticmethod
-    def parse_config_values(name: str, config: str, run_id: str):
-        def is_scalar(value: Any):
-            match (value):
-                case list():
-                    return False
+    def flatten_config_values(name: str, config: dict) -> Iterator[tuple[str, str]]:
+        """Yield (param name, value) for every scalar leaf of the config, walking it with an explicit stack"""
+        stack: list[tuple[str, Any]] = [(f"{name.replace(".", "_").replace(" ", "_")}.{key}", value)
+                                         for key, value in reversed(config.items())]
+        while stack:
+            param, value = stack.pop()
+            match value:
                 case dict():
-                    return False
+                    stack.extend((f"{param}.{key}", inner) for key, inner in reversed(value.items()))
+                case list():
+                    stack.extend((f"{param}.{idx}", inner) for idx, inner in reversed(list(enumerate(value))))
                 case _:
-                    return True
+                    yield param, str(value) or "null"
+
+    @classmethod
+    def parse_config_values(cls, name: str, config: str, run_id: str, previous_config: str | None = None):
         try:
             loaded: dict = json.loads(config)
         except json.JSONDecodeError:
@@ -276,27 +301,32 @@ class ClientService:
             LOGGER.warning("JSON Config for run %s does not begin with a top-level mapping, cannot continue parsing...", run_id)
             return
 
-        loaded_items = [[f"{name.replace(".", "_").replace(" ", "_")}.", k, v] for k, v in list(loaded.items())]
+        # Params of an earlier submission of this config are already stored for the run
+        stored_params = set()
+        if previous_config:
+            try:
+                previous = json.loads(previous_config)
+            except json.JSONDecodeError:
+                previous = None
+            if isinstance(previous, dict):
+                stored_params = set(cls.flatten_config_values(name, previous))
+
         # Store flattened keys to a separate table for comparison purposes
-        for level, key, value in loaded_items:
-            if is_scalar(value):
-                param = RunConfigParam()
-                param.name = f"{level}{key}"
-                param.value = str(value) or "null"
-                param.run_id = run_id
-                param.save()
-            else:
-                if isinstance(value, dict):
-                    loaded_items.extend([f"{level}{key}.", inner_key, value] for inner_key, value in value.items())
-                elif isinstance(value, list):
-                    loaded_items.extend([f"{level}{key}.", str(idx), value] for idx, value in enumerate(value))
+        cluster = ScyllaCluster.get()
+        query = cluster.prepare(f"INSERT INTO {RunConfigParam.column_family_name(include_keyspace=False)} "
+                                "(name, value, run_id) VALUES (?, ?, ?)")
+        params = ((param, value, str(run_id)) for param, value in cls.flatten_config_values(name, loaded)
+                  if (param, value) not in stored_params)
+        execute_concurrent_with_args(cluster.session, query, params, concurrency=cls.CONFIG_PARAM_WRITE_CONCURRENCY,
+                                     raise_on_first_error=True)
 
     @classmethod
     def submit_config(cls, run_id: str, config_name: str, config_content: str) -> bool:
         config_store = cls.get_config_store(run_id, config_name)
         decoded_config = str(base64.decodebytes(bytes(config_content, encoding="utf-8")), encoding="utf-8")
 
+        previous_config = config_store.content
         config_store.content = decoded_config
-        cls.parse_config_values(config_name, decoded_config, run_id)
+        cls.parse_config_values(config_name, decoded_config, run_id, previous_config)
         config_store.save()
         return True
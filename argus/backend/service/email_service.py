@@ -368,7 +368,7 @@ class EmailService:
         return self.create_report(req)
 
     def create_report(self, request: ReportSendRequest) -> str:
-        run: SCTTestRun = SCTTestRun.get(id=request.run_id)
+        run: SCTTestRun = SCTTestRun.get_by_id(request.run_id)
         partials = []
         for section in request.sections if len(request.sections) > 0 else DEFAULT_SECTIONS:
             if isinstance(section, dict):
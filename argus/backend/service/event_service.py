@@ -1,5 +1,10 @@
 from datetime import datetime, UTC
 import json
+from uuid import uuid4
+
+from cassandra.concurrent import execute_concurrent_with_args
+
+from argus.backend.db import ScyllaCluster
 from argus.backend.models.web import ArgusEvent, ArgusEventTypes
 
 
@@ -16,3 +21,17 @@ class EventService:
         event.kind = kind.value
         event.created_at = datetime.now(UTC)
         event.save()
+
+    @staticmethod
+    def create_run_events(events: list[dict]) -> None:
+        """Insert many run events concurrently, each event holds the arguments of create_run_event"""
+        cluster = ScyllaCluster.get()
+        insert = cluster.prepare(
+            f"INSERT INTO {ArgusEvent.column_family_name(include_keyspace=False)} "
+            "(id, release_id, group_id, test_id, user_id, run_id, body, kind, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)")
+        created_at = datetime.now(UTC)
+        params = [(uuid4(), event.get("release_id"), event.get("group_id"), event.get("test_id"), event.get("user_id"),
+                   event.get("run_id"), json.dumps(event["body"], ensure_ascii=True, separators=(',', ':')),
+                   event["kind"].value, created_at) for event in events]
+        execute_concurrent_with_args(cluster.session, insert, params, concurrency=50)
@@ -1,10 +1,15 @@
+import json
 import re
 import logging
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from datetime import UTC, datetime
 from functools import reduce
 from unittest.mock import MagicMock
 from uuid import UUID
+
+import requests
 from flask import current_app, g
 from github import Github, Auth
 
@@ -14,13 +19,26 @@ from argus.backend.models.github_issue import GithubIssue, IssueAssignee, IssueL
 from argus.backend.plugins.core import PluginInfoBase
 from argus.backend.plugins.loader import AVAILABLE_PLUGINS
 from argus.backend.service.event_service import EventService
+from argus.backend.service.issue_utils import IssueRefreshStats, save_issues_batched
 from argus.backend.util.common import chunk
 
 LOGGER = logging.getLogger(__name__)
 
 
+@dataclass
+class RepoIssues:
+    issues: list[dict] | None = None
+    etag: str | None = None
+    last_modified: str | None = None
+    requests: int = 1
+    rate_limit_remaining: str | None = None
+
+
 class GithubService:
     LAST_RAN_KEY = "github_service_last_issue_refresh"
+    REPO_STATES_KEY = "github_service_repo_refresh_states"
+    API_URL = "https://api.github.com"
+    REFRESH_WORKERS = 8
 
     plugins = AVAILABLE_PLUGINS
 
@@ -28,7 +46,8 @@ class GithubService:
         if dry_run:
             self.gh = None
             return
-        auth = Auth.Token(token=self.get_installation_token())
+        self.token = self.get_installation_token()
+        auth = Auth.Token(token=self.token)
         self.gh = Github(auth=auth, per_page=1000)
 
     def get_plugin(self, plugin_name: str) -> PluginInfoBase | None:
@@ -42,7 +61,12 @@ class GithubService:
         # TODO: To be replaced by JWT refreshing logic once we have Github App in place
         pass
 
-    def refresh_stale_issues(self):
+    def refresh_stale_issues(self) -> dict:
+        """
+            Refresh tracked issues updated on GitHub since the last sync of their repository.
+            Repositories are fetched concurrently and conditionally, a repository without
+            updates is answered with 304 Not Modified, which doesn't count against the rate limit.
+        """
         try:
             last_ran = RuntimeStore.get(key=self.LAST_RAN_KEY)
         except RuntimeStore.DoesNotExist:
@@ -53,46 +77,136 @@ class GithubService:
 
         LOGGER.info("Starting Github Issue sync...")
         check_time = datetime.now(tz=UTC)
+        stats = IssueRefreshStats(source="Github")
 
-        all_issues: list[GithubIssue] = list(GithubIssue.all())
+        all_issues: list[GithubIssue] = list(GithubIssue.objects().only(
+            ["id", "owner", "repo", "number", "state", "title", "labels", "assignees"]).limit(None))
         issues_by_identifier = {
             f"{issue.owner.lower()}/{issue.repo.lower()}#{issue.number}": issue for issue in all_issues}
-        touch_count = 0
-
-        unique_repos = {f"{issue.owner}/{issue.repo}" for issue in all_issues}
-        for idx, repo in enumerate(unique_repos):
-            LOGGER.info("[%s/%s] Fetching %s...", idx + 1, len(unique_repos), repo)
-            try:
-                repo = self.gh.get_repo(repo)
-            except Exception:
-                LOGGER.warning(f"Unable to fetch repo {repo}, skipping", exc_info=True)
-                continue
-            issues = repo.get_issues(since=last_ran.value, state="all", direction="desc", sort="created")
-            for issue_idx, issue in enumerate(issues):
-                match = re.match(
-                    r"http(s)?://(www\.)?github\.com/(?P<owner>[\w\d]+)/"
-                    r"(?P<repo>[\w\d\-_]+)/(?P<type>issues|pull)/(?P<issue_number>\d+)(/)?",
-                    issue.html_url,
-                )
-
-                identifier = f"{match.group('owner').lower()}/{match.group('repo').lower()}#{match.group('issue_number')}"
-                issue_to_update = issues_by_identifier.get(identifier)
-                if not issue_to_update:
-                    LOGGER.debug("[%s/%s] No issue found for %s...", issue_idx + 1, "?", identifier)
+        stats.tracked = len(all_issues)
+
+        repo_states = self._load_repo_states()
+        unique_repos = {f"{issue.owner}/{issue.repo}".lower() for issue in all_issues}
+        default_state = {"since": last_ran.value.replace(tzinfo=UTC).isoformat()}
+        changed: list[GithubIssue] = []
+        workers = current_app.config.get("ISSUE_REFRESH_WORKERS", self.REFRESH_WORKERS)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(self._fetch_repo_issues, repo, repo_states.get(repo, default_state)): repo
+                       for repo in unique_repos}
+            for idx, future in enumerate(as_completed(futures)):
+                repo = futures[future]
+                try:
+                    fetched = future.result()
+                except Exception:
+                    LOGGER.warning("Unable to fetch issues of %s, skipping", repo, exc_info=True)
+                    stats.failed += 1
+                    # Keep the window of the failed repository, last_ran moves past it
+                    repo_states.setdefault(repo, default_state)
+                    continue
+                stats.requests += fetched.requests
+                stats.track_rate_limit(fetched.rate_limit_remaining)
+                state = {**repo_states.get(repo, default_state), "etag": fetched.etag,
+                         "last_modified": fetched.last_modified}
+                if fetched.issues is None:
+                    LOGGER.debug("[%s/%s] %s not modified", idx + 1, len(unique_repos), repo)
+                    stats.not_modified += 1
                     continue
-                LOGGER.debug("[%s/%s] Refreshing %s...", issue_idx + 1, "?", identifier)
-                issue_to_update.title = issue.title
-                issue_to_update.state = issue.state
-                issue_to_update.labels = [IssueLabel(
-                    id=label.id, name=label.name, color=label.color, description=label.description) for label in issue.labels]
-                issue_to_update.assignees = [IssueAssignee(
-                    login=assignee.login, html_url=assignee.html_url) for assignee in issue.assignees]
-                issue_to_update.save()
-                touch_count += 1
-
-        LOGGER.info("Finished. Updated %s out of %s issues", touch_count, len(all_issues))
+                LOGGER.info("[%s/%s] Fetched %s issues of %s", idx + 1, len(unique_repos), len(fetched.issues), repo)
+                stats.fetched += len(fetched.issues)
+                for remote_issue in fetched.issues:
+                    identifier = self._issue_identifier(remote_issue["html_url"])
+                    issue_to_update = issues_by_identifier.get(identifier)
+                    if issue_to_update and self._apply_remote_issue(issue_to_update, remote_issue):
+                        changed.append(issue_to_update)
+                # Validators only match the same request, so they are dropped once the window moves forward
+                repo_states[repo] = {"since": check_time.isoformat()} if fetched.issues else state
+
+        save_issues_batched(changed)
+        stats.updated = len(changed)
+        self._save_repo_states(repo_states)
         last_ran.value = check_time
         last_ran.save()
+        return stats.log()
+
+    @staticmethod
+    def _issue_identifier(html_url: str) -> str | None:
+        match = re.match(
+            r"http(s)?://(www\.)?github\.com/(?P<owner>[\w\d]+)/"
+            r"(?P<repo>[\w\d\-_]+)/(?P<type>issues|pull)/(?P<issue_number>\d+)(/)?",
+            html_url,
+        )
+        if not match:
+            return None
+        return f"{match.group('owner').lower()}/{match.group('repo').lower()}#{match.group('issue_number')}"
+
+    @staticmethod
+    def _apply_remote_issue(issue: GithubIssue, remote_issue: dict) -> bool:
+        """Copy remote fields to the issue, returning whether anything changed"""
+        labels = [IssueLabel(id=label["id"], name=label["name"], color=label["color"],
+                             description=label["description"]) for label in remote_issue["labels"]]
+        assignees = [IssueAssignee(login=assignee["login"], html_url=assignee["html_url"])
+                     for assignee in remote_issue["assignees"]]
+        unchanged = (
+            issue.title == remote_issue["title"]
+            and issue.state == remote_issue["state"]
+            and [(label.id, label.name, label.color, label.description) for label in issue.labels]
+            == [(label.id, label.name, label.color, label.description) for label in labels]
+            and [(assignee.login, assignee.html_url) for assignee in issue.assignees]
+            == [(assignee.login, assignee.html_url) for assignee in assignees]
+        )
+        if unchanged:
+            return False
+        issue.title = remote_issue["title"]
+        issue.state = remote_issue["state"]
+        issue.labels = labels
+        issue.assignees = assignees
+        return True
+
+    def _load_repo_states(self) -> dict[str, dict]:
+        try:
+            return json.loads(RuntimeStore.get(key=self.REPO_STATES_KEY).value)
+        except RuntimeStore.DoesNotExist:
+            return {}
+
+    def _save_repo_states(self, repo_states: dict[str, dict]) -> None:
+        store = RuntimeStore()
+        store.key = self.REPO_STATES_KEY
+        store.value = json.dumps(repo_states)
+        store.save()
+
+    def _fetch_repo_issues(self, repo: str, state: dict) -> RepoIssues:
+        """
+            Fetch issues of the repository updated since the last sync. The first page is requested
+            with the validators of the previous response for the same window, issues is None when
+            GitHub reports nothing changed.
+        """
+        headers = {
+            "Accept": "application/vnd.github+json",
+            "Authorization": f"Bearer {self.token}",
+        }
+        conditional_headers = {}
+        if etag := state.get("etag"):
+            conditional_headers["If-None-Match"] = etag
+        if last_modified := state.get("last_modified"):
+            conditional_headers["If-Modified-Since"] = last_modified
+        params = {"since": state["since"], "state": "all", "sort": "updated", "direction": "desc", "per_page": 100}
+        with requests.Session() as session:
+            response = session.get(f"{self.API_URL}/repos/{repo}/issues", params=params,
+                                   headers={**headers, **conditional_headers}, timeout=30)
+            fetched = RepoIssues(etag=response.headers.get("ETag"), last_modified=response.headers.get("Last-Modified"),
+                                 rate_limit_remaining=response.headers.get("X-RateLimit-Remaining"))
+            if response.status_code == 304:
+                fetched.etag, fetched.last_modified = state.get("etag"), state.get("last_modified")
+                return fetched
+            response.raise_for_status()
+            fetched.issues = response.json()
+            while next_page := response.links.get("next", {}).get("url"):
+                response = session.get(next_page, headers=headers, timeout=30)
+                response.raise_for_status()
+                fetched.requests += 1
+                fetched.rate_limit_remaining = response.headers.get("X-RateLimit-Remaining")
+                fetched.issues.extend(response.json())
+        return fetched
 
     def get_issue(self, issue_url: str) -> tuple[GithubIssue, bool]:
         match = re.match(
@@ -145,7 +259,7 @@ class GithubService:
     def submit_issue(self, issue_url: str, test_id: UUID, run_id: UUID, event_id: UUID | str = None):
         test: ArgusTest = ArgusTest.get(id=test_id)
         plugin = self.get_plugin(plugin_name=test.plugin_name)
-        run = plugin.model.get(id=run_id)
+        run = plugin.model.get_by_id(run_id)
         issue, state = self.get_issue(issue_url)
 
         link = IssueLink()
@@ -1,7 +1,12 @@
 import logging
+import time
 from collections import defaultdict
+from dataclasses import dataclass, field
 from uuid import UUID
 
+from cassandra.cqlengine.models import Model
+from cassandra.cqlengine.query import BatchQuery, BatchType
+
 from argus.backend.models.github_issue import IssueLink
 from argus.backend.models.web import ArgusTest
 from argus.backend.plugins.loader import AVAILABLE_PLUGINS
@@ -10,6 +15,58 @@ from argus.backend.util.common import check_version, chunk
 LOGGER = logging.getLogger(__name__)
 
 
+@dataclass
+class IssueRefreshStats:
+    """Throughput and API quota figures of an issue refresh, logged when it finishes"""
+    source: str
+    started_at: float = field(default_factory=time.monotonic)
+    requests: int = 0
+    not_modified: int = 0
+    failed: int = 0
+    fetched: int = 0
+    updated: int = 0
+    tracked: int = 0
+    rate_limit_remaining: int | None = None
+
+    def track_rate_limit(self, remaining: str | int | None) -> None:
+        if remaining is None:
+            return
+        remaining = int(remaining)
+        if self.rate_limit_remaining is None or remaining < self.rate_limit_remaining:
+            self.rate_limit_remaining = remaining
+
+    def as_dict(self) -> dict:
+        elapsed = time.monotonic() - self.started_at
+        return {
+            "source": self.source,
+            "elapsed": round(elapsed, 2),
+            "requests": self.requests,
+            "not_modified": self.not_modified,
+            "failed": self.failed,
+            "fetched": self.fetched,
+            "updated": self.updated,
+            "tracked": self.tracked,
+            "fetched_per_second": round(self.fetched / elapsed, 2) if elapsed else 0.0,
+            "rate_limit_remaining": self.rate_limit_remaining,
+        }
+
+    def log(self) -> dict:
+        stats = self.as_dict()
+        LOGGER.info("%s issue refresh finished in %ss: %s requests (%s not modified, %s failed), %s issues fetched "
+                    "(%s/s), %s out of %s tracked issues updated, rate limit remaining: %s", stats["source"],
+                    stats["elapsed"], stats["requests"], stats["not_modified"], stats["failed"], stats["fetched"],
+                    stats["fetched_per_second"], stats["updated"], stats["tracked"], stats["rate_limit_remaining"])
+        return stats
+
+
+def save_issues_batched(issues: list[Model], batch_size: int = 50) -> None:
+    """Save changed issues with unlogged batches instead of one request per issue"""
+    for batch in chunk(issues, batch_size):
+        with BatchQuery(batch_type=BatchType.Unlogged) as query:
+            for issue in batch:
+                issue.batch(query).save()
+
+
 def build_version_map(links: list[IssueLink]) -> dict[UUID, str | None]:
     """Resolve scylla_version for run_ids by looking up only the correct plugin table.
 
@@ -9,6 +9,7 @@ import logging
 from flask import current_app, g
 
 from argus.backend.models.web import ArgusGroup, ArgusRelease, ArgusTest, UserOauthToken
+from argus.backend.service.test_lookup import TEST_SEARCH_INDEX
 
 LOGGER = logging.getLogger(__name__)
 GITHUB_REPO_RE = r"(?P<http>^https?:\/\/(www\.)?github\.com\/(?P<user>[\w\d\-]+)\/(?P<repo>[\w\d\-]+)(\.git)?$)|(?P<ssh>git@github\.com:(?P<ssh_user>[\w\d\-]+)\/(?P<ssh_repo>[\w\d\-]+)(\.git)?)"
@@ -271,6 +272,7 @@ class JenkinsService:
         new_job_info = self._jenkins.get_job_info(name=jenkins_new_build_id)
         new_test.build_system_url = new_job_info["url"]
         new_test.save()
+        TEST_SEARCH_INDEX.entity_changed(new_test)
 
         if advanced_settings:
             self.adjust_job_settings(build_id=jenkins_new_build_id,
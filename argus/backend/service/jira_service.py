@@ -2,6 +2,7 @@ from hashlib import sha1
 import re
 import logging
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import UTC, datetime
 from functools import reduce
 from unittest.mock import MagicMock
@@ -17,6 +18,7 @@ from argus.backend.models.github_issue import IssueLink, IssueLabel
 from argus.backend.plugins.core import PluginInfoBase
 from argus.backend.plugins.loader import AVAILABLE_PLUGINS
 from argus.backend.service.event_service import EventService
+from argus.backend.service.issue_utils import IssueRefreshStats, save_issues_batched
 from argus.backend.util.common import chunk
 
 LOGGER = logging.getLogger(__name__)
@@ -28,6 +30,8 @@ class JiraServiceException(Exception):
 
 class JiraService:
     LAST_RAN_KEY = "jira_service_last_issue_refresh"
+    REFRESH_WORKERS = 8
+    REFRESH_FIELDS = "summary,status,assignee,labels"
 
     plugins = AVAILABLE_PLUGINS
 
@@ -44,7 +48,11 @@ class JiraService:
     def derive_label_id(self, label: str):
         return int(sha1(label.encode()).hexdigest()[:8], base=16)
 
-    def refresh_stale_issues(self):
+    def refresh_stale_issues(self) -> dict:
+        """
+            Refresh tracked issues updated in Jira since the last sync. Projects of the tracked
+            issues are searched concurrently, requesting only the refreshed fields.
+        """
         try:
             last_ran = RuntimeStore.get(key=self.LAST_RAN_KEY)
         except RuntimeStore.DoesNotExist:
@@ -55,29 +63,63 @@ class JiraService:
 
         LOGGER.info("Starting JIRA Issue sync...")
         check_time = datetime.now(tz=UTC)
+        stats = IssueRefreshStats(source="Jira")
 
-        all_jira_issues: list[JiraIssue] = list(JiraIssue.all())
+        all_jira_issues: list[JiraIssue] = list(JiraIssue.objects().only(
+            ["id", "key", "project", "summary", "state", "labels", "assignees"]).limit(None))
         issue_by_key = { i.key: i for i in all_jira_issues }
+        stats.tracked = len(all_jira_issues)
         dt = last_ran.value.strftime("%Y-%m-%d %H:%M")
-        issues = self.jira.search_issues(f"updated >= \"{dt}\"", maxResults=0)
-        update_count = 0
-        LOGGER.info("Checking %s issues...", len(issues))
-        for issue in issues:
-            if local_issue := issue_by_key.get(issue.key):
-                LOGGER.debug("Updating %s...", issue.key)
-                local_issue.summary = issue.fields.summary
-                local_issue.state = issue.fields.status.name.lower()
-                if assignee := issue.fields.assignee:
-                    local_issue.assignees = [assignee.emailAddress]
-                else:
-                    local_issue.assignees = []
-                local_issue.labels = [IssueLabel(id=self.derive_label_id(label), name=label, color="000", description="") for label in issue.fields.labels]
-                local_issue.save()
-                update_count += 1
-
-        LOGGER.info("Finished. Updated %s out of %s issues", update_count, len(all_jira_issues))
-        last_ran.value = check_time
-        last_ran.save()
+        projects = {issue.project or issue.key.split("-")[0] for issue in all_jira_issues if issue.key}
+        changed: list[JiraIssue] = []
+        workers = current_app.config.get("ISSUE_REFRESH_WORKERS", self.REFRESH_WORKERS)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(self.jira.search_issues, f"project = \"{project}\" AND updated >= \"{dt}\"",
+                                maxResults=False, fields=self.REFRESH_FIELDS): project
+                for project in projects
+            }
+            for future in as_completed(futures):
+                project = futures[future]
+                try:
+                    issues = future.result()
+                except Exception:
+                    LOGGER.warning("Unable to search issues of %s, skipping", project, exc_info=True)
+                    stats.failed += 1
+                    continue
+                stats.requests += 1
+                stats.fetched += len(issues)
+                LOGGER.info("Checking %s issues of %s...", len(issues), project)
+                for issue in issues:
+                    if (local_issue := issue_by_key.get(issue.key)) and self._apply_remote_issue(local_issue, issue):
+                        LOGGER.debug("Updating %s...", issue.key)
+                        changed.append(local_issue)
+
+        save_issues_batched(changed)
+        stats.updated = len(changed)
+        if stats.failed:
+            # The window is shared by all projects, keep it so failed projects are searched again next time
+            LOGGER.warning("%s project searches failed, keeping last sync time at %s", stats.failed, dt)
+        else:
+            last_ran.value = check_time
+            last_ran.save()
+        return stats.log()
+
+    def _apply_remote_issue(self, local_issue: JiraIssue, issue) -> bool:
+        """Copy remote fields to the issue, returning whether anything changed"""
+        summary = issue.fields.summary
+        state = issue.fields.status.name.lower()
+        assignees = [assignee.emailAddress] if (assignee := issue.fields.assignee) else []
+        label_names = list(issue.fields.labels)
+        if (local_issue.summary == summary and local_issue.state == state and local_issue.assignees == assignees
+                and [label.name for label in local_issue.labels] == label_names):
+            return False
+        local_issue.summary = summary
+        local_issue.state = state
+        local_issue.assignees = assignees
+        local_issue.labels = [IssueLabel(id=self.derive_label_id(label), name=label, color="000", description="")
+                              for label in label_names]
+        return True
 
     def get_issue(self, issue_url: str) -> tuple[JiraIssue, bool]:
         server_host = re.escape(urlparse(current_app.config["JIRA_SERVER"]).hostname)
@@ -125,7 +167,7 @@ class JiraService:
     def submit_issue(self, issue_url: str, test_id: UUID, run_id: UUID, event_id: UUID | str = None):
         test: ArgusTest = ArgusTest.get(id=test_id)
         plugin = self.get_plugin(plugin_name=test.plugin_name)
-        run = plugin.model.get(id=run_id)
+        run = plugin.model.get_by_id(run_id)
         issue, state = self.get_issue(issue_url)
 
         link = IssueLink()
@@ -3,7 +3,9 @@ from typing import TypedDict
 from uuid import UUID
 from argus.backend.db import ScyllaCluster
 from argus.backend.plugins.sct.testrun import SCTTestRun
-from argus.backend.models.web import ArgusRelease, ArgusGroup, ArgusTest, ReleaseDistinctVersions, ReleaseDistinctImages, ReleaseStatsSnapshot, invalidate_release_snapshots
+from argus.backend.models.web import ArgusRelease, ArgusGroup, ArgusTest, ReleaseDistinctVersions, ReleaseDistinctImages, ReleaseStatsSnapshot, ReleaseTestStatus, invalidate_release_snapshots
+from argus.backend.service.stats import refresh_test_status
+from argus.backend.service.test_lookup import TEST_SEARCH_INDEX
 
 LOGGER = logging.getLogger(__name__)
 
@@ -48,6 +50,7 @@ class ReleaseManagerService:
         test: ArgusTest = ArgusTest.get(id=test_id)
         test.enabled = new_state
         test.save()
+        TEST_SEARCH_INDEX.entity_changed(test)
         invalidate_release_snapshots(test.release_id)
         return test
 
@@ -55,6 +58,7 @@ class ReleaseManagerService:
         test: ArgusGroup = ArgusGroup.get(id=group_id)
         test.enabled = new_state
         test.save()
+        TEST_SEARCH_INDEX.entity_changed(test)
         invalidate_release_snapshots(test.release_id)
         return test
 
@@ -68,6 +72,7 @@ class ReleaseManagerService:
             release.perpetual = perpetual
 
             release.save()
+            TEST_SEARCH_INDEX.entity_changed(release)
         else:
             raise ReleaseManagerException(
                 f"Release {release_name} already exists!", release_name)
@@ -84,6 +89,7 @@ class ReleaseManagerService:
         new_group.release_id = release.id
         new_group.build_system_id = build_system_id
         new_group.save()
+        TEST_SEARCH_INDEX.entity_changed(new_group)
         invalidate_release_snapshots(release.id)
         return new_group
 
@@ -101,6 +107,7 @@ class ReleaseManagerService:
         new_test.build_system_url = build_url
         new_test.validate_build_system_id()
         new_test.save()
+        TEST_SEARCH_INDEX.entity_changed(new_test)
         self.move_test_runs(new_test)
         invalidate_release_snapshots(release.id)
         return new_test
@@ -113,19 +120,23 @@ class ReleaseManagerService:
         if delete_tests:
             for test in tests_to_change.all():
                 test.delete()
+                TEST_SEARCH_INDEX.remove(test.id)
         else:
             new_group = ArgusGroup.get(id=UUID(new_group_id))
             for test in tests_to_change.all():
                 test.group_id = new_group.id
                 test.save()
+                TEST_SEARCH_INDEX.upsert(test)
 
         group_to_delete.delete()
+        TEST_SEARCH_INDEX.entity_deleted(group_to_delete.id)
         invalidate_release_snapshots(group_to_delete.release_id)
         return True
 
     def delete_test(self, test_id: str) -> bool:
         test_to_delete = ArgusTest.get(id=test_id)
         test_to_delete.delete()
+        TEST_SEARCH_INDEX.entity_deleted(test_to_delete.id)
         invalidate_release_snapshots(test_to_delete.release_id)
         return True
 
@@ -138,6 +149,7 @@ class ReleaseManagerService:
         group.enabled = enabled
 
         group.save()
+        TEST_SEARCH_INDEX.entity_changed(group)
         invalidate_release_snapshots(group.release_id)
         return True
 
@@ -158,6 +170,7 @@ class ReleaseManagerService:
 
         test.validate_build_system_id()
         test.save()
+        TEST_SEARCH_INDEX.entity_changed(test)
         self.move_test_runs(test)
         invalidate_release_snapshots(test.release_id)
         return True
@@ -166,6 +179,7 @@ class ReleaseManagerService:
         release = ArgusRelease.get(id=UUID(release_id))
         release.enabled = state
         release.save()
+        TEST_SEARCH_INDEX.entity_changed(release)
         invalidate_release_snapshots(release.id)
         return True
 
@@ -173,6 +187,7 @@ class ReleaseManagerService:
         release = ArgusRelease.get(id=UUID(release_id))
         release.dormant = dormant
         release.save()
+        TEST_SEARCH_INDEX.entity_changed(release)
         invalidate_release_snapshots(release.id)
         return True
 
@@ -180,6 +195,7 @@ class ReleaseManagerService:
         release = ArgusRelease.get(id=UUID(release_id))
         release.perpetual = perpetual
         release.save()
+        TEST_SEARCH_INDEX.entity_changed(release)
         invalidate_release_snapshots(release.id)
         return True
 
@@ -194,6 +210,7 @@ class ReleaseManagerService:
         release.valid_version_regex = payload["valid_version_regex"]
 
         release.save()
+        TEST_SEARCH_INDEX.entity_changed(release)
         invalidate_release_snapshots(release.id)
         return True
 
@@ -206,6 +223,7 @@ class ReleaseManagerService:
 
         for entity in [*release_groups.all(), *release_tests.all()]:
             entity.delete()
+            TEST_SEARCH_INDEX.remove(entity.id)
 
         # Clean up denormalized index tables so no orphaned rows remain
         for row in ReleaseDistinctVersions.filter(release_id=release.id).all():
@@ -214,8 +232,10 @@ class ReleaseManagerService:
             row.delete()
         for row in ReleaseStatsSnapshot.filter(release_id=release.id).all():
             row.delete()
+        ReleaseTestStatus.filter(release_id=release.id).delete()
 
         release.delete()
+        TEST_SEARCH_INDEX.entity_deleted(release.id)
         return True
 
     def batch_move_tests(self, new_group_id: str, tests: list[str]) -> bool:
@@ -226,7 +246,9 @@ class ReleaseManagerService:
         for test in tests:
             test.group_id = group.id
             test.save()
+            TEST_SEARCH_INDEX.upsert(test)
             self.move_test_runs(test)
+        TEST_SEARCH_INDEX.generation.bump()
 
         invalidate_release_snapshots(group.release_id)
         return True
@@ -239,3 +261,5 @@ class ReleaseManagerService:
             run["group_id"] = test.group_id
             run["release_id"] = test.release_id
             self.session.execute(self.update_run_stmt, parameters=run)
+        if test.plugin_name == SCTTestRun._plugin_name:
+            refresh_test_status(SCTTestRun, test.build_system_id, test.release_id, test.id)
@@ -3,21 +3,33 @@ import logging
 import math
 import operator
 from collections import defaultdict
-from datetime import datetime, timezone
-from functools import partial, cache
-from typing import List, Dict, Any
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from typing import Iterable, List, Dict, Any, Literal
 from uuid import UUID, uuid4
 
 from dataclasses import dataclass
+from cassandra.concurrent import execute_concurrent_with_args
+from cassandra.query import UNSET_VALUE
 from argus.backend.db import ScyllaCluster
 from argus.backend.models.result import ArgusGenericResultMetadata, ArgusGenericResultData, ArgusBestResultData, ColumnMetadata, ArgusGraphView
 from argus.backend.plugins.sct.udt import PackageVersion
 from argus.backend.service.testrun import TestRunService
+from argus.backend.util.cache import (
+    GRAPH_AGGREGATES_CACHE,
+    RUNS_DETAILS_CACHE,
+    TABLES_METADATA_CACHE,
+    VERSION_MATRIX_CACHE,
+    sync_test_results_caches,
+)
 
 LOGGER = logging.getLogger(__name__)
 
 type RunId = str
 type ReleasesMap = dict[str, list[RunId]]
+type AggregationPeriod = Literal["day", "week"]
+
+AGGREGATION_PERIODS = ("day", "week")
 
 
 @dataclass
@@ -42,6 +54,10 @@ class Cell:
         rules = column_validation_rules[-1] if column_validation_rules else {}
         higher_is_better = next(
             (col.higher_is_better for col in table_metadata.columns_meta if col.name == self.column), None)
+        self.apply_validation_rules(rules, higher_is_better, best_results)
+
+    def apply_validation_rules(self, rules, higher_is_better: bool | None,
+                               best_results: dict[str, List[BestResult]]) -> None:
         if not rules or self.status != "UNSET" or higher_is_better is None:
             return
         is_better = partial(operator.gt, self.value) if higher_is_better else partial(operator.lt, self.value)
@@ -138,26 +154,67 @@ dash_patterns = [
 ]
 
 
+type CellsIndex = dict[tuple[str, str], list[ArgusGenericResultData]]
+type RunReleases = dict[RunId, tuple[int, ...]]
+
+
+def index_cells(data: List[ArgusGenericResultData]) -> CellsIndex:
+    """Group result cells by (column, row) in a single pass"""
+    cells_index = defaultdict(list)
+    for entry in data:
+        cells_index[(entry.column, entry.row)].append(entry)
+    return cells_index
+
+
+def index_run_releases(releases_map: ReleasesMap) -> RunReleases:
+    """Map run ids to positions of the releases (in releases_map order) they belong to"""
+    run_releases = defaultdict(tuple)
+    for v_idx, run_ids in enumerate(releases_map.values()):
+        for run_id in set(run_ids):
+            run_releases[run_id] += (v_idx,)
+    return dict(run_releases)
+
+
+def _format_package_versions(packages: list[PackageVersion]) -> dict[str, str]:
+    return {pkg.name: pkg.version + (f" ({pkg.date})" if pkg.date else "") for pkg in packages}
+
+
 def get_sorted_data_for_column_and_row(data: List[ArgusGenericResultData], column: str, row: str,
                                        runs_details: RunsDetails, main_package: str) -> List[Dict[str, Any]]:
+    cells = [entry for entry in data if entry.column == column and entry.row == row]
+    return get_sorted_points(cells, runs_details, main_package)
+
+
+def get_sorted_points(cells: List[ArgusGenericResultData], runs_details: RunsDetails, main_package: str,
+                      versions_by_run: dict[RunId, dict[str, str]] | None = None) -> List[Dict[str, Any]]:
+    """
+    Build sorted chart points for the cells of one (column, row) series, annotated with package changes.
+    versions_by_run memoizes formatted package versions per run and may be shared between series.
+    """
     points = sorted([{"x": entry.sut_timestamp.strftime('%Y-%m-%dT%H:%M:%SZ'),
                       "y": entry.value,
                       "id": entry.run_id,
                       }
-                     for entry in data if entry.column == column and entry.row == row],
+                     for entry in cells],
                     key=lambda point: point["x"])
     if not points:
         return points
     packages = runs_details.packages
-    prev_versions = {pkg.name: pkg.version + (f" ({pkg.date})" if pkg.date else "")
-                     for pkg in packages.get(points[0]["id"], [])}
+    if versions_by_run is None:
+        versions_by_run = {}
+
+    def run_versions(run_id: RunId) -> dict[str, str]:
+        if (versions := versions_by_run.get(run_id)) is None:
+            versions = versions_by_run[run_id] = _format_package_versions(packages.get(run_id, []))
+        return dict(versions)
+
+    prev_versions = run_versions(points[0]["id"])
     points[0]['changes'] = [f"{main_package}: {prev_versions.pop(main_package, None)}"]
     points[0]['dep_change'] = False
     for point in points[1:]:
         changes = []
         mark_dependency_change = False
-        current_versions = {pkg.name: pkg.version + (f" ({pkg.date})" if pkg.date else "")
-                            for pkg in packages.get(point["id"], [])}
+        current_versions = run_versions(point["id"])
         main_package_version = current_versions.pop(main_package, None)
         for pkg_name in current_versions.keys() | prev_versions.keys():
             curr_ver = current_versions.get(pkg_name)
@@ -173,6 +230,81 @@ def get_sorted_data_for_column_and_row(data: List[ArgusGenericResultData], colum
     return points
 
 
+def _point_timestamp(point: Dict[str, Any]) -> float:
+    return datetime.strptime(point["x"], '%Y-%m-%dT%H:%M:%SZ').replace(tzinfo=timezone.utc).timestamp()
+
+
+def lttb_indices(xs: List[float], ys: List[float], threshold: int) -> List[int]:
+    """Largest-Triangle-Three-Buckets: indices of `threshold` points that best preserve the shape of the series"""
+    length = len(xs)
+    if threshold >= length or threshold < 3:
+        return list(range(length))
+
+    selected = [0]
+    bucket_size = (length - 2) / (threshold - 2)
+    anchor = 0
+    for bucket in range(threshold - 2):
+        next_start = int((bucket + 1) * bucket_size) + 1
+        next_end = min(int((bucket + 2) * bucket_size) + 1, length)
+        avg_x = sum(xs[next_start:next_end]) / (next_end - next_start)
+        avg_y = sum(ys[next_start:next_end]) / (next_end - next_start)
+
+        best_index, best_area = None, -1
+        for index in range(int(bucket * bucket_size) + 1, next_start):
+            area = abs((xs[anchor] - avg_x) * (ys[index] - ys[anchor]) - (xs[anchor] - xs[index]) * (avg_y - ys[anchor]))
+            if area > best_area:
+                best_index, best_area = index, area
+        selected.append(best_index)
+        anchor = best_index
+    selected.append(length - 1)
+    return selected
+
+
+def downsample_points(points: List[Dict[str, Any]], max_points: int, keep_ids: set[str]) -> List[Dict[str, Any]]:
+    """
+    Reduce sorted points to roughly max_points using LTTB. Points of runs in keep_ids (limit breaches, best results)
+    and dependency changes are always kept, so the result may exceed the budget by their count.
+    """
+    if len(points) <= max_points:
+        return points
+    xs = [_point_timestamp(point) for point in points]
+    ys = [point["y"] or 0 for point in points]
+    selected = set(lttb_indices(xs, ys, max_points))
+    selected.update(idx for idx, point in enumerate(points) if point["dep_change"] or str(point["id"]) in keep_ids)
+    return [points[idx] for idx in sorted(selected)]
+
+
+def aggregate_points(points: List[Dict[str, Any]], period: AggregationPeriod, run_releases: RunReleases) -> List[Dict[str, Any]]:
+    """
+    Collapse sorted points into one point per release and day/week holding the mean value. Each aggregated point
+    is attributed to the last run of its bucket and carries all package changes seen within it.
+    """
+    buckets: dict[tuple[str, tuple[int, ...]], list[Dict[str, Any]]] = defaultdict(list)
+    for point in points:
+        day = datetime.strptime(point["x"][:10], '%Y-%m-%d')
+        if period == "week":
+            day -= timedelta(days=day.weekday())
+        buckets[(day.strftime('%Y-%m-%dT%H:%M:%SZ'), run_releases.get(point["id"], ()))].append(point)
+
+    aggregated = []
+    for (bucket_start, _), bucket_points in buckets.items():
+        values = [point["y"] for point in bucket_points if point["y"] is not None]
+        changes = [bucket_points[-1]["changes"][0]]
+        for point in bucket_points:
+            changes.extend(change for change in point["changes"][1:] if change not in changes)
+        aggregated.append({
+            "x": bucket_start,
+            "y": sum(values) / len(values) if values else None,
+            "id": bucket_points[-1]["id"],
+            "changes": changes,
+            "dep_change": any(point["dep_change"] for point in bucket_points),
+            "min": min(values, default=None),
+            "max": max(values, default=None),
+            "count": len(bucket_points),
+        })
+    return sorted(aggregated, key=lambda point: point["x"])
+
+
 def get_min_max_y(datasets: List[Dict[str, Any]]) -> (float, float):
     """0.5 - 1.5 of min/max of 50% results"""
     y = [entry['y'] for dataset in datasets for entry in dataset['data'] if entry['y'] is not None]
@@ -232,19 +364,35 @@ def calculate_limits(points: List[dict], best_results: List, validation_rules_li
 
 def create_datasets_for_column(table: ArgusGenericResultMetadata, data: list[ArgusGenericResultData],
                                best_results: dict[str, List[BestResult]], releases_map: ReleasesMap, column: ColumnMetadata,
-                               runs_details: RunsDetails, main_package: str) -> List[Dict]:
+                               runs_details: RunsDetails, main_package: str, max_points: int | None = None,
+                               aggregate: AggregationPeriod | None = None, cells_index: CellsIndex | None = None,
+                               run_releases: RunReleases | None = None,
+                               versions_by_run: dict[RunId, dict[str, str]] | None = None) -> List[Dict]:
     """
     Create datasets (series) for a specific column, splitting by version and showing limit lines.
+    Series are optionally aggregated per day/week or downsampled to about max_points points each.
+    Indexes built by create_chartjs can be passed to avoid rescanning data for every row.
     """
     datasets = []
     is_fixed_limit_drawn = False
+    if cells_index is None:
+        cells_index = index_cells(data)
+    if run_releases is None:
+        run_releases = index_run_releases(releases_map)
 
     for idx, row in enumerate(table.rows_meta):
         line_color = colors[idx % len(colors)]
         line_dash = dash_patterns[idx % len(dash_patterns)]
-        points = get_sorted_data_for_column_and_row(data, column.name, row, runs_details, main_package)
+        cells = cells_index.get((column.name, row), [])
+        points = get_sorted_points(cells, runs_details, main_package, versions_by_run)
+        if aggregate:
+            points = aggregate_points(points, aggregate, run_releases)
+        elif max_points:
+            keep_ids = {str(entry.run_id) for entry in cells if entry.status == "ERROR"}
+            keep_ids.update(str(best.run_id) for best in best_results.get(f"{column.name}:{row}", []))
+            points = downsample_points(points, max_points, keep_ids)
 
-        datasets.extend(create_release_datasets(points, row, releases_map, line_dash))
+        datasets.extend(create_release_datasets(points, row, releases_map, line_dash, run_releases))
 
         limit_dataset = create_limit_dataset(points, column, row, best_results, table, line_color, is_fixed_limit_drawn)
         if limit_dataset:
@@ -254,14 +402,21 @@ def create_datasets_for_column(table: ArgusGenericResultMetadata, data: list[Arg
     return datasets
 
 
-def create_release_datasets(points: list[Dict], row: str, releases_map: ReleasesMap, line_dash: list[int]) -> List[Dict]:
+def create_release_datasets(points: list[Dict], row: str, releases_map: ReleasesMap, line_dash: list[int],
+                            run_releases: RunReleases | None = None) -> List[Dict]:
     """
     Create datasets separately for each release.
     """
-    release_datasets = []
+    if run_releases is None:
+        run_releases = index_run_releases(releases_map)
+    points_by_release = defaultdict(list)
+    for point in points:
+        for v_idx in run_releases.get(point["id"], ()):
+            points_by_release[v_idx].append(point)
 
-    for v_idx, (release, run_ids) in enumerate(releases_map.items()):
-        release_points = [point for point in points if point["id"] in run_ids]
+    release_datasets = []
+    for v_idx, release in enumerate(releases_map):
+        release_points = points_by_release.get(v_idx)
 
         if release_points:
             release_datasets.append({
@@ -368,17 +523,23 @@ def _split_results_by_release(packages: dict[str, list[PackageVersion]], main_pa
 
 
 def create_chartjs(table: ArgusGenericResultMetadata, data: list[ArgusGenericResultData], best_results: dict[str, List[BestResult]],
-                   releases_map: ReleasesMap, runs_details: RunsDetails, main_package: str) -> List[Dict]:
+                   releases_map: ReleasesMap, runs_details: RunsDetails, main_package: str, max_points: int | None = None,
+                   aggregate: AggregationPeriod | None = None) -> List[Dict]:
     """
     Create Chart.js-compatible graph for each column in the table.
     """
     graphs = []
     columns = [column for column in table.columns_meta
                if column.type != "TEXT" and column.visible is not False]
+    cells_index = index_cells(data)
+    run_releases = index_run_releases(releases_map)
+    versions_by_run = {}
 
     for column in columns:
         datasets = create_datasets_for_column(table, data, best_results, releases_map,
-                                              column, runs_details, main_package)
+                                              column, runs_details, main_package, max_points, aggregate,
+                                              cells_index=cells_index, run_releases=run_releases,
+                                              versions_by_run=versions_by_run)
 
         if datasets:
             min_y, max_y = get_min_max_y(datasets)
@@ -389,7 +550,47 @@ def create_chartjs(table: ArgusGenericResultMetadata, data: list[ArgusGenericRes
     return graphs
 
 
+def _build_version_matrix(rows: Iterable[dict], sut_package_name: str) -> tuple[dict[str, dict[str, dict]], dict | None]:
+    """
+    Build one test's slice of the version matrix: the newest non-ignored run of every test method per SUT version,
+    along with the test info taken from the first such run.
+    """
+    sut_names = [f"{sut_package_name}-upgraded",
+                 f"{sut_package_name}-upgrade-target",
+                 sut_package_name,
+                 f"{sut_package_name}-target"]
+    methods_by_version = defaultdict(dict)
+    test_info = None
+    for row in rows:
+        if row["investigation_status"].lower() == "ignored":
+            continue
+        test_method = row['test_method']
+        if not test_method:
+            continue
+        versions = {pkg.name: pkg for pkg in reversed(row['packages'] or [])}
+        sut_version = next((f"{versions[name].version}-{versions[name].date}-{versions[name].revision_id}"
+                            for name in sut_names if name in versions), None)
+        if sut_version is None:
+            continue
+        method_name = test_method.rsplit('.', 1)[-1]
+
+        if method_name not in methods_by_version[sut_version]:
+            methods_by_version[sut_version][method_name] = {
+                'run_id': str(row['id']),
+                'status': row['status'],
+                'started_by': row['started_by']
+            }
+
+        if not test_info:
+            test_info = {
+                'name': row['test_name'],
+                'build_id': row['build_id']
+            }
+    return dict(methods_by_version), test_info
+
+
 class ResultsService:
+    CELL_WRITE_CONCURRENCY = 100
 
     def __init__(self):
         self.cluster = ScyllaCluster.get()
@@ -407,8 +608,11 @@ class ResultsService:
         packages = [p for p in packages if p.name not in packages_to_remove]
         return packages
 
-    @cache
     def _get_runs_details(self, test_id: UUID) -> RunsDetails:
+        sync_test_results_caches(test_id)
+        return RUNS_DETAILS_CACHE.get_or_load(test_id, lambda: self._load_runs_details(test_id))
+
+    def _load_runs_details(self, test_id: UUID) -> RunsDetails:
         plugin_query = self.cluster.prepare("SELECT id, plugin_name FROM argus_test_v2 WHERE id = ?")
         plugin_name = self.cluster.session.execute(plugin_query, parameters=(test_id,)).one()['plugin_name']
         plugin = TestRunService().get_plugin(plugin_name)
@@ -421,6 +625,10 @@ class ResultsService:
         return RunsDetails(ignored=ignored_runs, packages=packages)
 
     def _get_tables_metadata(self, test_id: UUID) -> list[ArgusGenericResultMetadata]:
+        sync_test_results_caches(test_id)
+        return list(TABLES_METADATA_CACHE.get_or_load(test_id, lambda: self._load_tables_metadata(test_id)))
+
+    def _load_tables_metadata(self, test_id: UUID) -> list[ArgusGenericResultMetadata]:
         query_fields = ["name", "description", "columns_meta", "rows_meta", "validation_rules", "sut_package_name"]
         raw_query = (f"SELECT {','.join(query_fields)}"
                      f" FROM generic_result_metadata_v1 WHERE test_id = ?")
@@ -462,8 +670,9 @@ class ResultsService:
         query = self.cluster.prepare(raw_query)
         tables_meta = self._get_tables_metadata(test_id=test_id)
         table_entries = []
-        for table in tables_meta:
-            cells = self.cluster.session.execute(query=query, parameters=(test_id, run_id, table.name))
+        tables_cells = execute_concurrent_with_args(
+            self.cluster.session, query, [(test_id, run_id, table.name) for table in tables_meta], concurrency=50)
+        for table, (_, cells) in zip(tables_meta, tables_cells):
             cells = [dict(cell.items()) for cell in cells]
             if key_metrics:
                 cells = [cell for cell in cells if cell['column'] in key_metrics]
@@ -524,7 +733,15 @@ class ResultsService:
 
         return [{entry['table_name']: entry['table_data']} for entry in table_entries]
 
-    def get_test_graphs(self, test_id: UUID, start_date: datetime | None = None, end_date: datetime | None = None, table_names: list[str] | None = None):
+    def get_test_graphs(self, test_id: UUID, start_date: datetime | None = None, end_date: datetime | None = None,
+                        table_names: list[str] | None = None, max_points: int | None = None,
+                        aggregate: AggregationPeriod | None = None):
+        """
+        Build graphs for test result tables. With max_points, each series is downsampled with LTTB to about
+        that many points; with aggregate ("day" or "week"), series are averaged per period and cached per table.
+        """
+        if aggregate and aggregate not in AGGREGATION_PERIODS:
+            raise ValueError(f"Unsupported aggregation period: {aggregate}")
         runs_details = self._get_runs_details(test_id)
         tables_meta = self._get_tables_metadata(test_id=test_id)
 
@@ -534,22 +751,36 @@ class ResultsService:
         graphs = []
         releases_filters = set()
         for table in tables_meta:
-            data = self._get_tables_data(test_id=test_id, table_name=table.name, ignored_runs=runs_details.ignored,
-                                         start_date=start_date, end_date=end_date)
-            if not data:
-                continue
-            best_results = self.get_best_results(test_id=test_id, name=table.name)
-            main_package = tables_meta[0].sut_package_name
-            if not main_package:
-                main_package = _identify_most_changed_package(
-                    [pkg for sublist in runs_details.packages.values() for pkg in sublist])
-            releases_map = _split_results_by_release(runs_details.packages, main_package=main_package)
-            graphs.extend(
-                create_chartjs(table, data, best_results, releases_map=releases_map, runs_details=runs_details, main_package=main_package))
-            releases_filters.update(releases_map.keys())
+            if aggregate:
+                table_graphs, releases = GRAPH_AGGREGATES_CACHE.get_or_load(
+                    (test_id, table.name, aggregate, start_date, end_date),
+                    partial(self._create_table_graphs, test_id, table, tables_meta, runs_details,
+                            start_date, end_date, None, aggregate))
+            else:
+                table_graphs, releases = self._create_table_graphs(test_id, table, tables_meta, runs_details,
+                                                                   start_date, end_date, max_points, None)
+            graphs.extend(table_graphs)
+            releases_filters.update(releases)
         ticks = calculate_graph_ticks(graphs)
         return graphs, ticks, list(releases_filters)
 
+    def _create_table_graphs(self, test_id: UUID, table: ArgusGenericResultMetadata, tables_meta: list[ArgusGenericResultMetadata],
+                             runs_details: RunsDetails, start_date: datetime | None, end_date: datetime | None,
+                             max_points: int | None, aggregate: AggregationPeriod | None) -> tuple[list[dict], list[str]]:
+        data = self._get_tables_data(test_id=test_id, table_name=table.name, ignored_runs=runs_details.ignored,
+                                     start_date=start_date, end_date=end_date)
+        if not data:
+            return [], []
+        best_results = self.get_best_results(test_id=test_id, name=table.name)
+        main_package = tables_meta[0].sut_package_name
+        if not main_package:
+            main_package = _identify_most_changed_package(
+                [pkg for sublist in runs_details.packages.values() for pkg in sublist])
+        releases_map = _split_results_by_release(runs_details.packages, main_package=main_package)
+        graphs = create_chartjs(table, data, best_results, releases_map=releases_map, runs_details=runs_details,
+                                main_package=main_package, max_points=max_points, aggregate=aggregate)
+        return graphs, list(releases_map.keys())
+
     def is_results_exist(self, test_id: UUID):
         """Verify if results for given test id exist at all."""
         return bool(ArgusGenericResultMetadata.objects(test_id=test_id).only(["name"]).limit(1))
@@ -572,6 +803,8 @@ class ResultsService:
         """update best results for given test_id and table_name based on cells values - if any value is better than current best"""
         higher_is_better_map = {meta["name"]: meta.higher_is_better for meta in table_metadata.columns_meta}
         best_results = self.get_best_results(test_id=test_id, name=table_name)
+        result_date = datetime.now(timezone.utc)
+        new_best_results: dict[str, BestResult] = {}
         for cell in cells:
             if cell.value is None:
                 # textual value, skip
@@ -584,15 +817,53 @@ class ResultsService:
             is_better = partial(operator.gt, cell.value) if higher_is_better_map[cell.column] \
                 else partial(operator.lt, cell.value)
             if current_best is None or is_better(current_best.value):
-                result_date = datetime.now(timezone.utc)
-                best_results[key].append(BestResult(key=key, value=cell.value, result_date=result_date, run_id=run_id))
-                ArgusBestResultData(test_id=test_id, name=table_name, key=key, value=cell.value, result_date=result_date,
-                                    run_id=run_id).save()
+                best = BestResult(key=key, value=cell.value, result_date=result_date, run_id=run_id)
+                best_results[key].append(best)
+                new_best_results[key] = best
+        if new_best_results:
+            query = self.cluster.prepare(f"INSERT INTO {ArgusBestResultData.__table_name__} "
+                                         "(test_id, name, key, value, result_date, run_id) VALUES (?, ?, ?, ?, ?, ?)")
+            params = [(test_id, table_name, best.key, best.value, best.result_date, UUID(str(best.run_id)))
+                      for best in new_best_results.values()]
+            execute_concurrent_with_args(self.cluster.session, query, params,
+                                         concurrency=self.CELL_WRITE_CONCURRENCY, raise_on_first_error=True)
         return best_results
 
+    @staticmethod
+    def evaluate_cells(table_metadata: ArgusGenericResultMetadata, cells: list[Cell],
+                       best_results: dict[str, List[BestResult]]) -> bool:
+        """
+        Set PASS/ERROR status of the cells like Cell.update_cell_status_based_on_rules,
+        looking up the rules of each column once. Returns whether any cell failed.
+        """
+        rules_map = {column: rules[-1] for column, rules in table_metadata.validation_rules.items() if rules}
+        higher_is_better_map = {col.name: col.higher_is_better for col in table_metadata.columns_meta}
+        failed = False
+        for cell in cells:
+            cell.apply_validation_rules(rules_map.get(cell.column, {}), higher_is_better_map.get(cell.column),
+                                        best_results)
+            failed = failed or cell.status == "ERROR"
+        return failed
+
+    def save_cells(self, test_id: UUID, run_id: UUID, table_name: str, sut_timestamp: datetime,
+                   cells: list[Cell]) -> None:
+        """Write all cells of a results table with concurrent prepared inserts"""
+        query = self.cluster.prepare(
+            f"INSERT INTO {ArgusGenericResultData.__table_name__} "
+            "(test_id, name, run_id, column, row, sut_timestamp, value, value_text, status) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)")
+        # Unset instead of null, like cqlengine inserts, so missing values don't write tombstones
+        params = [(test_id, table_name, run_id, cell.column, cell.row, sut_timestamp,
+                   UNSET_VALUE if cell.value is None else cell.value,
+                   UNSET_VALUE if cell.value_text is None else cell.value_text, cell.status) for cell in cells]
+        execute_concurrent_with_args(self.cluster.session, query, params,
+                                     concurrency=self.CELL_WRITE_CONCURRENCY, raise_on_first_error=True)
+
     def _exclude_disabled_tests(self, test_ids: list[UUID]) -> list[UUID]:
         is_enabled_query = self.cluster.prepare("SELECT id, enabled FROM argus_test_v2 WHERE id = ?")
-        return [test_id for test_id in test_ids if self.cluster.session.execute(is_enabled_query, parameters=(test_id,)).one()['enabled']]
+        results = execute_concurrent_with_args(self.cluster.session, is_enabled_query,
+                                               [(test_id,) for test_id in test_ids], concurrency=50)
+        return [test_id for test_id, (_, rows) in zip(test_ids, results) if (row := rows.one()) and row['enabled']]
 
     def get_tests_by_version(self, sut_package_name: str, test_ids: list[UUID]) -> dict:
         """
@@ -604,57 +875,43 @@ class ResultsService:
             }
         Currently works only with scylla-cluster-tests plugin (due to test_method field requirement)
         """
-        plugin = TestRunService().get_plugin("scylla-cluster-tests")
-        result = defaultdict(lambda: defaultdict(dict))
-        test_info = {}
         test_ids = self._exclude_disabled_tests(test_ids)
         for test_id in test_ids:
-            runs_details_query = self.cluster.prepare(
-                f"""
-                SELECT id, status, investigation_status, test_name, build_id, packages, test_method, started_by
-                FROM {plugin.model.table_name()}
-                WHERE test_id = ?
-                """
-            )
-            rows = self.cluster.session.execute(runs_details_query, parameters=(test_id,)).all()
-            for row in rows:
-                if row["investigation_status"].lower() == "ignored":
-                    continue
-                packages = row['packages']
-                test_method = row['test_method']
-                if not test_method:
-                    continue
-                for sut_name in [f"{sut_package_name}-upgraded",
-                                 f"{sut_package_name}-upgrade-target",
-                                 sut_package_name,
-                                 f"{sut_package_name}-target"
-                                 ]:
-                    sut_version = next(
-                        (f"{pkg.version}-{pkg.date}-{pkg.revision_id}" for pkg in packages if pkg.name == sut_name), None)
-                    if sut_version:
-                        break
-                if sut_version is None:
-                    continue
-                method_name = test_method.rsplit('.', 1)[-1]
-
-                if method_name not in result[sut_version][str(test_id)]:
-                    result[sut_version][str(test_id)][method_name] = {
-                        'run_id': str(row['id']),
-                        'status': row['status'],
-                        'started_by': row['started_by']
-                    }
+            sync_test_results_caches(test_id)
+        test_matrices = VERSION_MATRIX_CACHE.get_or_load_many(
+            [(test_id, sut_package_name) for test_id in test_ids], self._load_version_matrices)
 
-                if str(test_id) not in test_info:
-                    test_info[str(test_id)] = {
-                        'name': row['test_name'],
-                        'build_id': row['build_id']
-                    }
+        result = defaultdict(dict)
+        test_info = {}
+        for test_id in test_ids:
+            methods_by_version, info = test_matrices[(test_id, sut_package_name)]
+            for version, methods in methods_by_version.items():
+                result[version][str(test_id)] = methods
+            if info:
+                test_info[str(test_id)] = info
 
         return {
-            'versions': {version: dict(tests) for version, tests in result.items()},
+            'versions': dict(result),
             'test_info': test_info
         }
 
+    def _load_version_matrices(self, keys: list[tuple[UUID, str]]) -> dict[tuple[UUID, str], tuple[dict, dict | None]]:
+        """Read run history of the given tests concurrently and build their version matrix slices"""
+        plugin = TestRunService().get_plugin("scylla-cluster-tests")
+        runs_details_query = self.cluster.prepare(
+            f"""
+            SELECT id, status, investigation_status, test_name, build_id, packages, test_method, started_by
+            FROM {plugin.model.table_name()}
+            WHERE test_id = ?
+            """
+        )
+        results = execute_concurrent_with_args(self.cluster.session, runs_details_query,
+                                               [(test_id,) for test_id, _ in keys], concurrency=16)
+        return {
+            (test_id, sut_package_name): _build_version_matrix(rows, sut_package_name)
+            for (test_id, sut_package_name), (_, rows) in zip(keys, results)
+        }
+
     def create_argus_graph_view(self, test_id: UUID, name: str, description: str) -> ArgusGraphView:
         view_id = uuid4()
         graph_view = ArgusGraphView(test_id=test_id, id=view_id)
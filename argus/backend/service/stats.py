@@ -1,25 +1,32 @@
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
 from functools import reduce
 import json
 import logging
+import threading
+import time
 
 from datetime import UTC, datetime
-from typing import Any, TypedDict
-from uuid import UUID
+from typing import Any, Callable, Iterable, TypedDict
+from uuid import UUID, uuid4
 
 from flask import current_app
+from cassandra.concurrent import execute_concurrent_with_args
 from cassandra.cqlengine.models import Model
+from cassandra.cqlengine.query import LWTException
 from argus.backend.models.github_issue import GithubIssue, IssueLink
 from argus.backend.models.jira import JiraIssue
 from argus.backend.models.plan import ArgusReleasePlan
-from argus.backend.plugins.loader import all_plugin_models
+from argus.backend.models.runtime_store import RuntimeStore
+from argus.backend.plugins.core import PluginModelBase
+from argus.backend.plugins import loader
 from argus.backend.util.common import chunk, get_build_number, check_version
 from argus.common.enums import TestStatus, TestInvestigationStatus
 from argus.backend.models.web import ArgusRelease, ArgusGroup, ArgusScheduleTest, ArgusTest, \
-    ArgusTestRunComment, ArgusUserView, ReleaseStatsSnapshot
+    ArgusTestRunComment, ArgusUserView, ReleaseStatsSnapshot, ReleaseStatsRebuildLease, ReleaseTestStatus
 from argus.backend.db import ScyllaCluster
 
 LOGGER = logging.getLogger(__name__)
+LAST_RUNS_LIMIT = 5
 
 
 def snapshot_filter_key(version: str | None, image_id: str | None, include_no_version: bool, limited: bool) -> str:
@@ -154,8 +161,229 @@ def generate_field_status_map(
     return status_map
 
 
+def run_order_key(row: TestRunStatRow) -> int:
+    return row["build_number"] or get_build_number(row["build_job_url"])
+
+
+STATUS_PRIORITY = {status.value: priority for status, priority in ComparableTestStatus.PRIORITY_MAP.items()}
+
+
+def find_worst_case(runs: list[TestRunStatRow]) -> tuple[TestRunStatRow, TestRunStatRow] | None:
+    """
+        Single pass over a build's runs returning the latest run and the worst-case run of
+        the latest build, the same pair TestStats would get from sorting the runs and
+        looking up generate_field_status_map, compared by precomputed status priorities.
+    """
+    if not runs:
+        return None
+    last_run = max(runs, key=run_order_key)
+    build_number = last_run["build_number"]
+    if not build_number:
+        # Runs without a build number are ordered by their job url, keep that order for ties
+        runs = sorted(runs, reverse=True, key=run_order_key)
+    worst_run = None
+    worst_priority = -1
+    for run in runs:
+        if run["build_number"] != build_number:
+            continue
+        priority = STATUS_PRIORITY.get(run["status"], 0)
+        if priority > worst_priority:
+            worst_run, worst_priority = run, priority
+    return last_run, worst_run
+
+
+def compute_worst_cases(runs_by_build_id: dict[str, list[TestRunStatRow]]) -> dict[str, tuple[TestRunStatRow, TestRunStatRow]]:
+    return {
+        build_id: worst_case
+        for build_id, runs in runs_by_build_id.items()
+        if (worst_case := find_worst_case(runs))
+    }
+
+
+def reduce_build_runs(rows: list[TestRunStatRow], keep: int = LAST_RUNS_LIMIT) -> list[TestRunStatRow]:
+    """
+        Keep only the runs of a build that TestStats uses: the latest `keep` runs
+        and the worst-case run of the latest build.
+    """
+    runs = sorted(rows, reverse=True, key=run_order_key)
+    if len(runs) <= keep:
+        return runs
+    _, worst_run = find_worst_case(runs)
+    kept = runs[:keep]
+    if not any(run is worst_run for run in kept):
+        kept.append(worst_run)
+    return kept
+
+
+def stats_row_filter(version: str | None, include_no_version: bool, image_id: str | None) -> Callable[[TestRunStatRow], bool]:
+    if version:
+        if include_no_version:
+            expr = lambda row: check_version(version, row["scylla_version"]) or not row["scylla_version"]
+        elif version == "!noVersion":
+            expr = lambda row: not row["scylla_version"]
+        else:
+            expr = lambda row: check_version(version, row["scylla_version"])
+    else:
+        if include_no_version:
+            expr = lambda row: True
+        else:
+            expr = lambda row: bool(row["scylla_version"])
+
+    if not image_id:
+        return expr
+    return lambda row: expr(row) and _get_image(row) == image_id
+
+
+def collect_build_runs(
+    result_sets: Iterable[Iterable[TestRunStatRow]],
+    row_filter: Callable[[TestRunStatRow], bool],
+    summaries: list[TestRunStatRow] | None = None,
+) -> dict[str, list[TestRunStatRow]]:
+    """
+        Group streamed stats rows by build_id one result set at a time, keeping only the runs
+        TestStats needs. All runs of a build arrive in the same result set, since a build_id
+        is a partition key of a single slice query. When `summaries` is given, it is extended
+        with the unfiltered status-deciding runs of every build for seeding ReleaseTestStatus.
+    """
+    runs_by_build_id = {}
+    for result_set in result_sets:
+        build_rows = defaultdict(list)
+        for row in result_set:
+            build_rows[row["build_id"]].append(row)
+        for build_id, rows in build_rows.items():
+            if summaries is not None:
+                summaries.extend(summarize_test_runs(rows))
+            if rows := [row for row in rows if row_filter(row)]:
+                runs_by_build_id[build_id] = reduce_build_runs(rows)
+    return runs_by_build_id
+
+
+def summarize_test_runs(rows: list[TestRunStatRow]) -> list[TestRunStatRow]:
+    """
+        Reduce recent runs of a single test to the runs that decide its status: for every
+        reported version, the latest run and the worst-case run of the latest build.
+        TestStats yields the same status over these rows as over the full run list.
+    """
+    runs_by_version = defaultdict(list)
+    for row in sorted(rows, reverse=True, key=lambda r: r["start_time"]):
+        runs_by_version[row["scylla_version"] or ""].append(row)
+
+    summary = {}
+    for runs in runs_by_version.values():
+        last_run, worst_run = find_worst_case(runs)
+        summary[last_run["id"]] = last_run
+        summary[worst_run["id"]] = worst_run
+    return list(summary.values())
+
+
+def _status_summary_ready_key(release_id: UUID) -> str:
+    return f"release_test_status_ready:{release_id}"
+
+
+def is_status_summary_ready(release_id: UUID) -> bool:
+    try:
+        return bool(RuntimeStore.get(key=_status_summary_ready_key(release_id)).value)
+    except RuntimeStore.DoesNotExist:
+        return False
+
+
+def _status_summary_params(release_id: UUID, test_id: UUID, row: TestRunStatRow, updated_at: datetime) -> tuple:
+    return (release_id, test_id, row["scylla_version"] or "", row["id"], row["build_id"], row["build_number"],
+            row["build_job_url"], row["status"], row["investigation_status"], row["assignee"], row["start_time"], updated_at)
+
+
+def _prepare_status_summary_insert(cluster: ScyllaCluster):
+    return cluster.prepare(
+        f"INSERT INTO {ReleaseTestStatus.__table_name__} (release_id, test_id, version, run_id, build_id, build_number, "
+        "build_job_url, status, investigation_status, assignee, start_time, updated_at) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)")
+
+
+def refresh_test_status(model: PluginModelBase, build_id: str, release_id: UUID | None, test_id: UUID | None) -> None:
+    """
+        Recompute materialized status rows of a single test from its latest runs.
+        Called whenever a run changes status, investigation status, assignee or version.
+    """
+    if not release_id or not test_id:
+        return
+    try:
+        cluster = ScyllaCluster.get()
+        query = cluster.prepare(model._stats_query())
+        rows = cluster.session.execute(query=query, parameters=([build_id],), execution_profile="read_fast")
+        summary = summarize_test_runs(list(rows))
+        keys = {(row["scylla_version"] or "", row["id"]) for row in summary}
+        for existing in ReleaseTestStatus.filter(release_id=release_id, test_id=test_id).all():
+            if (existing.version, existing.run_id) not in keys:
+                existing.delete()
+        insert = _prepare_status_summary_insert(cluster)
+        now = datetime.now(UTC)
+        for row in summary:
+            cluster.session.execute(insert, parameters=_status_summary_params(release_id, test_id, row, now))
+    except Exception:
+        LOGGER.warning("Failed to refresh test status for %s in release %s", build_id, release_id, exc_info=True)
+
+
+def seed_release_status(release_id: UUID, tests: list[ArgusTest], rows: list[TestRunStatRow]) -> None:
+    """
+        Rebuild materialized status rows of a whole release from already fetched stats rows
+        and mark the release as ready to be served from them.
+    """
+    try:
+        cluster = ScyllaCluster.get()
+        runs_by_build_id = defaultdict(list)
+        for row in rows:
+            runs_by_build_id[row["build_id"]].append(row)
+        now = datetime.now(UTC)
+        params = [
+            _status_summary_params(release_id, test.id, row, now)
+            for test in tests
+            for row in summarize_test_runs(runs_by_build_id.get(test.build_system_id, []))
+        ]
+        ReleaseTestStatus.filter(release_id=release_id).delete()
+        results = execute_concurrent_with_args(cluster.session, _prepare_status_summary_insert(cluster), params,
+                                               concurrency=50, raise_on_first_error=False)
+        if not all(success for success, _ in results):
+            LOGGER.warning("Failed to seed some test statuses for release %s", release_id)
+            return
+        ready = RuntimeStore()
+        ready.key = _status_summary_ready_key(release_id)
+        ready.value = True
+        ready.save()
+    except Exception:
+        LOGGER.warning("Failed to seed test statuses for release %s", release_id, exc_info=True)
+
+
+def fetch_status_summary_rows(release_ids: list[UUID], tests: list[ArgusTest]) -> list[TestRunStatRow]:
+    """
+        Load materialized status rows for the given tests as stats rows, so that
+        TestStats can aggregate them exactly like raw runs in limited mode.
+    """
+    cluster = ScyllaCluster.get()
+    query = cluster.prepare(f"SELECT * FROM {ReleaseTestStatus.__table_name__} WHERE release_id = ?")
+    futures = [cluster.session.execute_async(query=query, parameters=(release_id,), execution_profile="read_fast")
+               for release_id in release_ids]
+    build_ids = {test.id: test.build_system_id for test in tests}
+    rows = []
+    for future in futures:
+        for row in future.result():
+            if (build_id := build_ids.get(row["test_id"])) is None:
+                continue
+            rows.append({
+                "id": row["run_id"],
+                "build_id": build_id,
+                "build_number": row["build_number"],
+                "build_job_url": row["build_job_url"],
+                "status": row["status"],
+                "investigation_status": row["investigation_status"],
+                "assignee": row["assignee"],
+                "start_time": row["start_time"],
+                "scylla_version": row["version"] or None,
+            })
+    return sorted(rows, reverse=True, key=lambda r: r["start_time"])
+
+
 def _get_image(row: dict):
-    if cs := row.get("cloud_setup"):
+    if (cs := row.get("cloud_setup")) and cs.db_node:
         return cs.db_node.image_id
 
 
@@ -210,6 +438,8 @@ class ViewStats:
         self.test_schedules = {}
         self.forced_collection = False
         self.rows = []
+        self.runs_by_build_id = {}
+        self.worst_cases = {}
         self.releases = {}
         self.all_tests = []
 
@@ -262,6 +492,12 @@ class ViewStats:
 
         self.rows = rows
         self.dict = dict
+        self.runs_by_build_id = dict or reduce(
+            lambda acc, row: acc[row["build_id"]].append(row) or acc,
+            rows,
+            defaultdict(list)
+        )
+        self.worst_cases = compute_worst_cases(self.runs_by_build_id)
         if not limited or force:
             self.issues = reduce(
                 lambda acc, row: acc[row["run_id"]].append(row) or acc,
@@ -307,6 +543,8 @@ class ReleaseStats:
         self.test_schedules = {}
         self.forced_collection = False
         self.rows = []
+        self.runs_by_build_id = {}
+        self.worst_cases = {}
         self.all_tests = []
 
     def to_dict(self) -> dict:
@@ -351,6 +589,12 @@ class ReleaseStats:
 
         self.rows = rows
         self.dict = dict
+        self.runs_by_build_id = dict or reduce(
+            lambda acc, row: acc[row["build_id"]].append(row) or acc,
+            rows,
+            defaultdict(list)
+        )
+        self.worst_cases = compute_worst_cases(self.runs_by_build_id)
         if not limited or force:
             self.issues = reduce(
                 lambda acc, row: acc[row["run_id"]].append(row) or acc,
@@ -472,32 +716,26 @@ class TestStats:
         }
 
     def collect(self, limited=False):
-
-        # TODO: Parametrize run limit
-        # FIXME: This is only a mitigation, build_number overflows on the build system side.
-        if not self.parent_group.parent_release.dict:
-            last_runs = [r for r in self.parent_group.parent_release.rows if r["build_id"] == self.test.build_system_id]
-        else:
-            last_runs = self.parent_group.parent_release.dict.get(self.test.build_system_id, [])
-        last_runs: list[TestRunStatRow] = sorted(
-            last_runs, reverse=True, key=lambda r: r["build_number"] or get_build_number(r["build_job_url"]))
-        try:
-            last_run = last_runs[0]
-        except IndexError:
+        release_stats = self.parent_group.parent_release
+        worst_case = release_stats.worst_cases.get(self.test.build_system_id)
+        if not worst_case:
             self.status = TestStatus.NOT_RUN if self.is_scheduled or self.is_scheduled_legacy else TestStatus.NOT_PLANNED
             self.parent_group.increment_status(status=self.status)
             return
-        status_map = generate_field_status_map(last_runs)
+        last_run, worst_run = worst_case
 
-        worst_case = status_map.get(last_run["build_number"])
-        self.status = worst_case[0]
-        self.investigation_status = worst_case[1]["investigation_status"]
+        self.status = worst_run["status"]
+        self.investigation_status = worst_run["investigation_status"]
         self.start_time = last_run["start_time"]
 
         self.parent_group.increment_status(status=self.status)
-        if limited and not self.parent_group.parent_release.forced_collection:
+        if limited and not release_stats.forced_collection:
             return
 
+        # TODO: Parametrize run limit
+        # FIXME: This is only a mitigation, build_number overflows on the build system side.
+        last_runs: list[TestRunStatRow] = sorted(release_stats.runs_by_build_id[self.test.build_system_id],
+                                                 reverse=True, key=run_order_key)
         self.last_runs = [
             {
                 "id": run["id"],
@@ -509,24 +747,149 @@ class TestStats:
                 "end_time": run["end_time"],
                 "nemesis_stats": run.get("nemesis_stats", {}),
                 "assignee": run["assignee"],
-                "issues": [dict(issue.items()) for issue in self.parent_group.parent_release.issues[run["id"]]],
-                "comments": [dict(comment.items()) for comment in self.parent_group.parent_release.comments[run["id"]]],
+                "issues": [dict(issue.items()) for issue in release_stats.issues[run["id"]]],
+                "comments": [dict(comment.items()) for comment in release_stats.comments[run["id"]]],
             }
-            for run in last_runs
+            for run in last_runs[:LAST_RUNS_LIMIT]
         ]
+        self.has_bug_report = len(release_stats.issues[worst_run["id"]]) > 0
+        release_stats.has_bug_report = self.has_bug_report or release_stats.has_bug_report
+        self.has_comments = len(release_stats.comments[worst_run["id"]]) > 0
+        self.tracked_run_number = worst_run["build_number"]
+
+
+class _SnapshotFlight:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: dict | None = None
+
+
+class SnapshotSingleFlight:
+    """
+        Coalesces concurrent rebuilds of the same ReleaseStatsSnapshot.
+
+        Within a process, only the first request for a (release, filter key) pair rebuilds,
+        others wait for its result. Across processes, the rebuild is guarded by a
+        ReleaseStatsRebuildLease row. Requests that do not rebuild are answered with the
+        last snapshot this process has seen, tagged with its age, when one is available.
+    """
+
+    def __init__(self, wait_timeout: float = 30.0, lease_ttl: int = 60, poll_interval: float = 0.5, stale_limit: int = 512) -> None:
+        self.wait_timeout = wait_timeout
+        self.lease_ttl = lease_ttl
+        self.poll_interval = poll_interval
+        self.stale_limit = stale_limit
+        self._lock = threading.Lock()
+        self._flights: dict[tuple[UUID, str], _SnapshotFlight] = {}
+        self._stale: OrderedDict[tuple[UUID, str], tuple[dict, datetime]] = OrderedDict()
+
+    def remember(self, release_id: UUID, filter_key: str, payload: dict, generated_at: datetime | None = None) -> None:
+        generated_at = generated_at or datetime.now(UTC)
+        if not generated_at.tzinfo:
+            generated_at = generated_at.replace(tzinfo=UTC)
+        with self._lock:
+            self._stale[(release_id, filter_key)] = (payload, generated_at)
+            self._stale.move_to_end((release_id, filter_key))
+            while len(self._stale) > self.stale_limit:
+                self._stale.popitem(last=False)
+
+    def stale(self, release_id: UUID, filter_key: str) -> dict | None:
+        with self._lock:
+            entry = self._stale.get((release_id, filter_key))
+        if not entry:
+            return None
+        payload, generated_at = entry
+        return {
+            **payload,
+            "stale": True,
+            "snapshotGeneratedAt": generated_at,
+            "snapshotAge": int((datetime.now(UTC) - generated_at).total_seconds()),
+        }
+
+    def run(self, release_id: UUID, filter_key: str, rebuild: Callable[[], dict]) -> dict:
+        key = (release_id, filter_key)
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = _SnapshotFlight()
+                self._flights[key] = flight
+
+        if not leader:
+            if stale := self.stale(release_id, filter_key):
+                return stale
+            if flight.done.wait(self.wait_timeout) and flight.result is not None:
+                return flight.result
+            return rebuild()
+
         try:
-            target_run = next(run for run in self.last_runs if run["id"] == worst_case[1]["id"])
-        except StopIteration:
-            target_run = worst_case[1]
-            target_run["issues"] = [dict(issue.items())
-                                    for issue in self.parent_group.parent_release.issues[target_run["id"]]]
-            target_run["comments"] = [dict(comment.items())
-                                      for comment in self.parent_group.parent_release.comments[target_run["id"]]]
-        self.has_bug_report = len(target_run["issues"]) > 0
-        self.parent_group.parent_release.has_bug_report = self.has_bug_report or self.parent_group.parent_release.has_bug_report
-        self.has_comments = len(target_run["comments"]) > 0
-        self.last_runs = self.last_runs[:5]
-        self.tracked_run_number = target_run.get("build_number", get_build_number(target_run.get("build_job_url")))
+            flight.result, rebuilt = self._rebuild_once(release_id, filter_key, rebuild)
+            if rebuilt:
+                self.remember(release_id, filter_key, flight.result)
+            return flight.result
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+    def _rebuild_once(self, release_id: UUID, filter_key: str, rebuild: Callable[[], dict]) -> tuple[dict, bool]:
+        """
+            Payload for the pair and whether it was rebuilt by this call. Stale payloads and
+            snapshots written by other processes are not rebuilt, so they keep their own age.
+        """
+        owner = str(uuid4())
+        if self._acquire_lease(release_id, filter_key, owner):
+            try:
+                return rebuild(), True
+            finally:
+                self._release_lease(release_id, filter_key, owner)
+
+        if stale := self.stale(release_id, filter_key):
+            return stale, False
+        if (result := self._wait_for_snapshot(release_id, filter_key)) is not None:
+            return result, False
+        return rebuild(), True
+
+    def _acquire_lease(self, release_id: UUID, filter_key: str, owner: str) -> bool:
+        try:
+            ReleaseStatsRebuildLease.if_not_exists().ttl(self.lease_ttl).create(
+                release_id=release_id,
+                filter_key=filter_key,
+                owner=owner,
+                acquired_at=datetime.now(UTC),
+            )
+            return True
+        except LWTException:
+            return False
+        except Exception:
+            LOGGER.warning("Failed to acquire stats rebuild lease for release %s", release_id, exc_info=True)
+            return True
+
+    def _release_lease(self, release_id: UUID, filter_key: str, owner: str) -> None:
+        try:
+            ReleaseStatsRebuildLease.objects(release_id=release_id, filter_key=filter_key).iff(owner=owner).delete()
+        except LWTException:
+            pass
+        except Exception:
+            LOGGER.warning("Failed to release stats rebuild lease for release %s", release_id, exc_info=True)
+
+    def _wait_for_snapshot(self, release_id: UUID, filter_key: str) -> dict | None:
+        deadline = time.monotonic() + self.wait_timeout
+        while time.monotonic() < deadline:
+            try:
+                snapshot = ReleaseStatsSnapshot.get(release_id=release_id, filter_key=filter_key)
+                return json.loads(snapshot.payload)
+            except ReleaseStatsSnapshot.DoesNotExist:
+                pass
+            try:
+                ReleaseStatsRebuildLease.get(release_id=release_id, filter_key=filter_key)
+            except ReleaseStatsRebuildLease.DoesNotExist:
+                return None
+            time.sleep(self.poll_interval)
+        return None
+
+
+SNAPSHOT_REBUILDS = SnapshotSingleFlight()
 
 
 class ReleaseStatsCollector:
@@ -541,63 +904,55 @@ class ReleaseStatsCollector:
 
     def collect(self, limited=False, force=False, include_no_version=False, image_id: str = None) -> dict:
         self.release: ArgusRelease = ArgusRelease.get(name=self.release_name)
+        filter_key = snapshot_filter_key(self.release_version, image_id, include_no_version, limited)
 
-        if not force:
-            filter_key = snapshot_filter_key(self.release_version, image_id, include_no_version, limited)
-            try:
-                snapshot = ReleaseStatsSnapshot.get(release_id=self.release.id, filter_key=filter_key)
-                return json.loads(snapshot.payload)
-            except ReleaseStatsSnapshot.DoesNotExist:
-                pass
+        if force:
+            return self._collect_fresh(filter_key, limited=limited, force=force, include_no_version=include_no_version, image_id=image_id)
 
-        all_tests: list[ArgusTest] = list(ArgusTest.filter(release_id=self.release.id).all())
-        build_ids = reduce(lambda acc, test: acc[test.plugin_name or "unknown"].append(
-            test.build_system_id) or acc, all_tests, defaultdict(list))
-        self.release_rows = [futures for plugin in all_plugin_models()
-                             for futures in plugin.get_stats_for_release(release=self.release, build_ids=build_ids.get(plugin._plugin_name, []))]
-        self.release_rows = [row for future in self.release_rows for row in future.result()]
+        try:
+            snapshot = ReleaseStatsSnapshot.get(release_id=self.release.id, filter_key=filter_key)
+            result = json.loads(snapshot.payload)
+            SNAPSHOT_REBUILDS.remember(self.release.id, filter_key, result, snapshot.generated_at)
+            return result
+        except ReleaseStatsSnapshot.DoesNotExist:
+            pass
+
+        return SNAPSHOT_REBUILDS.run(
+            self.release.id,
+            filter_key,
+            lambda: self._collect_fresh(filter_key, limited=limited, force=force,
+                                        include_no_version=include_no_version, image_id=image_id),
+        )
+
+    def _collect_fresh(self, filter_key: str, limited=False, force=False, include_no_version=False, image_id: str = None) -> dict:
         if self.release.dormant and not force:
             return {
                 "dormant": True
             }
-        if self.release_version:
-            if include_no_version:
-                expr = lambda row: check_version(self.release_version, row["scylla_version"]) or not row["scylla_version"]
-            elif self.release_version == "!noVersion":
-                expr = lambda row: not row["scylla_version"]
-            else:
-                expr = lambda row: check_version(self.release_version, row["scylla_version"])
+        all_tests: list[ArgusTest] = list(ArgusTest.filter(release_id=self.release.id).all())
+        summary_ready = is_status_summary_ready(self.release.id)
+        summaries = None
+        if limited and not force and not image_id and summary_ready:
+            # Limited dashboards only need the latest worst-case status per test, which is kept materialized
+            result_sets = [fetch_status_summary_rows([self.release.id], all_tests)]
         else:
-            if include_no_version:
-                expr = lambda row: row
-            else:
-                expr = lambda row: row["scylla_version"]
-        self.release_rows = list(filter(expr, self.release_rows))
-        if image_id:
-            def filter_for_image(row: dict):
-                setup = row.get("cloud_setup")
-                if not setup:
-                    return False
-                db_node = setup.db_node
-                if not db_node:
-                    return False
-                image = db_node.image_id
-
-                return image == image_id
-
-            self.release_rows = list(filter(filter_for_image, self.release_rows))
-        self.release_dict = {}
-        for row in self.release_rows:
-            runs = self.release_dict.get(row["build_id"], [])
-            runs.append(row)
-            self.release_dict[row["build_id"]] = runs
+            build_ids = reduce(lambda acc, test: acc[test.plugin_name or "unknown"].append(
+                test.build_system_id) or acc, all_tests, defaultdict(list))
+            result_sets = (result_set for plugin in loader.all_plugin_models()
+                           for result_set in plugin.get_stats_for_release(release=self.release, build_ids=build_ids.get(plugin._plugin_name, [])))
+            if force or not summary_ready:
+                summaries = []
+        self.release_dict = collect_build_runs(
+            result_sets, stats_row_filter(self.release_version, include_no_version, image_id), summaries)
+        self.release_rows = [row for runs in self.release_dict.values() for row in runs]
+        if summaries is not None:
+            seed_release_status(self.release.id, all_tests, summaries)
 
         self.release_stats = ReleaseStats(release=self.release)
         self.release_stats.collect(rows=self.release_rows, limited=limited, force=force,
                                    dict=self.release_dict, tests=all_tests, version_filter=self.release_version)
         result = self.release_stats.to_dict()
 
-        filter_key = snapshot_filter_key(self.release_version, image_id, include_no_version, limited)
         try:
             ReleaseStatsSnapshot.create(
                 release_id=self.release.id,
@@ -634,30 +989,15 @@ class ViewStatsCollector:
 
         if widget and widget.get("filter"):
             all_tests = [test for test in all_tests if any(str(test[key]) in widget["filter"] for key in ["id", "group_id", "release_id"])]
-        build_ids = reduce(lambda acc, test: acc[test.plugin_name or "unknown"].append(test.build_system_id) or acc, all_tests, defaultdict(list))
-        self.view_rows = [futures for plugin in all_plugin_models()
-                          for futures in plugin.get_stats_for_release(release=self.view, build_ids=build_ids.get(plugin._plugin_name, []))]
-        self.view_rows = [row for future in self.view_rows for row in future.result()]
-
-        if self.filter:
-            if include_no_version:
-                expr = lambda row: check_version(self.filter, row["scylla_version"]) or not row["scylla_version"]
-            elif self.filter == "!noVersion":
-                expr = lambda row: not row["scylla_version"]
-            else:
-                expr = lambda row: check_version(self.filter, row["scylla_version"])
+        release_ids = list({test.release_id for test in all_tests})
+        if limited and not force and not image_id and all(is_status_summary_ready(release_id) for release_id in release_ids):
+            result_sets = [fetch_status_summary_rows(release_ids, all_tests)]
         else:
-            if include_no_version:
-                expr = lambda row: row
-            else:
-                expr = lambda row: row["scylla_version"]
-        self.view_rows = list(filter(expr, self.view_rows))
-        if image_id:
-            self.view_rows = list(filter(lambda row: _get_image(row) == image_id, self.view_rows))
-        for row in self.view_rows:
-            runs = self.runs_by_build_id.get(row["build_id"], [])
-            runs.append(row)
-            self.runs_by_build_id[row["build_id"]] = runs
+            build_ids = reduce(lambda acc, test: acc[test.plugin_name or "unknown"].append(test.build_system_id) or acc, all_tests, defaultdict(list))
+            result_sets = (result_set for plugin in loader.all_plugin_models()
+                           for result_set in plugin.get_stats_for_release(release=self.view, build_ids=build_ids.get(plugin._plugin_name, [])))
+        self.runs_by_build_id = collect_build_runs(result_sets, stats_row_filter(self.filter, include_no_version, image_id))
+        self.view_rows = [row for runs in self.runs_by_build_id.values() for row in runs]
 
         self.view_stats = ViewStats(release=self.view)
         self.view_stats.collect(rows=self.view_rows, limited=limited, force=force,
@@ -1,15 +1,192 @@
 
 
-from functools import partial
+from collections import defaultdict
+from functools import reduce
+from itertools import count
 import re
+import threading
+import time
 from urllib.parse import unquote
-from typing import Any, Callable
+from typing import Any
 from uuid import UUID
 
 from cassandra.cqlengine.models import Model
 from argus.backend.models.web import ArgusGroup, ArgusRelease, ArgusTest
 from argus.backend.plugins.core import PluginModelBase
-from argus.backend.plugins.loader import all_plugin_models
+from argus.backend.plugins.loader import find_run
+from argus.backend.util.cache import TEST_SEARCH_INDEX_GENERATION_KEY, CacheGeneration
+
+
+class TestSearchIndex:
+    """
+        Per-worker search index of releases, groups and tests used by TestLookup.test_lookup.
+
+        Lowercased display names (pretty name or name) are indexed by all their substrings of
+        up to NGRAM characters, so a substring query only verifies the entities sharing all
+        n-grams of the query instead of scanning every test. Facets are resolved through
+        release -> entities and group -> tests maps. The index is updated in place when the
+        release manager or the tests monitor change entities, and rebuilt from the database
+        when another worker signals a change or after MAX_AGE seconds.
+    """
+    __test__ = False
+    NGRAM = 3
+    MAX_AGE = 600
+    TYPE_ORDER = {"release": 0, "group": 1, "test": 2}
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._built_at: float | None = None
+        self._sequence = count()
+        self.generation = CacheGeneration(TEST_SEARCH_INDEX_GENERATION_KEY)
+        self._reset()
+
+    def _reset(self) -> None:
+        self._entities: dict[UUID, dict] = {}
+        self._names: dict[UUID, str] = {}
+        self._order: dict[UUID, tuple[int, int]] = {}
+        self._postings: defaultdict[str, set[UUID]] = defaultdict(set)
+        self._by_type: defaultdict[str, set[UUID]] = defaultdict(set)
+        self._by_release: defaultdict[UUID, set[UUID]] = defaultdict(set)
+        self._by_group: defaultdict[UUID, set[UUID]] = defaultdict(set)
+
+    @staticmethod
+    def entity_type(entity: Model) -> str:
+        match entity:
+            case ArgusRelease():
+                return "release"
+            case ArgusGroup():
+                return "group"
+        return "test"
+
+    def _ngrams(self, name: str) -> set[str]:
+        return {name[start:start + size] for size in range(1, self.NGRAM + 1) for start in range(len(name) - size + 1)}
+
+    def _index(self, mapped: dict) -> None:
+        entity_id = mapped["id"]
+        self._entities[entity_id] = mapped
+        self._names[entity_id] = (mapped["pretty_name"] or mapped["name"] or "").lower()
+        self._order.setdefault(entity_id, (self.TYPE_ORDER[mapped["type"]], next(self._sequence)))
+        for gram in self._ngrams(self._names[entity_id]):
+            self._postings[gram].add(entity_id)
+        self._by_type[mapped["type"]].add(entity_id)
+        if release_id := mapped.get("release_id"):
+            self._by_release[release_id].add(entity_id)
+        if group_id := mapped.get("group_id"):
+            self._by_group[group_id].add(entity_id)
+
+    def _unindex(self, entity_id: UUID) -> dict | None:
+        mapped = self._entities.pop(entity_id, None)
+        if not mapped:
+            return None
+        for gram in self._ngrams(self._names.pop(entity_id)):
+            self._postings[gram].discard(entity_id)
+            if not self._postings[gram]:
+                del self._postings[gram]
+        self._by_type[mapped["type"]].discard(entity_id)
+        if release_id := mapped.get("release_id"):
+            self._by_release[release_id].discard(entity_id)
+        if group_id := mapped.get("group_id"):
+            self._by_group[group_id].discard(entity_id)
+        return mapped
+
+    def _link(self, mapped: dict) -> None:
+        mapped["group"] = self._entities.get(mapped.get("group_id"))
+        mapped["release"] = self._entities.get(mapped.get("release_id"))
+
+    def rebuild(self) -> None:
+        releases = list(ArgusRelease.objects().limit(None))
+        groups = list(ArgusGroup.objects().limit(None))
+        tests = list(ArgusTest.objects().limit(None))
+        with self._lock:
+            self._reset()
+            for entity in [*releases, *groups, *tests]:
+                self._index(TestLookup.index_mapper(entity, type=self.entity_type(entity)))
+            for mapped in self._entities.values():
+                self._link(mapped)
+            self._built_at = time.monotonic()
+
+    def _ensure_fresh(self) -> None:
+        changed = self.generation.changed()
+        if changed or self._built_at is None or time.monotonic() - self._built_at > self.MAX_AGE:
+            self.rebuild()
+
+    def upsert(self, entity: Model) -> None:
+        """Index a created or updated entity, entities linking to it see the new values right away"""
+        with self._lock:
+            if self._built_at is None:
+                return
+            mapped = TestLookup.index_mapper(entity, type=self.entity_type(entity))
+            if existing := self._unindex(entity.id):
+                existing.clear()
+                existing.update(mapped)
+                mapped = existing
+            self._index(mapped)
+            self._link(mapped)
+            for linked_id in self._by_release.get(entity.id, set()) | self._by_group.get(entity.id, set()):
+                self._link(self._entities[linked_id])
+
+    def remove(self, entity_id: UUID) -> None:
+        with self._lock:
+            self._unindex(entity_id)
+            self._order.pop(entity_id, None)
+
+    def _matching(self, query: str) -> set[UUID]:
+        if not query:
+            return set(self._entities)
+        if len(query) <= self.NGRAM:
+            return set(self._postings.get(query, ()))
+        postings = sorted((self._postings.get(query[start:start + self.NGRAM], set())
+                           for start in range(len(query) - self.NGRAM + 1)), key=len)
+        return {entity_id for entity_id in postings[0].intersection(*postings[1:]) if query in self._names[entity_id]}
+
+    def _facet_matching(self, entity_type: str, facet_query: str) -> set[UUID]:
+        """Entities whose release or group display name contains the facet query"""
+        parents = {entity_id for entity_id in self._matching(facet_query.lower()) & self._by_type[entity_type]
+                   if self._names[entity_id]}
+        links = self._by_release if entity_type == "release" else self._by_group
+        return reduce(set.union, (links.get(parent_id, set()) for parent_id in parents), set())
+
+    @staticmethod
+    def _visible(entity: dict, release_id: UUID | None) -> bool:
+        if entity["type"] == "release" and release_id:
+            return False
+        if not entity["enabled"]:
+            return False
+        if entity.get("group") and not entity["group"]["enabled"]:
+            return False
+        if entity.get("release") and not entity["release"]["enabled"]:
+            return False
+        return True
+
+    def search(self, text_query: str, facets: list[tuple[str, str]], release_id: UUID | None = None) -> list[dict]:
+        self._ensure_fresh()
+        with self._lock:
+            found = self._matching(text_query.lower())
+            if release_id:
+                found &= self._by_release.get(release_id, set())
+            for facet, value in facets:
+                match facet:
+                    case "type":
+                        found &= self._by_type.get(value.lower(), set())
+                    case "release" | "group":
+                        found &= self._facet_matching(facet, value)
+            results = sorted((self._entities[entity_id] for entity_id in found
+                              if self._visible(self._entities[entity_id], release_id)),
+                             key=lambda entity: self._order[entity["id"]])
+            # Entities are updated in place, so callers get copies that stay consistent while being serialized
+            return [{**entity, "group": entity["group"] and {**entity["group"]},
+                     "release": entity["release"] and {**entity["release"]}} for entity in results]
+
+    def entity_changed(self, entity: Model) -> None:
+        self.upsert(entity)
+        self.generation.bump()
+
+    def entity_deleted(self, entity_id: UUID) -> None:
+        self.remove(entity_id)
+        self.generation.bump()
+
+
+TEST_SEARCH_INDEX = TestSearchIndex()
 
 
 class TestLookup:
@@ -39,12 +216,7 @@ class TestLookup:
 
     @classmethod
     def find_run(self, run_id: UUID) -> PluginModelBase | None:
-        for model in all_plugin_models():
-            try:
-                return model.get(id=run_id)
-            except model.DoesNotExist:
-                pass
-        return None
+        return find_run(run_id)
 
     @classmethod
     def query_to_uuid(cls, query: str) -> UUID | None:
@@ -100,71 +272,12 @@ class TestLookup:
         if uuid := cls.query_to_uuid(query):
             return cls.make_single_run_response(uuid)
 
-        def check_visibility(entity: dict):
-            if entity["type"] == "release" and release_id:
-                return False
-            if not entity["enabled"]:
-                return False
-            if entity.get("group") and not entity["group"]["enabled"]:
-                return False
-            if entity.get("release") and not entity["release"]["enabled"]:
-                return False
-            return True
-
-        def facet_extraction(query: str) -> str:
-            extractor = re.compile(r"(?:(?P<name>(?:release|group|type)):(?P<value>\"?[\w\d\.\-]*\"?))")
-            facets = re.findall(extractor, query)
-
-            return (re.sub(extractor, "", query).strip(), facets)
-
-        def type_facet_filter(item: dict, key: str, facet_query: str):
-            entity_type: str = item[key]
-            return facet_query.lower() == entity_type
-
-        def facet_filter(item: dict, key: str, facet_query: str):
-            if entity := item.get(key):
-                name: str = entity.get("pretty_name") or entity.get("name")
-                return facet_query.lower() in name.lower() if name else False
-            return False
+        extractor = re.compile(r"(?:(?P<name>(?:release|group|type)):(?P<value>\"?[\w\d\.\-]*\"?))")
+        facets = re.findall(extractor, query)
+        text_query = unquote(re.sub(extractor, "", query).strip())
+        if release_id and not isinstance(release_id, UUID):
+            release_id = UUID(release_id)
+
+        results = TEST_SEARCH_INDEX.search(text_query, facets, release_id=release_id)
 
-        def facet_wrapper(query_func: Callable[[dict], bool], facet_query: str, facet_type: str) -> bool:
-            def inner(item: dict, query: str):
-                return query_func(item, query) and facet_funcs[facet_type](item, facet_type, facet_query)
-            return inner
-
-        facet_funcs = {
-            "type": type_facet_filter,
-            "release": facet_filter,
-            "group": facet_filter,
-        }
-
-        def index_searcher(item, query: str):
-            name: str = item["pretty_name"] or item["name"]
-            return unquote(query).lower() in name.lower() if query else True
-
-        text_query, facets = facet_extraction(query)
-        search_func = index_searcher
-        for facet, value in facets:
-            if facet in facet_funcs.keys():
-                search_func = facet_wrapper(query_func=search_func, facet_query=value, facet_type=facet)
-
-        if release_id:
-            all_releases = [ArgusRelease.get(id=release_id)]
-        else:
-            all_releases = ArgusRelease.objects().limit(None)
-        all_tests = ArgusTest.objects().limit(None)
-        all_groups = ArgusGroup.objects().limit(None)
-        if release_id:
-            all_tests = all_tests.filter(release_id=release_id)
-            all_groups = all_groups.filter(release_id=release_id)
-        release_by_id = {release.id: partial(cls.index_mapper, type="release")(release) for release in all_releases}
-        group_by_id = {group.id: partial(cls.index_mapper, type="group")(group) for group in all_groups}
-        index = [cls.index_mapper(t) for t in all_tests]
-        index = [*release_by_id.values(), *group_by_id.values(), *index]
-        for item in index:
-            item["group"] = group_by_id.get(item.get("group_id"))
-            item["release"] = release_by_id.get(item.get("release_id"))
-
-        results = filter(partial(search_func, query=text_query), index)
-
-        return [{"id": cls.ADD_ALL_ID, "name": "Add all...", "type": "special"}, *list(res for res in results if check_visibility(res))]
+        return [{"id": cls.ADD_ALL_ID, "name": "Add all...", "type": "special"}, *results]
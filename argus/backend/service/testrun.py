@@ -1,4 +1,5 @@
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, UTC
 from functools import reduce
 import json
@@ -14,6 +15,7 @@ import magic
 import requests
 from flask import current_app, g
 from botocore.exceptions import ClientError
+from cassandra.concurrent import execute_concurrent_with_args
 from cassandra.util import uuid_from_time
 from cassandra.query import BatchStatement, ConsistencyLevel
 from cassandra.cqlengine.query import BatchQuery
@@ -21,6 +23,7 @@ from argus.backend.db import ScyllaCluster
 
 from argus.backend.models.pytest import PytestResultTable, PytestUserField
 from argus.backend.models.web import (
+    ArgusActiveRun,
     ArgusEvent,
     ArgusEventTypes,
     ArgusNotificationSourceTypes,
@@ -32,15 +35,22 @@ from argus.backend.models.web import (
     invalidate_release_snapshots,
 )
 
-from argus.backend.plugins.core import PluginInfoBase, PluginModelBase
+from argus.backend.plugins.core import ACTIVE_RUN_STATUSES, PluginInfoBase, PluginModelBase
 
-from argus.backend.plugins.loader import AVAILABLE_PLUGINS
+from argus.backend.plugins.loader import AVAILABLE_PLUGINS, find_run
 from argus.backend.events.event_processors import EVENT_PROCESSORS
 from argus.backend.plugins.sct.testrun import SCTTestRun
 from argus.backend.plugins.sirenada.model import SirenadaRun
 from argus.backend.service.event_service import EventService
 from argus.backend.service.notification_manager import NotificationManagerService
-from argus.backend.service.stats import ComparableTestStatus
+from argus.backend.service.stats import ComparableTestStatus, refresh_test_status
+from argus.backend.util.cache import (
+    ARTIFACT_SIZE_CACHE,
+    S3_OBJECT_MIME_CACHE,
+    S3_PRESIGNED_URL_CACHE,
+    invalidate_test_results_caches,
+    invalidate_version_matrix,
+)
 from argus.backend.util.common import chunk, get_build_number, strip_html_tags
 from argus.common.enums import PytestStatus, TestInvestigationStatus, TestStatus
 
@@ -54,6 +64,9 @@ class TestRunServiceException(Exception):
 class TestRunService:
     __test__ = False  # prevent pytest from collecting this production class as a test
     ASSIGNEE_PLACEHOLDER = "none-none-none"
+    PRESIGNED_URL_MIN_VALIDITY = 300  # Cached presigned urls are handed out with at least this many seconds left
+    ARTIFACT_SIZE_WORKERS = 16
+    ARTIFACT_HEAD_TIMEOUT = 10
 
     RE_MENTION = r"@[A-Za-z\d](?:[A-Za-z\d]|-(?=[A-Za-z\d])){0,38}"
 
@@ -71,19 +84,13 @@ class TestRunService:
         plugin = self.plugins.get(run_type)
         if plugin:
             try:
-                return plugin.model.get(id=run_id)
+                return plugin.model.get_by_id(run_id)
             except plugin.model.DoesNotExist:
                 return None
 
     def get_test_type_for_run(self, run_id: str) -> str:
-        for name, plugin in AVAILABLE_PLUGINS.items():
-            try:
-                run = plugin.model.get(id=run_id)
-                if run:
-                    return name
-            except plugin.model.DoesNotExist:
-                continue
-        return "unknown-does-not-exist"
+        run = find_run(run_id)
+        return run._plugin_name if run else "unknown-does-not-exist"
 
     def get_run_response(self, run_type: str, run_id: UUID) -> dict | None:
         plugin = self.plugins.get(run_type)
@@ -133,7 +140,7 @@ class TestRunService:
         polled_runs: list[PluginModelBase] = []
         for run_id in runs:
             try:
-                run: PluginModelBase = plugin.model.get(id=run_id)
+                run: PluginModelBase = plugin.model.get_by_id(run_id)
                 polled_runs.append(run)
             except plugin.model.DoesNotExist:
                 pass
@@ -147,10 +154,13 @@ class TestRunService:
         except ArgusTest.DoesNotExist as exc:
             raise TestRunServiceException("Test entity does not exist for provided test_id", test_id) from exc
         plugin = self.get_plugin(plugin_name=test.plugin_name)
-        run: PluginModelBase = plugin.model.get(id=run_id)
+        run: PluginModelBase = plugin.model.get_by_id(run_id)
         old_status = run.status
         run.status = new_status.value
         run.save()
+        run.index_active_run()
+        refresh_test_status(plugin.model, run.build_id, test.release_id, test.id)
+        invalidate_version_matrix(test.id)
 
         EventService.create_run_event(
             kind=ArgusEventTypes.TestRunStatusChanged,
@@ -177,9 +187,18 @@ class TestRunService:
     def _match_s3_link(link: str) -> re.Match:
         return re.match(r"(https:\/\/)?(?P<bucket>[\w\-]*)\.s3(?P<region>\.[\w\-\d]*)?\.amazonaws.com\/(?P<key>.+)", link)
 
+    def _presigned_url(self, bucket: str, key: str, expires_in: int) -> str:
+        cache_key = (bucket, key, expires_in)
+        if url := S3_PRESIGNED_URL_CACHE.get(cache_key):
+            return url
+        url = self.s3.generate_presigned_url(ClientMethod="get_object", Params={
+                                             "Bucket": bucket, "Key": key}, ExpiresIn=expires_in)
+        S3_PRESIGNED_URL_CACHE.set(cache_key, url, ttl=expires_in - self.PRESIGNED_URL_MIN_VALIDITY)
+        return url
+
     def get_log(self, plugin_name: str, run_id: UUID, log_name: str):
         plugin = self.get_plugin(plugin_name=plugin_name)
-        run: PluginModelBase = plugin.model.get(id=run_id)
+        run: PluginModelBase = plugin.model.get_by_id(run_id)
 
         link = {log[0]: log[1] for log in run.logs}.get(log_name)
         if not link:
@@ -187,17 +206,23 @@ class TestRunService:
         match = self._match_s3_link(link)
         if not match:
             return link
-        presigned_url = self.s3.generate_presigned_url(ClientMethod="get_object", Params={
-                                                       "Bucket": match.group("bucket"), "Key": match.group("key")}, ExpiresIn=3600)
 
-        return presigned_url
+        return self._presigned_url(match.group("bucket"), match.group("key"), expires_in=3600)
 
     def resolve_artifact_size(self, link: str):
+        length = ARTIFACT_SIZE_CACHE.get(link)
+        if length is None:
+            length = self._fetch_artifact_size(link)
+            if length is not None:
+                ARTIFACT_SIZE_CACHE.set(link, length)
+        return length
+
+    def _fetch_artifact_size(self, link: str):
 
         match = self._match_s3_link(link)
 
         if not match:
-            res = requests.head(link)
+            res = requests.head(link, timeout=self.ARTIFACT_HEAD_TIMEOUT)
             if res.status_code != 200:
                 raise Exception("Error requesting resource")
 
@@ -208,20 +233,38 @@ class TestRunService:
             return length
 
         try:
-            obj = self.s3.get_object(Bucket=match.group("bucket"), Key=match.group("key"))
+            obj = self.s3.head_object(Bucket=match.group("bucket"), Key=match.group("key"))
             return obj["ContentLength"]
         except ClientError as e:
             error_code = e.response.get('Error', {}).get('Code', '')
-            if error_code == 'NoSuchKey':
+            if error_code in ('NoSuchKey', '404'):
                 raise TestRunServiceException(f"S3 object not found: {link}")
-            elif error_code == 'AccessDenied':
+            elif error_code in ('AccessDenied', '403'):
                 raise TestRunServiceException(f"Access denied to S3 object: {link}")
             else:
                 raise TestRunServiceException(f"Error accessing S3 object: {e}")
 
+    def resolve_run_artifact_sizes(self, plugin_name: str, run_id: UUID) -> dict[str, int | None]:
+        """Sizes of all logs of the run keyed by log name, None for logs whose size can't be resolved"""
+        plugin = self.get_plugin(plugin_name=plugin_name)
+        run: PluginModelBase = plugin.model.get_by_id(run_id)
+        links = {log[0]: log[1] for log in run.logs}
+
+        def resolve(link: str) -> int | None:
+            try:
+                return self.resolve_artifact_size(link)
+            except Exception:
+                LOGGER.warning("Unable to resolve size of artifact %s", link, exc_info=True)
+                return None
+
+        with ThreadPoolExecutor(max_workers=self.ARTIFACT_SIZE_WORKERS) as executor:
+            sizes = list(executor.map(resolve, links.values()))
+
+        return dict(zip(links.keys(), sizes))
+
     def proxy_stored_s3_image(self, plugin_name: str, run_id: UUID | str, image_name: str):
         plugin = self.get_plugin(plugin_name=plugin_name)
-        run: SCTTestRun | SirenadaRun = plugin.model.get(id=run_id)
+        run: SCTTestRun | SirenadaRun = plugin.model.get_by_id(run_id)
         match run:
             case SCTTestRun():
                 screenshot = {scr.split("/")[-1]: scr for scr in run.screenshots}.get(image_name)
@@ -233,27 +276,33 @@ class TestRunService:
         if not match:
             return screenshot
 
-        return self.s3.generate_presigned_url(ClientMethod="get_object", Params={"Bucket": match.group("bucket"), "Key": match.group("key")}, ExpiresIn=3600)
+        return self._presigned_url(match.group("bucket"), match.group("key"), expires_in=3600)
+
+    def _sniff_s3_object_mime(self, bucket_name: str, bucket_path: str) -> str:
+        obj = self.s3.get_object(Bucket=bucket_name, Key=bucket_path, Range="bytes=0-1023")
+        header = obj["Body"].read(1024)
+        return magic.from_buffer(header, mime=True)
 
     def proxy_s3_file(self, bucket_name: str, bucket_path: str):
         if bucket_name not in current_app.config.get("S3_ALLOWED_BUCKETS", []):
             raise TestRunServiceException(f"{bucket_name} is not an allowed S3 bucket to pull from")
 
-        obj = self.s3.get_object(Bucket=bucket_name, Key=bucket_path)
-        header = obj["Body"].read(1024)
-        mime = magic.from_buffer(header, mime=True)
+        mime = S3_OBJECT_MIME_CACHE.get_or_load(
+            (bucket_name, bucket_path), lambda: self._sniff_s3_object_mime(bucket_name, bucket_path))
         if mime.lower() not in current_app.config.get("S3_ALLOWED_MIME", []):
             raise TestRunServiceException(f"Cannot proxy mime type that is not allowed: {mime}", mime)
 
-        return self.s3.generate_presigned_url(ClientMethod="get_object", Params={"Bucket": bucket_name, "Key": bucket_path}, ExpiresIn=600)
+        return self._presigned_url(bucket_name, bucket_path, expires_in=600)
 
     def change_run_investigation_status(self, test_id: UUID, run_id: UUID, new_status: TestInvestigationStatus):
         test = ArgusTest.get(id=test_id)
         plugin = self.get_plugin(plugin_name=test.plugin_name)
-        run: PluginModelBase = plugin.model.get(id=run_id)
+        run: PluginModelBase = plugin.model.get_by_id(run_id)
         old_status = run.investigation_status
         run.investigation_status = new_status.value
         run.save()
+        refresh_test_status(plugin.model, run.build_id, test.release_id, test.id)
+        invalidate_test_results_caches(test.id)
 
         EventService.create_run_event(
             kind=ArgusEventTypes.TestRunStatusChanged,
@@ -285,10 +334,11 @@ class TestRunService:
                 "assignee": None
             }
 
-        run: PluginModelBase = plugin.model.get(id=run_id)
+        run: PluginModelBase = plugin.model.get_by_id(run_id)
         old_assignee = run.assignee
         run.assignee = new_assignee
         run.save()
+        refresh_test_status(plugin.model, run.build_id, test.release_id, test.id)
 
         if new_assignee:
             new_assignee_user = User.get(id=new_assignee)
@@ -368,7 +418,7 @@ class TestRunService:
         comment.posted_at = time.time()
         comment.save()
 
-        run: PluginModelBase = plugin.model.get(id=run_id)
+        run: PluginModelBase = plugin.model.get_by_id(run_id)
         build_number = run.build_number
         for mention in mentions:
             params = {
@@ -463,38 +513,70 @@ class TestRunService:
     def terminate_stuck_runs(self):
         sct = AVAILABLE_PLUGINS.get("scylla-cluster-tests").model
         now = datetime.now(UTC)
-        stuck_period = now - timedelta(minutes=45)
-        stuck_runs_running = sct.filter(heartbeat__lt=int(
-            stuck_period.timestamp()), status=TestStatus.RUNNING.value).allow_filtering().all()
-        stuck_runs_created = sct.filter(heartbeat__lt=int(
-            stuck_period.timestamp()), status=TestStatus.CREATED.value).allow_filtering().all()
+        stuck_period = int((now - timedelta(minutes=45)).timestamp())
+        sct.seed_active_runs()
+        candidates = sct.get_active_runs(heartbeat_before=stuck_period)
 
-        all_stuck_runs = [*stuck_runs_running, *stuck_runs_created]
+        # Index rows only narrow the search down, the run itself decides whether it is stuck
+        cluster = ScyllaCluster.get()
+        run_query = cluster.prepare("SELECT build_id, start_time, id, status, heartbeat, release_id, group_id, test_id "
+                                    f"FROM {sct.table_name()} WHERE build_id = ? AND start_time = ?")
+        runs = execute_concurrent_with_args(cluster.session, run_query,
+                                            [(candidate.build_id, candidate.start_time) for candidate in candidates],
+                                            concurrency=50)
+        all_stuck_runs = []
+        finished = []
+        for candidate, (_, rows) in zip(candidates, runs):
+            run = rows.one()
+            if not run or run["status"] not in ACTIVE_RUN_STATUSES:
+                finished.append(candidate)
+            elif run["heartbeat"] < stuck_period:
+                all_stuck_runs.append((candidate, run))
         LOGGER.info("Found %s stuck runs", len(all_stuck_runs))
 
-        for run in all_stuck_runs:
-            LOGGER.info("Will set %s as ABORTED", run.id)
-            old_status = run.status
-            run.status = TestStatus.ABORTED.value
-            run.save()
-
-            EventService.create_run_event(
-                kind=ArgusEventTypes.TestRunStatusChanged,
-                body={
+        abort_query = cluster.prepare(f"UPDATE {sct.table_name()} SET status = ? WHERE build_id = ? AND start_time = ?")
+        results = execute_concurrent_with_args(
+            cluster.session, abort_query,
+            [(TestStatus.ABORTED.value, run["build_id"], run["start_time"]) for _, run in all_stuck_runs],
+            concurrency=50, raise_on_first_error=False)
+        terminated = []
+        for (candidate, run), (success, result) in zip(all_stuck_runs, results):
+            if not success:
+                LOGGER.warning("Failed to set %s as ABORTED: %s", run["id"], result)
+                continue
+            LOGGER.info("Set %s as ABORTED", run["id"])
+            terminated.append((candidate, run))
+
+        index_delete = cluster.prepare(f"DELETE FROM {ArgusActiveRun.__table_name__} "
+                                       "WHERE plugin_name = ? AND heartbeat_bucket = ? AND run_id = ?")
+        execute_concurrent_with_args(cluster.session, index_delete,
+                                     [(row.plugin_name, row.heartbeat_bucket, row.run_id)
+                                      for row in [*finished, *(candidate for candidate, _ in terminated)]],
+                                     concurrency=50, raise_on_first_error=False)
+
+        tests = {(run["build_id"], run["release_id"], run["test_id"]) for _, run in terminated}
+        for build_id, release_id, test_id in tests:
+            refresh_test_status(sct, build_id, release_id, test_id)
+
+        EventService.create_run_events([
+            {
+                "kind": ArgusEventTypes.TestRunStatusChanged,
+                "body": {
                     "message": "Run was automatically terminated due to not responding for more than 45 minutes "
                                "(Status changed from {old_status} to {new_status}) by {username}",
-                    "old_status": old_status,
-                    "new_status": run.status,
+                    "old_status": run["status"],
+                    "new_status": TestStatus.ABORTED.value,
                     "username": g.user.username
                 },
-                user_id=g.user.id,
-                run_id=run.id,
-                release_id=run.release_id,
-                group_id=run.group_id,
-                test_id=run.test_id
-            )
+                "user_id": g.user.id,
+                "run_id": run["id"],
+                "release_id": run["release_id"],
+                "group_id": run["group_id"],
+                "test_id": run["test_id"],
+            } for _, run in terminated
+        ])
 
-        return len(all_stuck_runs)
+        return len(terminated)
 
     def ignore_jobs(self, test_id: UUID, reason: str):
         test: ArgusTest = ArgusTest.get(id=test_id)
@@ -536,6 +618,8 @@ class TestRunService:
 
         cluster.session.execute(batch)
         event_batch.execute()
+        refresh_test_status(plugin.model, test.build_system_id, test.release_id, test.id)
+        invalidate_test_results_caches(test.id)
         invalidate_release_snapshots(test.release_id)
         return jobs_affected
 
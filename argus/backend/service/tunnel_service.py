@@ -15,7 +15,7 @@ from cryptography.hazmat.primitives.serialization import load_ssh_public_key
 from argus.backend.models.runtime_store import RuntimeStore
 from argus.backend.models.ssh_key import ProxyTunnelConfig, SSHTunnelKey
 from argus.backend.models.web import User, UserRoles
-from argus.backend.service.user import UserService
+from argus.backend.service.user import UserService, invalidate_api_tokens
 
 LOGGER = logging.getLogger(__name__)
 
@@ -444,6 +444,7 @@ class TunnelService:
             except User.DoesNotExist:
                 service_user = None
             if service_user is not None:
+                revoked_token = service_user.api_token
                 if delete_user:
                     service_user.delete()
                 else:
@@ -454,6 +455,7 @@ class TunnelService:
                             if role != UserRoles.SSHTunnelServer.value
                         ]
                     service_user.save()
+                invalidate_api_tokens(revoked_token)
 
         config.delete()
 
@@ -1,4 +1,5 @@
 from datetime import UTC, datetime
+import copy
 import functools
 import hashlib
 import mimetypes
@@ -19,11 +20,15 @@ from werkzeug.security import generate_password_hash, check_password_hash
 from argus.backend.db import ScyllaCluster
 from argus.backend.error_handlers import APIException
 from argus.backend.models.web import User, UserOauthToken, UserRoles, WebFileStorage
+from argus.backend.util.cache import API_TOKEN_CACHE, CacheGeneration
 from argus.backend.util.common import FlaskView, gen_pass
 
 LOGGER = logging.getLogger(__name__)
 
 SSH_TUNNEL_SERVER_ALLOWED_ENDPOINTS_KEY = "ssh_tunnel_server_allowed_endpoints"
+API_TOKEN_CACHE_GENERATION_KEY = "api_token_cache_generation"
+API_TOKEN_CACHE_GENERATION_CHECK_INTERVAL = 5  # seconds a worker may serve token users invalidated by another worker
+_UNKNOWN_API_TOKEN = object()
 
 class UserServiceException(Exception):
     pass
@@ -229,8 +234,10 @@ class UserService:
         token_digest = f"{user.username}-{int(time())}-{base64.encodebytes(os.urandom(128)).decode(encoding='utf-8')}"
         new_token = base64.encodebytes(sha384(token_digest.encode(encoding="utf-8")
                                               ).digest()).decode(encoding="utf-8").strip()
+        old_token = user.api_token
         user.api_token = new_token
         user.save()
+        invalidate_api_tokens(old_token, new_token)
         return new_token
 
     def get_or_generate_token(self, user: User) -> str:
@@ -262,6 +269,7 @@ class UserService:
             user.set_as_admin()
 
         user.save()
+        invalidate_api_tokens(user.api_token)
         return True
 
 
@@ -343,6 +351,7 @@ class UserService:
             raise UserServiceException("Cannot delete admin users. Unset admin flag before deleting")
 
         user.delete()
+        invalidate_api_tokens(user.api_token)
 
         return True
 
@@ -462,7 +471,7 @@ def load_logged_in_user():
             auth_schema, *auth_data = auth_header.split()
             if auth_schema == "token":
                 token = auth_data[0]
-                g.user = User.get(api_token=token)
+                g.user = get_user_by_api_token(token)
                 return
         except IndexError as exception:
             raise APIException("Malformed authorization header") from exception
@@ -478,6 +487,34 @@ def load_logged_in_user():
     g.user = None
 
 
+API_TOKEN_CACHE_GENERATION = CacheGeneration(API_TOKEN_CACHE_GENERATION_KEY,
+                                             check_interval=API_TOKEN_CACHE_GENERATION_CHECK_INTERVAL)
+
+
+def _load_user_by_api_token(token: str) -> User | object:
+    try:
+        return User.get(api_token=token)
+    except User.DoesNotExist:
+        return _UNKNOWN_API_TOKEN
+
+
+def get_user_by_api_token(token: str) -> User:
+    if API_TOKEN_CACHE_GENERATION.changed():
+        API_TOKEN_CACHE.clear()
+    user = API_TOKEN_CACHE.get_or_load(token, lambda: _load_user_by_api_token(token))
+    if user is _UNKNOWN_API_TOKEN:
+        raise User.DoesNotExist
+    # Requests may modify g.user, so each of them gets its own copy
+    return copy.deepcopy(user)
+
+
+def invalidate_api_tokens(*tokens: str | None):
+    for token in tokens:
+        if token:
+            API_TOKEN_CACHE.invalidate(token)
+    API_TOKEN_CACHE_GENERATION.bump()
+
+
 def is_ssh_tunnel_server_user(user: User | None) -> bool:
     if not user:
         return False
@@ -1,25 +1,29 @@
 from collections import defaultdict
 from datetime import UTC, date, datetime, timedelta
-from functools import reduce
 from pprint import pformat
+import heapq
 import re
 import logging
-from typing import NamedTuple, TypedDict
+import threading
+from typing import Iterable, Iterator, NamedTuple, TypedDict
 from uuid import UUID
-from time import sleep, time
+from time import monotonic, sleep, time
 
 
 from humanize import naturaltime
 from flask import request
+from cassandra.concurrent import execute_concurrent_with_args
 from cassandra.util import uuid_from_time, unix_time_from_uuid1
 from argus.backend.db import ScyllaCluster
 from argus.backend.models.pytest import PytestResultTable, PytestUserField
 from argus.backend.models.web import ArgusTest, ArgusUserView
 from argus.backend.plugins.generic.plugin import PluginInfo as GenericPluginInfo
+from argus.backend.util.cache import CacheGeneration
 from argus.backend.util.common import chunk
 from argus.common.enums import PytestStatus
 
 LOGGER = logging.getLogger(__name__)
+PYTEST_NAMES_GENERATION_KEY = "pytest_names_generation"
 
 
 class PytestResult(TypedDict):
@@ -28,7 +32,133 @@ class PytestResult(TypedDict):
     pieChart: dict
 
 
+class PytestNameSet:
+    """
+        Per-worker set of distinct pytest result names, i.e. the partitions of pytest_v2.
+        Names of newly submitted results are added in place, other workers reload the set
+        when the generation is bumped for a name they may not know yet, or after MAX_AGE seconds.
+    """
+    MAX_AGE = 600
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._names: set[str] = set()
+        self._loaded_at: float | None = None
+        self.generation = CacheGeneration(PYTEST_NAMES_GENERATION_KEY)
+
+    def reload(self) -> None:
+        db = ScyllaCluster.get()
+        names = {row["name"] for row in db.session.execute("SELECT DISTINCT name FROM pytest_v2", timeout=60.0)}
+        with self._lock:
+            self._names = names
+            self._loaded_at = monotonic()
+
+    def names(self) -> list[str]:
+        changed = self.generation.changed()
+        if changed or self._loaded_at is None or monotonic() - self._loaded_at > self.MAX_AGE:
+            self.reload()
+        with self._lock:
+            return list(self._names)
+
+    def add(self, name: str) -> None:
+        """
+            Called on result submission, never reloads the set. An unloaded set only collects
+            the names added here and is loaded in full by the first names() call.
+        """
+        with self._lock:
+            if name in self._names:
+                return
+            self._names.add(name)
+        self.generation.bump()
+
+
+PYTEST_NAMES = PytestNameSet()
+
+
+class PytestResultAggregates:
+    """
+        Total, status pie chart and per day bar chart of the matching results, accumulated
+        in a single pass over the unordered partition stream. Only the keys of the newest
+        `limit` results are kept, their remaining columns are read afterwards.
+    """
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self.total = 0
+        self.oldest: datetime | None = None
+        self.statuses: defaultdict[str, int] = defaultdict(lambda: 0)
+        self.days: dict[date, defaultdict[str, int]] = {}
+        self.day_newest: dict[date, datetime] = {}
+        self.newest: list[tuple[datetime, str, str]] = []
+        self.user_fields: dict[tuple[datetime, str], dict] = {}
+
+    def add(self, result: NamedTuple, user_fields: dict | None = None) -> None:
+        self.total += 1
+        self.statuses[result.status] += 1
+        if not self.oldest or result.id < self.oldest:
+            self.oldest = result.id
+        if result.session_timestamp:
+            day = date.fromtimestamp(result.session_timestamp.timestamp())
+            self.days.setdefault(day, defaultdict(lambda: 0))[result.status] += 1
+            self.day_newest[day] = max(self.day_newest.get(day, result.id), result.id)
+
+        key = (result.id, result.name, result.status)
+        if len(self.newest) < self.limit:
+            heapq.heappush(self.newest, key)
+        elif key > self.newest[0]:
+            evicted = heapq.heapreplace(self.newest, key)
+            self.user_fields.pop(evicted[:2], None)
+        else:
+            return
+        if user_fields is not None:
+            self.user_fields[(result.id, result.name)] = user_fields
+
+    def newest_keys(self) -> list[tuple[datetime, str, str]]:
+        return sorted(self.newest, reverse=True)
+
+    def pie_chart(self) -> dict:
+        return self.statuses
+
+    def bar_chart(self, before: datetime | None, after: datetime | None) -> dict:
+        oldest = date.fromtimestamp(self.oldest.timestamp()) if self.oldest else None
+        if after:
+            start_date = date.fromtimestamp(after.timestamp())
+        else:
+            start_date = oldest
+        end_date = date.fromtimestamp(before.timestamp()) if before else date.today()
+        start_date = start_date or end_date
+
+        bucket_days = (end_date - start_date).days
+        buckets = {date.today() - timedelta(days=d): defaultdict(lambda: 0)
+                   for d in range(bucket_days)}
+        # Days outside of the range are appended in the order of their newest result, newest first
+        for day in sorted(self.days, key=lambda day: self.day_newest[day], reverse=True):
+            bucket = buckets.get(day, defaultdict(lambda: 0))
+            for status, count in self.days[day].items():
+                bucket[status] += count
+            buckets[day] = bucket
+
+        buckets = {k.strftime("%Y-%m-%d"): v for k,
+                   v in reversed(buckets.items())}
+        datasets = []
+        for status in PytestStatus:
+            datasets.append({
+                "label": status.value,
+                "data": [result.get(status.value, 0) for result in buckets.values()]
+            })
+
+        return {
+            "labels": list(buckets.keys()),
+            "datasets": datasets,
+        }
+
+
 class PytestViewService:
+    HIT_COLUMNS = ["test_id", "id", "name", "run_id", "message", "session_timestamp", "status", "markers", "duration",
+                   "test_type"]
+    PARTITION_CONCURRENCY = 100
+    USER_FIELDS_BATCH = 1000
+
     def __init__(self) -> None:
         self.cluster = ScyllaCluster.get()
 
@@ -65,146 +195,116 @@ class PytestViewService:
     def release_results(self, release_id: str | UUID):
         return self.result_filter()
 
-    def prepare_pie_chart(self, hits: list[dict]) -> dict:
-        def count_status(acc: dict, result: dict):
-            acc[result["status"]] += 1
-            return acc
-        return reduce(count_status, hits, defaultdict(lambda: 0))
-
-    def prepare_bar_chart(self, hits: list[dict], before: datetime, after: datetime) -> dict:
-        start_date = None
-        end_date = None
-        if not before and not after:
-            start_date = date.fromtimestamp(hits[-1]["id"].timestamp())
-            end_date = date.today()
-        elif before and not after:
-            start_date = date.fromtimestamp(hits[-1]["id"].timestamp())
-            end_date = date.fromtimestamp(before.timestamp())
-        elif after and not before:
-            start_date = date.fromtimestamp(after.timestamp())
-            end_date = date.today()
-        else:
-            start_date = date.fromtimestamp(after.timestamp())
-            end_date = date.fromtimestamp(before.timestamp())
-
-        bucket_days = (end_date - start_date).days
-        buckets = {date.today() - timedelta(days=d): defaultdict(lambda: 0)
-                   for d in range(bucket_days)}
-        for hit in hits:
-            if hit["session_timestamp"]:
-                key = date.fromtimestamp(hit["session_timestamp"].timestamp())
-                bucket = buckets.get(key, defaultdict(lambda: 0))
-                bucket[hit["status"]] += 1
-                buckets[key] = bucket
-
-        buckets = {k.strftime("%Y-%m-%d"): v for k,
-                   v in reversed(buckets.items())}
-        datasets = []
-        for status in PytestStatus:
-            datasets.append({
-                "label": status.value,
-                "data": [result.get(status.value, 0) for result in buckets.values()]
-            })
-
-        return {
-            "labels": list(buckets.keys()),
-            "datasets": datasets,
-        }
+    def _partition_rows(self, names: list[str], columns: list[str], statuses: list[str],
+                        before: datetime | None, after: datetime | None) -> Iterator[NamedTuple]:
+        """
+            Stream rows of every name partition with the status and time predicates applied by
+            the database. Status is restricted even when all statuses are requested, as it
+            precedes id in the clustering key.
+        """
+        db = ScyllaCluster.get()
+        raw_query = f"SELECT {', '.join(columns)} FROM pytest_v2 WHERE name = ? AND status IN ?"
+        parameters = [statuses]
+        if before:
+            raw_query += " AND id <= ?"
+            parameters.append(before)
+        if after:
+            raw_query += " AND id >= ?"
+            parameters.append(after)
+        results = execute_concurrent_with_args(db.session, db.prepare(raw_query),
+                                               [(name, *parameters) for name in names],
+                                               concurrency=self.PARTITION_CONCURRENCY, results_generator=True,
+                                               execution_profile="read_fast_named_tuple")
+        for _, rows in results:
+            yield from rows
+
+    def _with_user_fields(self, results: Iterable[NamedTuple]) -> Iterator[tuple[NamedTuple, dict]]:
+        """Attach user fields to the results, reading them per name partition for batches of results"""
+        db = ScyllaCluster.get()
+        query = db.prepare("SELECT name, id, field_name, field_value FROM pytest_user_field WHERE name = ? AND id IN ?")
+        for batch in chunk(results, self.USER_FIELDS_BATCH):
+            ids_by_name: defaultdict[str, list[datetime]] = defaultdict(list)
+            for result in batch:
+                ids_by_name[result.name].append(result.id)
+            user_fields: defaultdict[tuple[str, datetime], dict] = defaultdict(dict)
+            field_rows = execute_concurrent_with_args(db.session, query, list(ids_by_name.items()),
+                                                      concurrency=self.PARTITION_CONCURRENCY,
+                                                      execution_profile="read_fast")
+            for _, rows in field_rows:
+                for row in rows:
+                    user_fields[(row["name"], row["id"])][row["field_name"]] = row["field_value"]
+            for result in batch:
+                yield result, user_fields.get((result.name, result.id), {})
+
+    def _load_hits(self, keys: list[tuple[datetime, str, str]]) -> dict[tuple[datetime, str], dict]:
+        db = ScyllaCluster.get()
+        query = db.prepare(f"SELECT {', '.join(self.HIT_COLUMNS)} FROM pytest_v2 "
+                           "WHERE name = ? AND status = ? AND id IN ?")
+        ids_by_partition: defaultdict[tuple[str, str], list[datetime]] = defaultdict(list)
+        for id, name, status in keys:
+            ids_by_partition[(name, status)].append(id)
+        params = [(name, status, ids) for (name, status), ids in ids_by_partition.items()]
+        results = execute_concurrent_with_args(db.session, query, params,
+                                               concurrency=self.PARTITION_CONCURRENCY,
+                                               execution_profile="read_fast_named_tuple")
+        return {(row.id, row.name): row._asdict() for _, rows in results for row in rows}
 
     def result_filter(self) -> PytestResult:
-        db = ScyllaCluster.get()
         test = request.args.get("test")
-
-        unique_tests: list[str] = []
-        unique_tests.extend((row["name"] for row in db.session.execute(
-            f"SELECT DISTINCT name FROM pytest_v2", timeout=60.0).all()))
-
+        unique_tests = PYTEST_NAMES.names()
         if test:
-            LOGGER.warning(test)
-            unique_tests = [
-                t for t in unique_tests if re.search(re.escape(test), t)]
+            unique_tests = [t for t in unique_tests if test in t]
 
         limit = int(request.args.get("limit", 500))
         before = request.args.get("before")
         after = request.args.get("after")
-        enabled_statuses = request.args.getlist("status[]")
+        enabled_statuses = request.args.getlist("status[]") or [status.value for status in PytestStatus]
         query = request.args.get("query")
         filters = request.args.getlist("filters[]")
         markers = request.args.getlist("markers[]")
 
-        db_query = "SELECT test_id, id, name, run_id, message, session_timestamp, status, markers, duration, test_type FROM pytest_v2"
-        query_filters = []
-
         if before:
             before = datetime.fromtimestamp(int(before), tz=UTC)
-            query_filters.append(("id <= ?", before))
-
         if after:
             after = datetime.fromtimestamp(int(after), tz=UTC)
-            query_filters.append(("id >= ?", after))
-
-        prepared = db.prepare(db_query)
-        results: list[NamedTuple] = []
-        if isinstance(enabled_statuses, list) and len(enabled_statuses) > 0:
-            query_filters.append(("status in ?", enabled_statuses))
-
-        results = []
-        for sequential_batch in chunk(unique_tests, 1000):
-            futures = []
-            for partition_chunk in chunk(sequential_batch, 100):
-                parallel_filter = [*query_filters]
-                parallel_query = db_query
-                partition_filter = [
-                    ("name IN ?", partition_chunk), *parallel_filter]
-                parallel_query += " WHERE "
-                parallel_query += " AND ".join([f for f,
-                                               _ in partition_filter])
-                prepared = db.prepare(parallel_query)
-                future = db.session.execute_async(prepared, parameters=[
-                                                  p for _, p in partition_filter], timeout=60.0, execution_profile="read_fast_named_tuple")
-                futures.append(future)
-            results.extend(
-                [row for future in futures for row in future.result()])
+
+        # Only the columns needed for filtering and the charts are read for every matching result
+        columns = ["name", "status", "id", "session_timestamp"]
+        if query or markers:
+            columns.extend(["message", "markers"])
+        results = self._partition_rows(unique_tests, columns, enabled_statuses, before, after)
 
         if markers:
-            for marker in markers:
-                results = [result for result in results if marker in (
-                    result.markers or [])]
+            results = (result for result in results if all(marker in (result.markers or []) for marker in markers))
         if query:
             pattern = re.compile(query.lower())
-            results = [result for result in results if re.search(
-                pattern, self.stringify_result(result))]
-        user_fields = {}
+            results = (result for result in results if re.search(pattern, self.stringify_result(result)))
 
+        aggregates = PytestResultAggregates(limit)
         if filters:
-            base_filter_query = db.prepare(
-                "SELECT * FROM pytest_user_field WHERE name IN ? AND id IN ?")
-            futures = []
-            for batch in chunk((r.name,  r.id) for r in results):
-                future = db.session.execute_async(base_filter_query, parameters=[[b[0] for b in batch], [
-                                                  b[1] for b in batch]], timeout=60.0, execution_profile="read_fast")
-                futures.append(future)
-            filter_rows = [
-                row for future in futures for row in future.result()]
-            for row in filter_rows:
-                key = (row["name"], row["id"])
-                val = user_fields.get(key, {})
-                val[row["field_name"]] = row["field_value"]
-                user_fields[key] = val
-            results = [{**result._asdict(), "user_fields": user_fields.get(
-                (result.name, result.id), {})} for result in results]
             filters = [(f[0] == "!", f.lstrip("!").split("=", 1)[0],
                         f.lstrip("!").split("=", 1)[1]) for f in filters]
-            for negated, field, value in filters:
-                results = [result for result in results if self.do_user_field_filter(
-                    field, value, negated, result)]
+            for result, user_fields in self._with_user_fields(results):
+                if all(self.do_user_field_filter(field, value, negated, {"user_fields": user_fields})
+                       for negated, field, value in filters):
+                    aggregates.add(result, user_fields)
         else:
-            results = [result._asdict() for result in results]
+            for result in results:
+                aggregates.add(result)
+
+        newest = aggregates.newest_keys()
+        loaded = self._load_hits(newest)
+        hits = []
+        for id, name, _ in newest:
+            if not (hit := loaded.get((id, name))):
+                continue
+            if filters:
+                hit["user_fields"] = aggregates.user_fields.get((id, name), {})
+            hits.append(hit)
 
-        results = sorted(results, key=lambda r: r["id"], reverse=True)
         return {
-            "total": len(results),
-            "barChart": self.prepare_bar_chart(results, before, after),
-            "pieChart": self.prepare_pie_chart(results),
-            "hits": results[:limit]
+            "total": aggregates.total,
+            "barChart": aggregates.bar_chart(before, after),
+            "pieChart": aggregates.pie_chart(),
+            "hits": hits,
         }
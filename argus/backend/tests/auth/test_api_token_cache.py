@@ -0,0 +1,76 @@
+import uuid
+
+import pytest
+from flask import g
+
+from argus.backend.error_handlers import APIException
+from argus.backend.models.web import User
+from argus.backend.service import user as user_service
+from argus.backend.util.cache import API_TOKEN_CACHE, CacheGeneration
+
+
+@pytest.fixture
+def token_user(argus_db):
+    user = User()
+    user.username = f"user-{uuid.uuid4()}"
+    user.email = f"{user.username}@scylladb.com"
+    user.roles = ["ROLE_USER"]
+    user.save()
+    user_service.UserService().generate_token(user)
+    API_TOKEN_CACHE.clear()
+    return user
+
+
+def _load_user_with_token(argus_app, token: str) -> User:
+    with argus_app.test_request_context(headers={"Authorization": f"token {token}"}):
+        user_service.load_logged_in_user()
+        return g.user
+
+
+def test_api_token_user_is_loaded_once(monkeypatch, argus_app, token_user):
+    loads = []
+    load_user = user_service._load_user_by_api_token
+    monkeypatch.setattr(user_service, "_load_user_by_api_token", lambda token: loads.append(token) or load_user(token))
+
+    users = [_load_user_with_token(argus_app, token_user.api_token) for _ in range(3)]
+
+    assert [user.id for user in users] == [token_user.id] * 3
+    assert users[0] is not users[1]
+    assert loads == [token_user.api_token]
+
+
+def test_unknown_api_token_is_cached(monkeypatch, argus_app, argus_db):
+    loads = []
+    load_user = user_service._load_user_by_api_token
+    monkeypatch.setattr(user_service, "_load_user_by_api_token", lambda token: loads.append(token) or load_user(token))
+    token = f"unknown-{uuid.uuid4()}"
+
+    for _ in range(2):
+        with pytest.raises(APIException):
+            _load_user_with_token(argus_app, token)
+
+    assert loads == [token]
+
+
+def test_generate_token_invalidates_old_token(argus_app, token_user):
+    old_token = token_user.api_token
+    _load_user_with_token(argus_app, old_token)
+
+    new_token = user_service.UserService().generate_token(token_user)
+
+    with pytest.raises(APIException):
+        _load_user_with_token(argus_app, old_token)
+    assert _load_user_with_token(argus_app, new_token).id == token_user.id
+
+
+def test_token_change_in_other_worker_clears_cache(monkeypatch, argus_app, token_user):
+    _load_user_with_token(argus_app, token_user.api_token)
+    assert API_TOKEN_CACHE.get(token_user.api_token) is not None
+
+    # Another worker bumps the generation, this worker notices it on its next check
+    CacheGeneration(user_service.API_TOKEN_CACHE_GENERATION_KEY).bump()
+    monkeypatch.setattr(user_service.API_TOKEN_CACHE_GENERATION, "next_check", 0.0)
+    with pytest.raises(APIException):
+        _load_user_with_token(argus_app, f"unknown-{uuid.uuid4()}")
+
+    assert API_TOKEN_CACHE.get(token_user.api_token) is None
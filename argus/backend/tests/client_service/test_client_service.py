@@ -3,9 +3,12 @@ from dataclasses import asdict, dataclass
 import json
 
 import pytest
+from cassandra.concurrent import execute_concurrent_with_args
 from flask.testing import FlaskClient
 
+from argus.backend.models.run_config import RunConfigParam
 from argus.backend.models.web import ArgusTest
+from argus.backend.service import client_service as client_service_module
 from argus.backend.service.client_service import ClientService
 from argus.backend.plugins.sct.service import SCTService
 from argus.backend.service.testrun import TestRunService
@@ -116,3 +119,29 @@ def test_get_configs_for_runs(flask_client: FlaskClient, client_service: ClientS
     configs = client_service.get_all_configs(run.id)
     assert len(configs) == 2
     assert [cfg.name for cfg in configs] == ["another_config", "my_config"]
+
+
+def test_resubmitted_config_writes_only_changed_params(client_service: ClientService, fake_test: ArgusTest,
+                                                       monkeypatch):
+    run_type, run_req = get_fake_test_run(fake_test)
+    client_service.submit_run(run_type, asdict(run_req))
+    written = []
+
+    def execute_concurrent_spy(session, query, params, **kwargs):
+        params = list(params)
+        written.extend(name for name, _, _ in params)
+        return execute_concurrent_with_args(session, query, params, **kwargs)
+
+    def submit(config: dict):
+        content = base64.encodebytes(json.dumps(config).encode(encoding="utf-8")).decode("utf-8")
+        client_service.submit_config(run_req.run_id, "my config", content)
+
+    monkeypatch.setattr(client_service_module, "execute_concurrent_with_args", execute_concurrent_spy)
+    submit({"prop": {"inner": [1, {"deep": 10}]}, "another": "text"})
+    assert sorted(written) == ["my_config.another", "my_config.prop.inner.0", "my_config.prop.inner.1.deep"]
+
+    written.clear()
+    submit({"prop": {"inner": [1, {"deep": 11}]}, "another": "text"})
+
+    assert written == ["my_config.prop.inner.1.deep"]
+    assert RunConfigParam.get(name="my_config.prop.inner.1.deep", value="11", run_id=str(run_req.run_id))
@@ -0,0 +1,58 @@
+import threading
+from dataclasses import asdict
+
+import pytest
+
+from argus.backend.models.web import ArgusTest
+from argus.backend.plugins.sct.testrun import SCTTestRun
+from argus.backend.service.client_service import ClientService
+from argus.backend.tests.conftest import get_fake_test_run
+from argus.backend.util.background import CLIENT_SIDE_EFFECTS, BackgroundTasks
+from argus.common.enums import TestStatus
+
+
+@pytest.fixture
+def run(client_service: ClientService, fake_test: ArgusTest) -> SCTTestRun:
+    run_type, run_req = get_fake_test_run(fake_test)
+    client_service.submit_run(run_type, asdict(run_req))
+    return SCTTestRun.get(id=run_req.run_id)
+
+
+@pytest.fixture
+def no_run_loads(monkeypatch):
+    monkeypatch.setattr(SCTTestRun, "load_test_run", classmethod(lambda cls, run_id: pytest.fail("run loaded")))
+
+
+@pytest.mark.docker_required
+def test_heartbeat_writes_only_heartbeat(client_service: ClientService, run: SCTTestRun, no_run_loads):
+    run.get_primary_key(run.id)
+
+    heartbeat = client_service.heartbeat("scylla-cluster-tests", str(run.id))
+    CLIENT_SIDE_EFFECTS.join()
+
+    stored = SCTTestRun.get(id=run.id)
+    assert stored.heartbeat == heartbeat
+    assert (stored.status, stored.build_job_url) == (run.status, run.build_job_url)
+
+
+@pytest.mark.docker_required
+def test_status_update_queues_side_effects(client_service: ClientService, run: SCTTestRun, no_run_loads):
+    status = client_service.update_run_status("scylla-cluster-tests", str(run.id), TestStatus.FAILED.value)
+    CLIENT_SIDE_EFFECTS.join()
+
+    assert status == TestStatus.FAILED.value
+    assert SCTTestRun.get(id=run.id).status == TestStatus.FAILED.value
+    assert run.id not in {row.run_id for row in SCTTestRun.get_active_runs()}
+
+
+def test_background_tasks_coalesce_pending_keys():
+    tasks = BackgroundTasks(name="test_background_tasks")
+    release = threading.Event()
+    calls = []
+    tasks.submit("blocker", release.wait)
+    for value in range(3):
+        tasks.submit("key", calls.append, value)
+    release.set()
+    tasks.join()
+
+    assert calls == [0]
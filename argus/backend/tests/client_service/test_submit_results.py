@@ -4,6 +4,8 @@ from typing import Any
 import pytest
 
 from argus.backend.error_handlers import DataValidationError
+from argus.backend.models.result import ArgusBestResultData, ArgusGenericResultData
+from argus.backend.service.client_service import ClientException
 from argus.backend.tests.conftest import get_fake_test_run
 from argus.client.generic_result import ColumnMetadata, ResultType, ValidationRule, Status, \
     StaticGenericResultTable
@@ -77,3 +79,35 @@ def test_submit_results_responds_with_error_when_cell_has_error(fake_test, clien
     client_service.submit_run(run_type, asdict(run))
     with pytest.raises(DataValidationError):
         client_service.submit_results(run_type, run.run_id, results.as_dict())
+
+
+def test_submit_results_writes_all_cells_and_best_results(fake_test, client_service):
+    run_type, run = get_fake_test_run(test=fake_test)
+    results = SampleTable()
+    results.sut_timestamp = 123
+    for idx in range(250):
+        results.add_result(column="metric1", row=f"row{idx}", value=float(idx % 100), status=Status.UNSET)
+    client_service.submit_run(run_type, asdict(run))
+
+    response = client_service.submit_results(run_type, run.run_id, results.as_dict())
+
+    assert response["status"] == "ok"
+    stored = ArgusGenericResultData.filter(test_id=fake_test.id, name="Test Table").all()
+    assert len(stored) == 250
+    assert {cell.status for cell in stored} == {"PASS"}
+    best = ArgusBestResultData.filter(test_id=fake_test.id, name="Test Table").all()
+    assert {entry.key: entry.value for entry in best}["metric1:row42"] == 42
+
+
+def test_submit_results_rejects_invalid_cells_before_writing(fake_test, client_service):
+    run_type, run = get_fake_test_run(test=fake_test)
+    results = SampleTable()
+    results.sut_timestamp = 123
+    results.add_result(column="metric1", row="row1", value=1.0, status=Status.UNSET)
+    payload = results.as_dict()
+    payload["results"].append({"column": "unknown", "row": "row1", "value": 1.0, "status": "UNSET"})
+    client_service.submit_run(run_type, asdict(run))
+
+    with pytest.raises(ClientException):
+        client_service.submit_results(run_type, run.run_id, payload)
+    assert not ArgusGenericResultData.filter(test_id=fake_test.id, name="Test Table").all()
@@ -0,0 +1,147 @@
+import time
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+import pytest
+import requests_mock
+
+from argus.backend.models.github_issue import GithubIssue
+from argus.backend.models.jira import JiraIssue
+from argus.backend.models.runtime_store import RuntimeStore
+from argus.backend.service.github_service import GithubService
+from argus.backend.service.jira_service import JiraService
+
+
+@pytest.fixture
+def github_issue(argus_db) -> GithubIssue:
+    issue = GithubIssue()
+    issue.user_id = uuid4()
+    issue.type = "issues"
+    issue.owner = "argustest"
+    issue.repo = f"refresh-{time.time_ns()}"
+    issue.number = 1
+    issue.state = "open"
+    issue.title = "Old title"
+    issue.url = f"https://github.com/{issue.owner}/{issue.repo}/issues/1"
+    issue.save()
+    return issue
+
+
+@pytest.fixture
+def github_service() -> GithubService:
+    service = GithubService(dry_run=True)
+    service.token = "token"
+    return service
+
+
+@pytest.mark.docker_required
+def test_github_refresh_updates_changed_issues_and_uses_conditional_requests(github_service, github_issue):
+    remote_issue = {
+        "html_url": github_issue.url,
+        "title": "New title",
+        "state": "closed",
+        "labels": [{"id": 1, "name": "bug", "color": "f00", "description": "Bug"}],
+        "assignees": [{"login": "octocat", "html_url": "https://github.com/octocat"}],
+    }
+    responses = [remote_issue]
+
+    def issues_response(request, context):
+        if request.headers.get("If-None-Match") == "etag-empty":
+            context.status_code = 304
+            return None
+        context.headers = {"ETag": "etag-empty" if not responses else "etag-full", "X-RateLimit-Remaining": "4999"}
+        return [responses.pop()] if responses else []
+
+    with requests_mock.Mocker() as mocker:
+        mocker.get(f"{GithubService.API_URL}/repos/{github_issue.owner}/{github_issue.repo}/issues",
+                   json=issues_response)
+        stats = [github_service.refresh_stale_issues() for _ in range(3)]
+
+    refreshed = GithubIssue.get(id=github_issue.id)
+    assert (refreshed.title, refreshed.state) == ("New title", "closed")
+    assert [label.name for label in refreshed.labels] == ["bug"]
+    assert [assignee.login for assignee in refreshed.assignees] == ["octocat"]
+    assert stats[0]["updated"] == 1
+    assert stats[0]["rate_limit_remaining"] == 4999
+    assert (stats[1]["updated"], stats[1]["not_modified"]) == (0, 0)
+    assert (stats[2]["updated"], stats[2]["not_modified"]) == (0, 1)
+
+
+@pytest.mark.docker_required
+def test_github_refresh_keeps_window_of_failed_repos(github_service, github_issue):
+    repo = f"{github_issue.owner}/{github_issue.repo}".lower()
+    last_ran = RuntimeStore()
+    last_ran.key = GithubService.LAST_RAN_KEY
+    last_ran.value = datetime(year=2025, month=6, day=1, tzinfo=UTC)
+    last_ran.save()
+
+    with requests_mock.Mocker() as mocker:
+        mocker.get(requests_mock.ANY, json=[])
+        mocker.get(f"{GithubService.API_URL}/repos/{repo}/issues", status_code=500)
+        stats = github_service.refresh_stale_issues()
+
+    assert stats["failed"] == 1
+    assert github_service._load_repo_states()[repo] == {"since": last_ran.value.isoformat()}
+
+
+@pytest.mark.docker_required
+def test_jira_refresh_writes_only_changed_issues(argus_db):
+    project = f"REFRESH{time.time_ns()}"
+    issues = []
+    for number, summary in enumerate(["Unchanged", "Old summary"]):
+        issue = JiraIssue()
+        issue.user_id = uuid4()
+        issue.key = f"{project}-{number}"
+        issue.project = project
+        issue.summary = summary
+        issue.state = "open"
+        issue.save()
+        issues.append(issue)
+
+    def remote_issue(key: str, summary: str):
+        return SimpleNamespace(key=key, fields=SimpleNamespace(
+            summary=summary, status=SimpleNamespace(name="Open"), assignee=None, labels=[]))
+
+    service = JiraService(dry_run=True)
+    service.jira = MagicMock()
+    service.jira.search_issues.side_effect = lambda jql, **kwargs: [
+        remote_issue(issues[0].key, "Unchanged"), remote_issue(issues[1].key, "New summary")
+    ] if project in jql else []
+
+    stats = service.refresh_stale_issues()
+
+    assert stats["updated"] == 1
+    assert JiraIssue.get(id=issues[1].id).summary == "New summary"
+    assert all(call.kwargs["fields"] == JiraService.REFRESH_FIELDS
+               for call in service.jira.search_issues.call_args_list)
+
+
+@pytest.mark.docker_required
+def test_jira_refresh_keeps_last_ran_when_a_project_search_fails(argus_db):
+    project = f"FAILED{time.time_ns()}"
+    issue = JiraIssue()
+    issue.user_id = uuid4()
+    issue.key = f"{project}-1"
+    issue.project = project
+    issue.summary = "Summary"
+    issue.state = "open"
+    issue.save()
+
+    service = JiraService(dry_run=True)
+    service.jira = MagicMock()
+    service.jira.search_issues.return_value = []
+    service.refresh_stale_issues()
+    last_ran = RuntimeStore.get(key=JiraService.LAST_RAN_KEY).value
+
+    def search_issues(jql, **kwargs):
+        if project in jql:
+            raise ConnectionError("Jira is unavailable")
+        return []
+
+    service.jira.search_issues.side_effect = search_issues
+    stats = service.refresh_stale_issues()
+
+    assert stats["failed"] == 1
+    assert RuntimeStore.get(key=JiraService.LAST_RAN_KEY).value == last_ran
@@ -0,0 +1,75 @@
+import time
+
+import pytest
+
+from argus.backend.service.client_service import ClientService
+from argus.backend.service.views_widgets.pytest import PYTEST_NAMES, PytestNameSet, PytestViewService
+
+
+@pytest.fixture
+def loaded_names() -> None:
+    PYTEST_NAMES.names()
+
+
+@pytest.fixture
+def submitted(client_service: ClientService) -> str:
+    name = f"testSuite::test_filter_{time.time_ns()}"
+    sample = {
+        "name": name,
+        "test_type": "dtest",
+        "run_id": "879b516b-6e93-4c4c-9c86-dd0f2fda5c66",
+        "duration": 1.0,
+        "markers": ["dtest"],
+    }
+    for idx, status in enumerate(["passed", "failure", "passed", "error"]):
+        timestamp = 1753687331.0 + idx * 86400
+        client_service.submit_pytest_result({
+            **sample,
+            "status": status,
+            "timestamp": timestamp,
+            "session_timestamp": timestamp,
+            "message": f"message {idx}",
+            "user_fields": {"SCYLLA_MODE": "debug" if idx % 2 else "release"},
+        })
+    return name
+
+
+def result_filter(argus_app, pv_service: PytestViewService, **args) -> dict:
+    with argus_app.test_request_context(query_string=args):
+        return pv_service.result_filter()
+
+
+@pytest.mark.docker_required
+def test_submitted_name_is_searchable_without_reload(monkeypatch, argus_app, pv_service, loaded_names, submitted):
+    monkeypatch.setattr(PYTEST_NAMES, "reload", lambda: pytest.fail("name set reloaded"))
+
+    res = result_filter(argus_app, pv_service, test=submitted, limit=2)
+
+    assert res["total"] == 4
+    assert dict(res["pieChart"]) == {"passed": 2, "failure": 1, "error": 1}
+    assert [hit["status"] for hit in res["hits"]] == ["error", "passed"]
+    assert res["hits"][0]["message"] == "message 3"
+
+
+@pytest.mark.docker_required
+def test_adding_names_does_not_load_the_name_set(monkeypatch, argus_db):
+    names = PytestNameSet()
+    monkeypatch.setattr(names, "reload", lambda: pytest.fail("name set reloaded on submission"))
+
+    names.add(f"testSuite::test_add_{time.time_ns()}")
+    names.add(f"testSuite::test_add_{time.time_ns()}")
+
+
+@pytest.mark.docker_required
+def test_status_time_and_user_field_filters(argus_app, pv_service, submitted):
+    res = result_filter(argus_app, pv_service, test=submitted, **{"status[]": ["passed", "error"]},
+                        before=int(1753687331 + 2.5 * 86400))
+    assert [hit["status"] for hit in res["hits"]] == ["passed", "passed"]
+
+    res = result_filter(argus_app, pv_service, test=submitted, **{"filters[]": ["SCYLLA_MODE=debug"]})
+    assert [hit["message"] for hit in res["hits"]] == ["message 3", "message 1"]
+    assert res["hits"][0]["user_fields"] == {"SCYLLA_MODE": "debug"}
+
+    res = result_filter(argus_app, pv_service, test=submitted, query="message [02]")
+    assert res["total"] == 2
+    assert sum(sum(dataset["data"]) for dataset in res["barChart"]["datasets"]) == 2
@@ -1,4 +1,6 @@
-from argus.backend.service.results_service import Cell, ArgusGenericResultMetadata
+from datetime import datetime
+
+from argus.backend.service.results_service import BestResult, Cell, ArgusGenericResultMetadata, ResultsService
 
 
 def test_cell_initialization():
@@ -63,3 +65,29 @@ def test_higher_is_better_false_should_fail():
     best_results = {}
     cell.update_cell_status_based_on_rules(table_metadata, best_results)
     assert cell.status == "ERROR"
+
+
+def test_evaluate_cells_matches_per_cell_rules():
+    table_metadata = ArgusGenericResultMetadata(
+        validation_rules={"col1": [{"fixed_limit": 5}], "col2": [{"best_pct": 10}]},
+        columns_meta=[{"name": "col1", "higher_is_better": True}, {"name": "col2", "higher_is_better": False},
+                      {"name": "col3", "higher_is_better": None}]
+    )
+    best_results = {"col2:row1": [BestResult(key="col2:row1", value=10, result_date=datetime.now(), run_id="run")]}
+
+    def sample_cells():
+        return [Cell(column="col1", row="row1", status="UNSET", value=10),
+                Cell(column="col1", row="row2", status="UNSET", value=3),
+                Cell(column="col2", row="row1", status="UNSET", value=12),
+                Cell(column="col2", row="row2", status="UNSET", value=12),
+                Cell(column="col3", row="row1", status="UNSET", value=1)]
+
+    cells = sample_cells()
+    failed = ResultsService.evaluate_cells(table_metadata, cells, best_results)
+    expected = sample_cells()
+    for cell in expected:
+        cell.update_cell_status_based_on_rules(table_metadata, best_results)
+
+    assert failed
+    assert [cell.status for cell in cells] == [cell.status for cell in expected] == \
+        ["PASS", "ERROR", "ERROR", "PASS", "UNSET"]
@@ -14,6 +14,7 @@ from argus.backend.service.results_service import (
     create_limit_dataset,
     calculate_limits,
     calculate_graph_ticks, _identify_most_changed_package, _split_results_by_release,
+    index_cells, index_run_releases,
     BestResult, RunsDetails
 )
 from argus.backend.models.result import ArgusGenericResultMetadata, ArgusGenericResultData, ColumnMetadata, ValidationRules
@@ -178,6 +179,28 @@ def test_create_release_datasets():
     assert datasets[1]["label"] == "2024.3 - row1"
 
 
+def test_create_release_datasets_with_run_in_multiple_releases():
+    points = [
+        {"x": "2023-10-23T00:00:00Z", "y": 1.5, "id": "run1"},
+        {"x": "2023-10-24T00:00:00Z", "y": 2.5, "id": "run2"},
+    ]
+    releases_map = {"2024.2": ["run1", "run2"], "2024.3": ["run2"], "2024.4": []}
+    datasets = create_release_datasets(points, "row1", releases_map, [0, 0], index_run_releases(releases_map))
+    assert [[point["id"] for point in dataset["data"]] for dataset in datasets] == [["run1", "run2"], ["run2"]]
+    assert datasets[1]["borderColor"] != datasets[0]["borderColor"]
+
+
+def test_index_cells_groups_by_column_and_row():
+    cells = [
+        ArgusGenericResultData(run_id=uuid4(), column="col1", row="row1", value=1.0),
+        ArgusGenericResultData(run_id=uuid4(), column="col1", row="row2", value=2.0),
+        ArgusGenericResultData(run_id=uuid4(), column="col1", row="row1", value=3.0),
+    ]
+    cells_index = index_cells(cells)
+    assert [cell.value for cell in cells_index[("col1", "row1")]] == [1.0, 3.0]
+    assert [cell.value for cell in cells_index[("col1", "row2")]] == [2.0]
+
+
 def test_create_limit_dataset():
     points = [
         {"x": "2023-10-23T00:00:00Z", "y": 1.5, "id": "run1"},
@@ -0,0 +1,127 @@
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from argus.backend.models.result import ArgusGenericResultMetadata, ColumnMetadata, ArgusGenericResultData
+from argus.backend.service.results_service import (
+    BestResult,
+    RunsDetails,
+    aggregate_points,
+    create_chartjs,
+    downsample_points,
+    index_run_releases,
+    lttb_indices,
+)
+
+
+def make_points(count: int, start: datetime = datetime(2024, 1, 1), step: timedelta = timedelta(hours=6)) -> list[dict]:
+    return [
+        {
+            "x": (start + step * idx).strftime('%Y-%m-%dT%H:%M:%SZ'),
+            "y": float(idx % 7),
+            "id": uuid4(),
+            "changes": ["pkg1: 1.0"],
+            "dep_change": False,
+        }
+        for idx in range(count)
+    ]
+
+
+def test_lttb_keeps_first_and_last_point_within_budget():
+    xs = [float(x) for x in range(100)]
+    ys = [float(x % 10) for x in range(100)]
+
+    indices = lttb_indices(xs, ys, 10)
+
+    assert len(indices) == 10
+    assert indices[0] == 0 and indices[-1] == 99
+    assert indices == sorted(indices)
+
+
+def test_lttb_keeps_spike():
+    xs = [float(x) for x in range(50)]
+    ys = [0.0] * 50
+    ys[23] = 100.0
+
+    assert 23 in lttb_indices(xs, ys, 5)
+
+
+def test_downsample_leaves_short_series_untouched():
+    points = make_points(5)
+
+    assert downsample_points(points, 10, keep_ids=set()) is points
+
+
+def test_downsample_always_keeps_breaches_best_results_and_dependency_changes():
+    points = make_points(200)
+    points[57]["dep_change"] = True
+    keep_ids = {str(points[11]["id"]), str(points[130]["id"])}
+
+    downsampled = downsample_points(points, 20, keep_ids)
+
+    kept = {point["id"] for point in downsampled}
+    assert {points[11]["id"], points[57]["id"], points[130]["id"]} <= kept
+    assert len(downsampled) <= 23
+    assert [point["x"] for point in downsampled] == sorted(point["x"] for point in downsampled)
+
+
+def test_aggregate_points_daily_per_release():
+    points = make_points(8)
+    releases_map = {"1.0": [point["id"] for point in points[:6]], "2.0": [point["id"] for point in points[6:]]}
+
+    aggregated = aggregate_points(points, "day", index_run_releases(releases_map))
+
+    assert [(point["x"], point["count"]) for point in aggregated] == [
+        ("2024-01-01T00:00:00Z", 4),
+        ("2024-01-02T00:00:00Z", 2),
+        ("2024-01-02T00:00:00Z", 2),
+    ]
+    assert aggregated[0]["y"] == 1.5
+    assert aggregated[0]["id"] == points[3]["id"]
+
+
+def test_aggregate_points_weekly_starts_on_monday():
+    points = make_points(3, start=datetime(2024, 1, 3), step=timedelta(days=3))
+    points[1]["dep_change"] = True
+    points[1]["changes"] = ["pkg1: 1.0", "pkg2: 1 -> 2"]
+
+    aggregated = aggregate_points(points, "week", index_run_releases({"1.0": [point["id"] for point in points]}))
+
+    assert [point["x"] for point in aggregated] == ["2024-01-01T00:00:00Z", "2024-01-08T00:00:00Z"]
+    assert aggregated[0]["dep_change"]
+    assert aggregated[0]["changes"] == ["pkg1: 1.0", "pkg2: 1 -> 2"]
+
+
+def test_create_chartjs_with_max_points_keeps_breached_runs():
+    table = ArgusGenericResultMetadata(
+        test_id=uuid4(),
+        name='Test Table',
+        columns_meta=[
+            ColumnMetadata(name='col1', unit='ms', type='FLOAT', higher_is_better=False)
+        ],
+        rows_meta=['row1'],
+        validation_rules={}
+    )
+    data = [
+        ArgusGenericResultData(
+            test_id=table.test_id,
+            name=table.name,
+            run_id=uuid4(),
+            column='col1',
+            row='row1',
+            sut_timestamp=datetime(2021, 1, 1) + timedelta(days=idx),
+            value=100.0,
+            status='ERROR' if idx == 42 else 'PASS'
+        )
+        for idx in range(300)
+    ]
+    best_results = {
+        'col1:row1': [BestResult(key='col1:row1', value=100.0, result_date=datetime(2021, 1, 1), run_id=str(data[7].run_id))]
+    }
+    releases_map = {"1.0": [point.run_id for point in data]}
+    runs_details = RunsDetails(ignored=[], packages={})
+
+    graphs = create_chartjs(table, data, best_results, releases_map, runs_details, main_package="pkg1", max_points=30)
+
+    points = graphs[0]['data']['datasets'][0]['data']
+    assert len(points) <= 32
+    assert {data[7].run_id, data[42].run_id} <= {point["id"] for point in points}
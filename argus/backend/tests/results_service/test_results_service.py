@@ -6,7 +6,14 @@ import pytest
 from argus.backend.models.result import ArgusGenericResultMetadata, ArgusGenericResultData, ColumnMetadata, ArgusGraphView
 from argus.backend.plugins.sct.testrun import SCTTestRun
 from argus.backend.plugins.sct.udt import PackageVersion
-from argus.backend.service.results_service import ResultsService
+from argus.backend.service.results_service import ResultsService, _build_version_matrix
+from argus.backend.util.cache import (
+    TEST_RESULTS_CACHE_GENERATION_KEY,
+    TEST_RESULTS_CACHE_GENERATIONS,
+    VERSION_MATRIX_CACHE,
+    CacheGeneration,
+    invalidate_version_matrix,
+)
 
 
 @pytest.fixture
@@ -178,6 +185,62 @@ def test_get_tests_by_version_groups_runs_correctly(argus_db):
     assert result == expected_result
 
 
+def test_build_version_matrix_prefers_upgraded_package_and_newest_run():
+    upgraded = PackageVersion(name='scylla-upgraded', version='5.0', date='d2', revision_id='r2', build_id='')
+    base = PackageVersion(name='scylla', version='4.0', date='d1', revision_id='r1', build_id='')
+    rows = [
+        {"id": uuid4(), "status": "failed", "investigation_status": "not_investigated", "test_name": "name",
+         "build_id": "build", "packages": [base, upgraded], "test_method": "module.Class.test_a", "started_by": None},
+        {"id": uuid4(), "status": "passed", "investigation_status": "not_investigated", "test_name": "name",
+         "build_id": "build", "packages": [base, upgraded], "test_method": "module.Class.test_a", "started_by": None},
+        {"id": uuid4(), "status": "passed", "investigation_status": "not_investigated", "test_name": "name",
+         "build_id": "build", "packages": None, "test_method": "module.Class.test_b", "started_by": None},
+    ]
+
+    methods_by_version, info = _build_version_matrix(rows, "scylla")
+
+    assert methods_by_version == {"5.0-d2-r2": {"test_a": {"run_id": str(rows[0]["id"]), "status": "failed", "started_by": None}}}
+    assert info == {"name": "name", "build_id": "build"}
+
+
+def test_get_tests_by_version_is_cached_until_new_runs_arrive(argus_db):
+    test_id = uuid4()
+    pkg = PackageVersion(name='scylla', version='4.0', date='2021-01-01', revision_id='', build_id='')
+    SCTTestRun(id=uuid4(), build_id='build_id_cache', test_id=test_id, test_method='test_method1',
+               investigation_status='', packages=[pkg], start_time=datetime.now(UTC)).save()
+    service = ResultsService()
+    service._exclude_disabled_tests = lambda x: x
+
+    assert list(service.get_tests_by_version('scylla', [test_id])['versions']) == ['4.0-2021-01-01-']
+    assert VERSION_MATRIX_CACHE.get((test_id, 'scylla')) is not None
+
+    newer = PackageVersion(name='scylla', version='4.1', date='2021-02-01', revision_id='', build_id='')
+    SCTTestRun(id=uuid4(), build_id='build_id_cache', test_id=test_id, test_method='test_method1',
+               investigation_status='', packages=[newer], start_time=datetime.now(UTC)).save()
+    invalidate_version_matrix(test_id)
+
+    assert set(service.get_tests_by_version('scylla', [test_id])['versions']) == {'4.0-2021-01-01-', '4.1-2021-02-01-'}
+
+
+def test_get_tests_by_version_drops_slices_invalidated_by_other_workers(argus_db):
+    test_id = uuid4()
+    pkg = PackageVersion(name='scylla', version='4.0', date='2021-01-01', revision_id='', build_id='')
+    SCTTestRun(id=uuid4(), build_id='build_id_sync', test_id=test_id, test_method='test_method1',
+               investigation_status='', packages=[pkg], start_time=datetime.now(UTC)).save()
+    service = ResultsService()
+    service._exclude_disabled_tests = lambda x: x
+    service.get_tests_by_version('scylla', [test_id])
+
+    newer = PackageVersion(name='scylla', version='4.1', date='2021-02-01', revision_id='', build_id='')
+    SCTTestRun(id=uuid4(), build_id='build_id_sync', test_id=test_id, test_method='test_method1',
+               investigation_status='', packages=[newer], start_time=datetime.now(UTC)).save()
+    # Another worker took the submission, this one only sees the bumped generation of the test
+    CacheGeneration(f"{TEST_RESULTS_CACHE_GENERATION_KEY}_{test_id}").bump()
+    TEST_RESULTS_CACHE_GENERATIONS.get(test_id).next_check = 0
+
+    assert set(service.get_tests_by_version('scylla', [test_id])['versions']) == {'4.0-2021-01-01-', '4.1-2021-02-01-'}
+
+
 def test_create_update_argus_graph_view_should_create() -> None:
     service = ResultsService()
     test_id = uuid4()
@@ -0,0 +1,44 @@
+from dataclasses import asdict
+from uuid import UUID
+
+from argus.backend.tests.conftest import get_fake_test_run
+from argus.backend.util.cache import TABLES_METADATA_CACHE
+from argus.client.generic_result import ColumnMetadata, ResultType, StaticGenericResultTable
+
+
+def make_table(table_name: str, value: float) -> StaticGenericResultTable:
+    class Table(StaticGenericResultTable):
+        class Meta:
+            name = table_name
+            description = f"{table_name} description"
+            Columns = [ColumnMetadata(name="latency", unit="ms", type=ResultType.FLOAT)]
+
+    table = Table()
+    table.sut_timestamp = 123
+    table.add_result(column="latency", row="read", value=value, status="UNSET")
+    return table
+
+
+def test_get_run_results_reads_all_tables(fake_test, client_service, results_service):
+    run_type, run = get_fake_test_run(test=fake_test)
+    client_service.submit_run(run_type, asdict(run))
+    for idx in range(5):
+        client_service.submit_results(run_type, run.run_id, make_table(f"table {idx}", idx).as_dict())
+
+    run_results = results_service.get_run_results(fake_test.id, UUID(run.run_id))
+
+    assert [next(iter(table)) for table in run_results] == [f"table {idx}" for idx in range(5)]
+    assert run_results[3]["table 3"]["table_data"]["read"]["latency"]["value"] == 3
+
+
+def test_get_run_results_sees_tables_added_after_metadata_was_cached(fake_test, client_service, results_service):
+    run_type, run = get_fake_test_run(test=fake_test)
+    client_service.submit_run(run_type, asdict(run))
+    client_service.submit_results(run_type, run.run_id, make_table("cached table", 1).as_dict())
+    results_service.get_run_results(fake_test.id, UUID(run.run_id))
+    assert TABLES_METADATA_CACHE.get(fake_test.id) is not None
+
+    client_service.submit_results(run_type, run.run_id, make_table("late table", 2).as_dict())
+    run_results = results_service.get_run_results(fake_test.id, UUID(run.run_id))
+
+    assert {next(iter(table)) for table in run_results} >= {"cached table", "late table"}
@@ -5,6 +5,7 @@ from uuid import uuid4
 import pytest
 
 from argus.backend.plugins.sct.testrun import SCTResource, SCTNemesis, SCTTestRun
+from argus.common.enums import TestStatus
 from argus.common.utils import clamp_ts_to_milliseconds
 
 API_PREFIX = "/api/v1/client/sct"
@@ -314,6 +315,36 @@ def test_submit_gemini_results(flask_client, sct_run_id):
     assert run.gemini_status == "PASSED"
 
 
+def test_failed_gemini_results_remove_run_from_active_runs(flask_client, sct_run_id):
+    assert sct_run_id in {str(row.run_id) for row in SCTTestRun.get_active_runs()}
+    payload = {
+        "gemini_data": {
+            "oracle_nodes_count": 1,
+            "oracle_node_ami_id": "ami-123",
+            "oracle_node_instance_type": "i3.large",
+            "oracle_node_scylla_version": "6.0.0",
+            "gemini_command": "gemini run",
+            "gemini_version": "1.0.0",
+            "gemini_status": "FAILED",
+            "gemini_seed": "42",
+            "gemini_write_ops": 100,
+            "gemini_write_errors": 1,
+            "gemini_read_ops": 50,
+            "gemini_read_errors": 0,
+        },
+        "schema_version": "v8"
+    }
+    resp = flask_client.post(
+        f"{API_PREFIX}/{sct_run_id}/gemini/submit",
+        data=json.dumps(payload),
+        content_type="application/json",
+    )
+    assert resp.status_code == 200
+
+    assert SCTTestRun.get(id=sct_run_id).status == TestStatus.FAILED.value
+    assert sct_run_id not in {str(row.run_id) for row in SCTTestRun.get_active_runs()}
+
+
 def test_submit_and_get_junit_report(flask_client, sct_run_id):
     payload = {"file_name": "report.xml",
                "content": "PGp1bml0PjwvanVuaXQ+", "schema_version": "v8"}
@@ -7,7 +7,7 @@ from time import sleep
 from flask.testing import FlaskClient
 
 from argus.backend.models.web import ArgusRelease, ArgusGroup, ArgusTest
-from argus.backend.plugins.sct.testrun import SCTEventSeverity, SCTTestRun
+from argus.backend.plugins.sct.testrun import SCTEventSeverity, SCTTestRun, SCTUnprocessedEvent
 from argus.backend.service.client_service import ClientService
 from argus.backend.plugins.sct.service import SCTService
 from argus.backend.service.testrun import TestRunService
@@ -383,3 +383,34 @@ def test_controller_submit_events_and_get_by_severity(flask_client: FlaskClient,
     assert response.content_type == "application/json"
     assert response.json["status"] == "ok"
     assert len(response.json["response"]) == 25
+
+
+def test_submit_event_batch(client_service: ClientService, sct_service: SCTService, testrun_service: TestRunService,
+                            fake_test: ArgusTest):
+    run_type, run_req = get_fake_test_run(fake_test)
+    client_service.submit_run(run_type, asdict(run_req))
+    run: SCTTestRun = testrun_service.get_run(run_type, run_req.run_id)
+    now = datetime.now(tz=UTC).timestamp()
+
+    def make_event(idx: int, severity: str, event_type: str = "end", message: str = "Sample event") -> RawEventPayload:
+        return {"run_id": str(run.id), "severity": severity, "ts": now + idx, "message": message,
+                "event_type": event_type}
+
+    coredump_messages = [f"node=node-{idx}\ncorefile_url=https://storage.example.com/core-{idx}.zst"
+                         for idx in range(2)]
+    events = [
+        make_event(0, SCTEventSeverity.ERROR.value),
+        make_event(1, "not-a-severity"),
+        {"message": "missing fields"},
+        make_event(2, SCTEventSeverity.CRITICAL.value, "CoreDumpEvent", coredump_messages[0]),
+        make_event(3, SCTEventSeverity.NORMAL.value, "CoreDumpEvent", coredump_messages[1]),
+    ]
+
+    results = sct_service.submit_event_batch(str(run.id), events)
+
+    assert [result["status"] for result in results] == ["ok", "error", "error", "ok", "ok"]
+    assert len(run.get_all_events()) == 3
+    assert {event.severity for event in SCTUnprocessedEvent.filter(run_id=run.id).all()} == {
+        SCTEventSeverity.ERROR.value, SCTEventSeverity.CRITICAL.value}
+    links = [log[1] for log in testrun_service.get_run(run_type, run_req.run_id).logs]
+    assert all(any(f"core-{idx}.zst" in link for link in links) for idx in range(2))
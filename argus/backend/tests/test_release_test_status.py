@@ -0,0 +1,167 @@
+"""
+Tests for the materialized per-test status rows (ReleaseTestStatus).
+
+Covers:
+- summarize_test_runs keeps exactly the runs that decide a test's status
+- refresh_test_status write path via ClientService/TestRunService/SCTService
+- ReleaseStatsCollector limited path served from materialized rows matches a full recomputation
+"""
+import uuid
+from dataclasses import asdict
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from argus.backend.models.web import ReleaseStatsSnapshot, ReleaseTestStatus
+from argus.backend.plugins.sct.service import SCTService
+from argus.backend.service.stats import ReleaseStatsCollector, summarize_test_runs, is_status_summary_ready
+from argus.backend.tests.conftest import get_fake_test_run
+from argus.common.enums import TestInvestigationStatus, TestStatus
+
+
+def make_row(build_number: int, status: TestStatus, minutes: int, version: str | None = None,
+             investigation_status: TestInvestigationStatus = TestInvestigationStatus.NOT_INVESTIGATED) -> dict:
+    return {
+        "id": uuid.uuid4(),
+        "build_id": "some/job",
+        "build_number": build_number,
+        "build_job_url": f"http://example.com/job/{build_number}",
+        "status": status.value,
+        "investigation_status": investigation_status.value,
+        "assignee": None,
+        "start_time": datetime(2024, 1, 1, tzinfo=timezone.utc) + timedelta(minutes=minutes),
+        "scylla_version": version,
+    }
+
+
+def drop_snapshots(release_id):
+    for snapshot in ReleaseStatsSnapshot.filter(release_id=release_id).all():
+        snapshot.delete()
+
+
+def limited_statuses(result: dict) -> dict:
+    return {
+        test_id: (test["status"], test["investigation_status"])
+        for group in result["groups"].values()
+        for test_id, test in group["tests"].items()
+    }
+
+
+# ---------------------------------------------------------------------------
+# Unit: summarize_test_runs
+# ---------------------------------------------------------------------------
+
+def test_summarize_keeps_latest_and_worst_run_of_latest_build():
+    latest = make_row(2, TestStatus.PASSED, minutes=30)
+    worst = make_row(2, TestStatus.FAILED, minutes=20)
+    older = make_row(1, TestStatus.ABORTED, minutes=10)
+
+    summary = summarize_test_runs([older, latest, worst])
+
+    assert {row["id"] for row in summary} == {latest["id"], worst["id"]}
+
+
+def test_summarize_collapses_single_deciding_run():
+    only = make_row(3, TestStatus.FAILED, minutes=5)
+
+    assert summarize_test_runs([only, make_row(2, TestStatus.PASSED, minutes=1)]) == [only]
+
+
+def test_summarize_is_computed_per_version():
+    run_a = make_row(5, TestStatus.PASSED, minutes=10, version="5.2.0")
+    run_b = make_row(3, TestStatus.FAILED, minutes=5, version="6.0.0")
+    run_no_version = make_row(1, TestStatus.ABORTED, minutes=1)
+
+    summary = summarize_test_runs([run_a, run_b, run_no_version])
+
+    assert {row["id"] for row in summary} == {run_a["id"], run_b["id"], run_no_version["id"]}
+
+
+def test_summarize_empty():
+    assert summarize_test_runs([]) == []
+
+
+# ---------------------------------------------------------------------------
+# Integration: materialized rows maintained by run lifecycle
+# ---------------------------------------------------------------------------
+
+@pytest.mark.docker_required
+def test_status_rows_follow_run_status_changes(argus_db, fake_test, client_service, release):
+    run_type, run_req = get_fake_test_run(fake_test)
+    client_service.submit_run(run_type, asdict(run_req))
+    client_service.update_run_status(run_type, run_req.run_id, TestStatus.FAILED.value)
+
+    rows = list(ReleaseTestStatus.filter(release_id=release.id, test_id=fake_test.id).all())
+    assert [(row.run_id, row.status) for row in rows] == [(uuid.UUID(run_req.run_id), TestStatus.FAILED.value)]
+
+
+@pytest.mark.docker_required
+def test_status_rows_follow_failed_gemini_results(argus_db, fake_test, client_service, release):
+    run_type, run_req = get_fake_test_run(fake_test)
+    client_service.submit_run(run_type, asdict(run_req))
+    SCTService.submit_gemini_results(run_req.run_id, {"gemini_status": "FAILED"})
+
+    rows = list(ReleaseTestStatus.filter(release_id=release.id, test_id=fake_test.id).all())
+    assert [(row.run_id, row.status) for row in rows] == [(uuid.UUID(run_req.run_id), TestStatus.FAILED.value)]
+
+
+@pytest.mark.docker_required
+def test_status_rows_follow_investigation_status_changes(argus_db, fake_test, client_service, testrun_service, release):
+    run_type, run_req = get_fake_test_run(fake_test)
+    client_service.submit_run(run_type, asdict(run_req))
+    testrun_service.change_run_investigation_status(fake_test.id, uuid.UUID(run_req.run_id), TestInvestigationStatus.INVESTIGATED)
+
+    row = ReleaseTestStatus.get(release_id=release.id, test_id=fake_test.id, version="", run_id=uuid.UUID(run_req.run_id))
+    assert row.investigation_status == TestInvestigationStatus.INVESTIGATED.value
+
+
+@pytest.mark.docker_required
+def test_status_rows_move_to_reported_version(argus_db, fake_test, client_service, release):
+    run_type, run_req = get_fake_test_run(fake_test)
+    client_service.submit_run(run_type, asdict(run_req))
+    client_service.submit_product_version(run_type, run_req.run_id, "4.4.4-status")
+
+    versions = {row.version for row in ReleaseTestStatus.filter(release_id=release.id, test_id=fake_test.id).all()}
+    assert versions == {"4.4.4-status"}
+
+
+@pytest.mark.docker_required
+def test_limited_stats_from_status_rows_match_full_recomputation(argus_db, fake_test, client_service, release):
+    run_type, first = get_fake_test_run(fake_test, job_url="http://example.com/job/100")
+    run_type, second = get_fake_test_run(fake_test, job_url="http://example.com/job/101")
+    client_service.submit_run(run_type, asdict(first))
+    client_service.submit_run(run_type, asdict(second))
+    client_service.update_run_status(run_type, first.run_id, TestStatus.FAILED.value)
+    client_service.update_run_status(run_type, second.run_id, TestStatus.PASSED.value)
+
+    collector = ReleaseStatsCollector(release.name)
+    drop_snapshots(release.id)
+    collector.collect(limited=True, force=True, include_no_version=True)
+    assert is_status_summary_ready(release.id)
+
+    client_service.update_run_status(run_type, second.run_id, TestStatus.ABORTED.value)
+    drop_snapshots(release.id)
+    materialized = collector.collect(limited=True, force=False, include_no_version=True)
+    drop_snapshots(release.id)
+    recomputed = collector.collect(limited=True, force=True, include_no_version=True)
+
+    assert limited_statuses(materialized) == limited_statuses(recomputed)
+    assert limited_statuses(materialized)[str(fake_test.id)] == (
+        TestStatus.ABORTED.value, TestInvestigationStatus.NOT_INVESTIGATED.value)
+
+
+@pytest.mark.docker_required
+def test_delete_release_removes_status_rows(argus_db, release_manager_service):
+    release = release_manager_service.create_release(f"status_cleanup_{uuid.uuid4().hex}", "Status Cleanup", False)
+    ReleaseTestStatus.create(release_id=release.id, test_id=uuid.uuid4(), version="", run_id=uuid.uuid4())
+
+    release_manager_service.delete_release(str(release.id))
+
+    assert list(ReleaseTestStatus.filter(release_id=release.id).all()) == []
+
+
+@pytest.mark.docker_required
+def test_unseeded_release_is_not_served_from_status_rows(argus_db, release_manager_service):
+    release = release_manager_service.create_release(f"status_unseeded_{uuid.uuid4().hex}", "Unseeded", False)
+
+    assert not is_status_summary_ready(release.id)
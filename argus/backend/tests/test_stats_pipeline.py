@@ -0,0 +1,127 @@
+"""
+Tests for the streaming stats row pipeline used by release and view collectors.
+
+Covers:
+- reduce_build_runs keeps the last runs and the worst-case run of the latest build
+- stats_row_filter version/image predicates
+- collect_build_runs grouping, filtering and summary collection
+- find_worst_case agrees with generate_field_status_map over sorted runs
+"""
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from argus.backend.service.stats import (
+    LAST_RUNS_LIMIT,
+    collect_build_runs,
+    compute_worst_cases,
+    find_worst_case,
+    generate_field_status_map,
+    reduce_build_runs,
+    run_order_key,
+    stats_row_filter,
+)
+from argus.common.enums import TestStatus
+
+
+def make_row(build_id: str, build_number: int, status: TestStatus, minutes: int, version: str | None = None,
+             image_id: str | None = None) -> dict:
+    return {
+        "id": uuid.uuid4(),
+        "build_id": build_id,
+        "build_number": build_number,
+        "build_job_url": f"http://example.com/job/{build_number}",
+        "status": status.value,
+        "investigation_status": "not_investigated",
+        "assignee": None,
+        "start_time": datetime(2024, 1, 1, tzinfo=timezone.utc) + timedelta(minutes=minutes),
+        "scylla_version": version,
+        "cloud_setup": SimpleNamespace(db_node=SimpleNamespace(image_id=image_id)) if image_id else None,
+    }
+
+
+def test_reduce_build_runs_keeps_small_builds_intact(argus_db):
+    rows = [make_row("job", number, TestStatus.PASSED, minutes=number) for number in range(LAST_RUNS_LIMIT)]
+
+    assert [row["build_number"] for row in reduce_build_runs(rows)] == sorted(range(LAST_RUNS_LIMIT), reverse=True)
+
+
+def test_reduce_build_runs_keeps_worst_run_of_latest_build(argus_db):
+    worst = make_row("job", 9, TestStatus.FAILED, minutes=0)
+    passing = [make_row("job", 9, TestStatus.PASSED, minutes=minutes) for minutes in range(1, LAST_RUNS_LIMIT + 3)]
+    rows = sorted([worst, *passing], reverse=True, key=lambda row: row["start_time"])
+
+    reduced = reduce_build_runs(rows)
+
+    assert len(reduced) == LAST_RUNS_LIMIT + 1
+    assert reduced[-1] is worst
+
+
+def test_reduce_build_runs_drops_older_builds(argus_db):
+    rows = [make_row("job", number, TestStatus.PASSED, minutes=number) for number in range(15)]
+
+    assert [row["build_number"] for row in reduce_build_runs(rows)] == [14, 13, 12, 11, 10]
+
+
+def test_stats_row_filter_versions(argus_db):
+    versioned = make_row("job", 1, TestStatus.PASSED, minutes=0, version="5.2.1")
+    unversioned = make_row("job", 1, TestStatus.PASSED, minutes=0)
+
+    assert stats_row_filter(None, True, None)(unversioned)
+    assert not stats_row_filter(None, False, None)(unversioned)
+    assert stats_row_filter("5.2", False, None)(versioned)
+    assert not stats_row_filter("5.3", False, None)(versioned)
+    assert stats_row_filter("5.3", True, None)(unversioned)
+    assert stats_row_filter("!noVersion", False, None)(unversioned)
+
+
+def test_stats_row_filter_image(argus_db):
+    with_image = make_row("job", 1, TestStatus.PASSED, minutes=0, version="5.2.1", image_id="ami-1")
+    without_setup = make_row("job", 1, TestStatus.PASSED, minutes=0, version="5.2.1")
+
+    assert stats_row_filter(None, True, "ami-1")(with_image)
+    assert not stats_row_filter(None, True, "ami-2")(with_image)
+    assert not stats_row_filter(None, True, "ami-1")(without_setup)
+
+
+def test_collect_build_runs_groups_filters_and_summarizes(argus_db):
+    first_slice = [
+        make_row("job-a", 2, TestStatus.PASSED, minutes=2, version="5.2.1"),
+        make_row("job-a", 1, TestStatus.FAILED, minutes=1),
+    ]
+    second_slice = [make_row("job-b", 1, TestStatus.ABORTED, minutes=0)]
+    summaries = []
+
+    runs = collect_build_runs([first_slice, second_slice], stats_row_filter(None, False, None), summaries)
+
+    assert list(runs) == ["job-a"]
+    assert [row["build_number"] for row in runs["job-a"]] == [2]
+    assert len(summaries) == 3
+
+
+def test_find_worst_case_picks_first_worst_run_of_latest_build(argus_db):
+    latest = make_row("job", 4, TestStatus.PASSED, minutes=3)
+    first_failure = make_row("job", 4, TestStatus.FAILED, minutes=2)
+    second_failure = make_row("job", 4, TestStatus.TEST_ERROR, minutes=1)
+    older = make_row("job", 3, TestStatus.ABORTED, minutes=0)
+
+    assert find_worst_case([latest, first_failure, second_failure, older]) == (latest, first_failure)
+
+
+def test_find_worst_case_matches_status_map(argus_db):
+    statuses = list(TestStatus)
+    rows = [make_row("job", number % 4, statuses[(number * 7) % len(statuses)], minutes=number) for number in range(30)]
+    for row in rows[::5]:
+        row["build_number"] = None
+    runs = sorted(rows, reverse=True, key=run_order_key)
+
+    last_run, worst_run = find_worst_case(rows)
+
+    assert last_run is runs[0]
+    assert generate_field_status_map(runs)[runs[0]["build_number"]] == (worst_run["status"], worst_run)
+
+
+def test_compute_worst_cases_skips_empty_builds(argus_db):
+    run = make_row("job-a", 1, TestStatus.FAILED, minutes=0)
+
+    assert compute_worst_cases({"job-a": [run], "job-b": []}) == {"job-a": (run, run)}
@@ -14,14 +14,16 @@ Covers:
 - New run appears after invalidation (stale data regression)
 - Migration script idempotency
 - delete_release() cleanup of indexes and snapshots
+- SnapshotSingleFlight coalescing of concurrent rebuilds and stale fallback
 """
 import importlib.util
 import json
+import threading
 import time
 import types
 import uuid
 from dataclasses import asdict
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
@@ -31,9 +33,10 @@ import pytest
 from argus.backend.models.web import (
     ReleaseDistinctVersions,
     ReleaseDistinctImages,
+    ReleaseStatsRebuildLease,
     ReleaseStatsSnapshot,
 )
-from argus.backend.service.stats import snapshot_filter_key, ReleaseStatsCollector
+from argus.backend.service.stats import snapshot_filter_key, ReleaseStatsCollector, SnapshotSingleFlight
 from argus.backend.tests.conftest import get_fake_test_run
 
 
@@ -479,3 +482,88 @@ def test_delete_release_removes_indexes_and_snapshots(argus_db, release_manager_
     assert list(ReleaseDistinctVersions.filter(release_id=rid).all()) == []
     assert list(ReleaseDistinctImages.filter(release_id=rid).all()) == []
     assert get_snapshots(rid) == []
+
+
+# ---------------------------------------------------------------------------
+# Unit/Integration: single-flight snapshot rebuilds
+# ---------------------------------------------------------------------------
+
+def test_single_flight_coalesces_concurrent_rebuilds(argus_db):
+    flight = SnapshotSingleFlight(wait_timeout=10)
+    rebuilds = []
+
+    def rebuild():
+        rebuilds.append(1)
+        time.sleep(0.2)
+        return {"total": 1}
+
+    release_id = uuid.uuid4()
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.run(release_id, "key", rebuild))) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(rebuilds) == 1
+    assert len(results) == 16
+    assert all(result["total"] == 1 for result in results)
+
+
+def test_single_flight_serves_stale_snapshot_while_rebuilding(argus_db):
+    flight = SnapshotSingleFlight(wait_timeout=10)
+    release_id = uuid.uuid4()
+    flight.remember(release_id, "key", {"total": 3})
+    started = threading.Event()
+    release_rebuild = threading.Event()
+
+    def rebuild():
+        started.set()
+        release_rebuild.wait(5)
+        return {"total": 4}
+
+    leader = threading.Thread(target=lambda: flight.run(release_id, "key", rebuild))
+    leader.start()
+    started.wait(5)
+    follower = flight.run(release_id, "key", rebuild)
+    release_rebuild.set()
+    leader.join()
+
+    assert follower["total"] == 3
+    assert follower["stale"] is True
+    assert follower["snapshotAge"] >= 0
+
+
+def test_single_flight_waits_for_snapshot_when_lease_is_held_elsewhere(argus_db):
+    flight = SnapshotSingleFlight(wait_timeout=5, poll_interval=0.1)
+    release_id = uuid.uuid4()
+    ReleaseStatsRebuildLease.create(release_id=release_id, filter_key="key", owner="other-worker",
+                                    acquired_at=datetime.now(timezone.utc))
+    write_snapshot(release_id, "key", payload='{"total": 7}')
+
+    result = flight.run(release_id, "key", lambda: pytest.fail("must not rebuild while another worker holds the lease"))
+
+    assert result == {"total": 7}
+
+
+def test_single_flight_keeps_age_of_stale_snapshot_when_lease_is_held_elsewhere(argus_db):
+    flight = SnapshotSingleFlight(wait_timeout=5, poll_interval=0.1)
+    release_id = uuid.uuid4()
+    generated_at = datetime.now(timezone.utc) - timedelta(minutes=10)
+    flight.remember(release_id, "key", {"total": 5}, generated_at=generated_at)
+    ReleaseStatsRebuildLease.create(release_id=release_id, filter_key="key", owner="other-worker",
+                                    acquired_at=datetime.now(timezone.utc))
+
+    result = flight.run(release_id, "key", lambda: pytest.fail("must not rebuild while another worker holds the lease"))
+
+    assert result["stale"] is True
+    assert flight.stale(release_id, "key")["snapshotGeneratedAt"] == generated_at
+
+
+def test_single_flight_releases_lease_after_rebuild(argus_db):
+    flight = SnapshotSingleFlight()
+    release_id = uuid.uuid4()
+
+    flight.run(release_id, "key", lambda: {"total": 0})
+
+    assert list(ReleaseStatsRebuildLease.filter(release_id=release_id).all()) == []
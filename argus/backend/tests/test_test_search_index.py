@@ -0,0 +1,70 @@
+"""
+Tests for the per-worker search index behind TestLookup.test_lookup.
+
+Covers:
+- substring search and release/group/type facets over the indexed entities
+- in-place index updates done by the release manager and the API, without rebuilding from the database
+"""
+import time
+
+import pytest
+
+from argus.backend.service.argus_service import ArgusService
+from argus.backend.service.test_lookup import TEST_SEARCH_INDEX, TestLookup
+
+
+def found_ids(query: str, release_id=None) -> set:
+    return {entity["id"] for entity in TestLookup.test_lookup(query, release_id=release_id)[1:]}
+
+
+@pytest.fixture
+def rebuilds(monkeypatch):
+    calls = []
+    rebuild = TEST_SEARCH_INDEX.rebuild
+    monkeypatch.setattr(TEST_SEARCH_INDEX, "rebuild", lambda: calls.append(1) or rebuild())
+    # Catch up with generations bumped before the test, so that only bumps of other workers trigger rebuilds
+    TEST_SEARCH_INDEX.generation.next_check = 0
+    TEST_SEARCH_INDEX.generation.changed()
+    TEST_SEARCH_INDEX.rebuild()
+    return calls
+
+
+@pytest.mark.docker_required
+def test_search_matches_name_substring_and_facets(argus_db, fake_test, group, release):
+    query = fake_test.name[len("test_"):]
+
+    assert found_ids(query) == {fake_test.id}
+    assert found_ids(query.upper()) == {fake_test.id}
+    assert found_ids(f"type:test {query}") == {fake_test.id}
+    assert found_ids(f"type:group {query}") == set()
+    assert found_ids(f"release:{release.name} {query}") == {fake_test.id}
+    assert found_ids(f"group:{group.name[:6]}{query}") == set()
+    assert fake_test.id in found_ids("", release_id=str(release.id))
+    assert release.id not in found_ids("", release_id=str(release.id))
+
+
+@pytest.mark.docker_required
+def test_release_manager_changes_update_index_in_place(argus_db, rebuilds, release_manager_service, group, release):
+    name = f"indexed_{time.time_ns()}"
+    test = release_manager_service.create_test(name, name, name, name, group_id=str(group.id),
+                                               release_id=str(release.id), plugin_name="scylla-cluster-tests")
+    assert found_ids(name) == {test.id}
+
+    release_manager_service.toggle_test_enabled(test.id, False)
+    assert found_ids(name) == set()
+
+    release_manager_service.toggle_test_enabled(test.id, True)
+    release_manager_service.delete_test(str(test.id))
+    assert found_ids(name) == set()
+    assert len(rebuilds) == 1
+
+
+@pytest.mark.docker_required
+def test_releases_created_through_api_are_indexed_in_place(argus_db, rebuilds):
+    name = f"api_indexed_{time.time_ns()}"
+
+    ArgusService().create_release({name: {"groups": {f"{name}_group": {"tests": [f"{name}_test"]}}}})
+
+    assert {entity["name"] for entity in TestLookup.test_lookup(name)[1:]} == {
+        name, f"{name}_group", f"{name}_test"}
+    assert len(rebuilds) == 1
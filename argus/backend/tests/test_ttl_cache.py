@@ -0,0 +1,162 @@
+"""
+Tests for the shared in-process TTL/LRU cache and the runs details cache of ResultsService.
+
+Covers:
+- expiry, LRU eviction, invalidation and hit/miss accounting of TTLCache
+- ResultsService runs details shared across instances and invalidated on status changes
+- cross-worker invalidation of the test results caches through per-test generations
+"""
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+
+import pytest
+
+from argus.backend.service.results_service import ResultsService
+from argus.backend.tests.conftest import get_fake_test_run
+from argus.backend.util.cache import (
+    CACHE_HITS,
+    CACHE_MISSES,
+    RUNS_DETAILS_CACHE,
+    TEST_RESULTS_CACHE_GENERATION_KEY,
+    TEST_RESULTS_CACHE_GENERATIONS,
+    CacheGeneration,
+    TTLCache,
+)
+from argus.common.enums import TestInvestigationStatus
+
+
+def counter_value(counter, name: str) -> float:
+    return counter.labels(cache=name)._value.get()
+
+
+def test_cache_returns_stored_value(argus_db):
+    cache = TTLCache(name=f"test_{uuid.uuid4().hex}")
+    cache.set("key", 1)
+
+    assert cache.get("key") == 1
+    assert counter_value(CACHE_HITS, cache.name) == 1
+
+
+def test_cache_expires_entries(argus_db):
+    cache = TTLCache(name=f"test_{uuid.uuid4().hex}", ttl=-1)
+    cache.set("key", 1)
+
+    assert cache.get("key") is None
+    assert len(cache) == 0
+    assert counter_value(CACHE_MISSES, cache.name) == 1
+
+
+def test_cache_entry_ttl_overrides_default(argus_db):
+    cache = TTLCache(name=f"test_{uuid.uuid4().hex}")
+    cache.set("expired", 1, ttl=-1)
+    cache.set("kept", 2, ttl=60)
+
+    assert cache.get("expired") is None
+    assert cache.get("kept") == 2
+
+
+def test_cache_evicts_least_recently_used(argus_db):
+    cache = TTLCache(name=f"test_{uuid.uuid4().hex}", maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_cache_get_or_load_loads_once(argus_db):
+    cache = TTLCache(name=f"test_{uuid.uuid4().hex}")
+    loads = []
+
+    for _ in range(3):
+        assert cache.get_or_load("key", lambda: loads.append(1) or "value") == "value"
+
+    assert len(loads) == 1
+
+
+def test_cache_skips_value_loaded_across_invalidation(argus_db):
+    cache = TTLCache(name=f"test_{uuid.uuid4().hex}")
+
+    def loader():
+        cache.invalidate("key")
+        return "stale"
+
+    assert cache.get_or_load("key", loader) == "stale"
+    assert cache.get("key") is None
+
+
+def test_cache_get_or_load_many_loads_only_missing_keys(argus_db):
+    cache = TTLCache(name=f"test_{uuid.uuid4().hex}")
+    cache.set("a", 1)
+    requested = []
+
+    def loader(keys):
+        requested.extend(keys)
+        return {key: key.upper() for key in keys}
+
+    assert cache.get_or_load_many(["a", "b", "c"], loader) == {"a": 1, "b": "B", "c": "C"}
+    assert requested == ["b", "c"]
+    assert cache.get("c") == "C"
+
+
+@pytest.mark.docker_required
+def test_cache_generation_keeps_unseen_bumps_of_other_workers(argus_db):
+    key = f"test_generation_{uuid.uuid4().hex}"
+    worker_a = CacheGeneration(key, check_interval=0)
+    worker_b = CacheGeneration(key, check_interval=0)
+    worker_a.changed()
+    worker_b.changed()
+
+    worker_a.bump()
+    worker_b.bump()
+
+    assert worker_b.changed()
+    assert worker_a.changed()
+    assert not worker_a.changed()
+
+
+@pytest.mark.docker_required
+def test_cache_generation_keeps_concurrent_bumps(argus_db):
+    key = f"test_generation_{uuid.uuid4().hex}"
+    workers = [CacheGeneration(key, check_interval=0) for _ in range(8)]
+    for worker in workers:
+        worker.changed()
+
+    with ThreadPoolExecutor(max_workers=len(workers)) as executor:
+        list(executor.map(lambda worker: worker.bump(), workers))
+
+    assert workers[0]._read() == len(workers)
+    assert all([worker.changed() for worker in workers])
+
+
+@pytest.mark.docker_required
+def test_runs_details_are_invalidated_on_investigation_status_change(argus_db, fake_test, client_service, testrun_service):
+    run_type, run_req = get_fake_test_run(fake_test)
+    client_service.submit_run(run_type, asdict(run_req))
+    run_id = uuid.UUID(run_req.run_id)
+
+    assert ResultsService()._get_runs_details(fake_test.id).ignored == []
+    assert RUNS_DETAILS_CACHE.get(fake_test.id) is not None
+
+    testrun_service.change_run_investigation_status(fake_test.id, run_id, TestInvestigationStatus.IGNORED)
+
+    assert RUNS_DETAILS_CACHE.get(fake_test.id) is None
+    assert ResultsService()._get_runs_details(fake_test.id).ignored == [run_id]
+
+
+@pytest.mark.docker_required
+def test_runs_details_are_invalidated_by_other_workers(argus_db, fake_test):
+    ResultsService()._get_runs_details(fake_test.id)
+    assert RUNS_DETAILS_CACHE.get(fake_test.id) is not None
+
+    # Another worker invalidating the test results bumps the generation of the test
+    CacheGeneration(f"{TEST_RESULTS_CACHE_GENERATION_KEY}_{fake_test.id}").bump()
+    TEST_RESULTS_CACHE_GENERATIONS.get(fake_test.id).next_check = 0
+    misses = counter_value(CACHE_MISSES, RUNS_DETAILS_CACHE.name)
+    ResultsService()._get_runs_details(fake_test.id)
+
+    assert counter_value(CACHE_MISSES, RUNS_DETAILS_CACHE.name) == misses + 1
@@ -0,0 +1,94 @@
+import io
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+import pytest
+from botocore.exceptions import ClientError
+from flask import current_app
+
+from argus.backend.service.testrun import TestRunService, TestRunServiceException
+from argus.backend.util.cache import ARTIFACT_SIZE_CACHE, S3_OBJECT_MIME_CACHE, S3_PRESIGNED_URL_CACHE
+
+PNG_HEADER = b"\x89PNG\r\n\x1a\n" + b"\x00" * 64
+
+
+@pytest.fixture
+def service(argus_db):
+    S3_PRESIGNED_URL_CACHE.clear()
+    S3_OBJECT_MIME_CACHE.clear()
+    ARTIFACT_SIZE_CACHE.clear()
+    service = TestRunService()
+    service.s3 = MagicMock()
+    service.s3.generate_presigned_url.side_effect = lambda **kwargs: f"https://signed/{uuid4()}"
+    service.s3.get_object.side_effect = lambda **kwargs: {"Body": io.BytesIO(PNG_HEADER)}
+    service.s3.head_object.return_value = {"ContentLength": 1024}
+    return service
+
+
+def test_presigned_url_is_reused_until_close_to_expiry(service):
+    first = service._presigned_url("bucket", "key.log", expires_in=3600)
+
+    assert service._presigned_url("bucket", "key.log", expires_in=3600) == first
+    assert service._presigned_url("bucket", "other.log", expires_in=3600) != first
+    assert service.s3.generate_presigned_url.call_count == 2
+
+
+def test_proxy_s3_file_sniffs_mime_once(monkeypatch, service):
+    monkeypatch.setitem(current_app.config, "S3_ALLOWED_BUCKETS", ["bucket"])
+    monkeypatch.setitem(current_app.config, "S3_ALLOWED_MIME", ["image/png"])
+
+    urls = {service.proxy_s3_file("bucket", "screenshot.png") for _ in range(3)}
+
+    assert len(urls) == 1
+    service.s3.get_object.assert_called_once_with(Bucket="bucket", Key="screenshot.png", Range="bytes=0-1023")
+
+
+def test_proxy_s3_file_rejects_cached_mime_that_is_not_allowed(monkeypatch, service):
+    monkeypatch.setitem(current_app.config, "S3_ALLOWED_BUCKETS", ["bucket"])
+    monkeypatch.setitem(current_app.config, "S3_ALLOWED_MIME", ["text/plain"])
+
+    for _ in range(2):
+        with pytest.raises(TestRunServiceException):
+            service.proxy_s3_file("bucket", "screenshot.png")
+
+    assert service.s3.get_object.call_count == 1
+    assert not service.s3.generate_presigned_url.called
+
+
+def test_resolve_artifact_size_uses_head_object_and_caches(service):
+    link = "https://bucket.s3.amazonaws.com/run/sct.log.tar.zst"
+
+    assert service.resolve_artifact_size(link) == 1024
+    assert service.resolve_artifact_size(link) == 1024
+
+    service.s3.head_object.assert_called_once_with(Bucket="bucket", Key="run/sct.log.tar.zst")
+    assert not service.s3.get_object.called
+
+
+def test_resolve_artifact_size_reports_missing_object(service):
+    service.s3.head_object.side_effect = ClientError({"Error": {"Code": "404"}}, "HeadObject")
+
+    with pytest.raises(TestRunServiceException, match="not found"):
+        service.resolve_artifact_size("https://bucket.s3.amazonaws.com/missing.log")
+
+
+def test_resolve_run_artifact_sizes_resolves_all_logs(monkeypatch, service):
+    run = SimpleNamespace(logs=[
+        ["sct", "https://bucket.s3.amazonaws.com/run/sct.log"],
+        ["db-cluster", "https://bucket.s3.amazonaws.com/run/db-cluster.log"],
+        ["missing", "https://bucket.s3.amazonaws.com/run/missing.log"],
+    ])
+    monkeypatch.setattr(service, "get_plugin",
+                        lambda plugin_name: SimpleNamespace(model=SimpleNamespace(get=lambda id: run)))
+
+    def head_object(Bucket, Key):
+        if Key.endswith("missing.log"):
+            raise ClientError({"Error": {"Code": "404"}}, "HeadObject")
+        return {"ContentLength": len(Key)}
+
+    service.s3.head_object.side_effect = head_object
+
+    sizes = service.resolve_run_artifact_sizes("scylla-cluster-tests", uuid4())
+
+    assert sizes == {"sct": len("run/sct.log"), "db-cluster": len("run/db-cluster.log"), "missing": None}
@@ -0,0 +1,48 @@
+from dataclasses import asdict
+from uuid import uuid4
+
+import pytest
+
+from argus.backend.models.web import ArgusRunLocation
+from argus.backend.plugins.loader import find_run
+from argus.backend.plugins.locator import RUN_LOCATOR
+from argus.backend.plugins.sct.testrun import SCTTestRun
+from argus.backend.service.client_service import ClientService
+from argus.backend.tests.conftest import get_fake_test_run
+from argus.backend.util.cache import RUN_LOCATION_CACHE
+
+
+@pytest.fixture
+def run(client_service: ClientService, fake_test) -> SCTTestRun:
+    run_type, run_req = get_fake_test_run(fake_test)
+    client_service.submit_run(run_type, asdict(run_req))
+    return SCTTestRun.get(id=run_req.run_id)
+
+
+@pytest.mark.docker_required
+def test_submitted_run_is_located_by_primary_key(client_service: ClientService, run: SCTTestRun):
+    location = ArgusRunLocation.get(run_id=run.id)
+    assert (location.plugin_name, location.build_id) == ("scylla-cluster-tests", run.build_id)
+
+    assert SCTTestRun.get_by_id(str(run.id)).id == run.id
+    assert find_run(run.id).id == run.id
+    assert client_service.get_run_info(str(run.id))["plugin_name"] == "scylla-cluster-tests"
+
+
+@pytest.mark.docker_required
+def test_unrecorded_run_is_found_on_id_index_and_recorded(run: SCTTestRun):
+    ArgusRunLocation.filter(run_id=run.id).delete()
+    RUN_LOCATION_CACHE.clear()
+
+    assert find_run(run.id).id == run.id
+    assert ArgusRunLocation.get(run_id=run.id).build_id == run.build_id
+
+
+@pytest.mark.docker_required
+def test_missing_run_is_not_located(argus_db):
+    run_id = uuid4()
+
+    assert find_run(run_id) is None
+    assert RUN_LOCATOR.locate(run_id, {}) is None
+    with pytest.raises(SCTTestRun.DoesNotExist):
+        SCTTestRun.get_by_id(run_id)
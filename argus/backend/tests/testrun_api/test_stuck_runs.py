@@ -0,0 +1,58 @@
+from dataclasses import asdict
+from time import time
+
+import pytest
+
+from argus.backend.models.web import ArgusEvent, ArgusEventTypes
+from argus.backend.plugins.sct.testrun import SCTTestRun
+from argus.backend.service.client_service import ClientService
+from argus.backend.service.testrun import TestRunService
+from argus.backend.tests.conftest import get_fake_test_run
+from argus.backend.util.background import CLIENT_SIDE_EFFECTS
+from argus.common.enums import TestStatus
+
+
+@pytest.fixture
+def run(client_service: ClientService, fake_test) -> SCTTestRun:
+    run_type, run_req = get_fake_test_run(fake_test)
+    client_service.submit_run(run_type, asdict(run_req))
+    return SCTTestRun.get(id=run_req.run_id)
+
+
+def active_run_ids() -> set:
+    return {row.run_id for row in SCTTestRun.get_active_runs()}
+
+
+@pytest.mark.docker_required
+def test_run_leaves_active_runs_on_terminal_status(client_service: ClientService, run: SCTTestRun):
+    assert run.id in active_run_ids()
+
+    client_service.update_run_status("scylla-cluster-tests", str(run.id), TestStatus.RUNNING.value)
+    client_service.heartbeat("scylla-cluster-tests", str(run.id))
+    CLIENT_SIDE_EFFECTS.join()
+    assert [row.status for row in SCTTestRun.get_active_runs() if row.run_id == run.id] == [TestStatus.RUNNING.value]
+
+    client_service.update_run_status("scylla-cluster-tests", str(run.id), TestStatus.PASSED.value)
+    CLIENT_SIDE_EFFECTS.join()
+    assert run.id not in active_run_ids()
+
+
+@pytest.mark.docker_required
+def test_terminate_stuck_runs_aborts_runs_without_heartbeat(testrun_service: TestRunService,
+                                                            client_service: ClientService, run: SCTTestRun, fake_test):
+    run_type, run_req = get_fake_test_run(fake_test)
+    client_service.submit_run(run_type, asdict(run_req))
+    previous_heartbeat = run.heartbeat
+    run.heartbeat = int(time()) - 3600
+    run.save()
+    run.index_active_run(previous_heartbeat=previous_heartbeat)
+    stale_run_ids = {row.run_id for row in SCTTestRun.get_active_runs(heartbeat_before=int(time()) - 2700)}
+    assert run.id in stale_run_ids
+    assert run_req.run_id not in {str(run_id) for run_id in stale_run_ids}
+
+    assert testrun_service.terminate_stuck_runs() >= 1
+
+    assert SCTTestRun.get(id=run.id).status == TestStatus.ABORTED.value
+    assert SCTTestRun.get(id=run_req.run_id).status == TestStatus.CREATED.value
+    assert run.id not in active_run_ids()
+    assert ArgusEvent.filter(run_id=run.id).all()[0].kind == ArgusEventTypes.TestRunStatusChanged.value
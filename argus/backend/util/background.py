@@ -0,0 +1,61 @@
+import logging
+import queue
+import threading
+from typing import Callable, Hashable
+
+LOGGER = logging.getLogger(__name__)
+
+
+class BackgroundTasks:
+    """
+        Per-worker queue running side effects of client requests outside of the request
+        thread. A task submitted while another one with the same key is still waiting
+        is dropped, so bursts of updates to the same entity run the side effect once.
+        The worker thread is started lazily, after uWSGI forked the worker process.
+    """
+
+    def __init__(self, name: str, maxsize: int = 10000):
+        self.name = name
+        self._queue: queue.Queue[tuple[Hashable, Callable, tuple]] = queue.Queue(maxsize=maxsize)
+        self._pending: set[Hashable] = set()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    def submit(self, key: Hashable, task: Callable, *args) -> None:
+        with self._lock:
+            if key in self._pending:
+                return
+            self._pending.add(key)
+            if not self._thread or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+        try:
+            self._queue.put_nowait((key, task, args))
+        except queue.Full:
+            LOGGER.warning("%s queue is full, running %s inline", self.name, key)
+            with self._lock:
+                self._pending.discard(key)
+            self._execute(key, task, args)
+
+    def _execute(self, key: Hashable, task: Callable, args: tuple) -> None:
+        try:
+            task(*args)
+        except Exception:
+            LOGGER.warning("Background task %s failed", key, exc_info=True)
+
+    def _run(self) -> None:
+        while True:
+            key, task, args = self._queue.get()
+            # Released before running, so changes made while the task runs queue another pass
+            with self._lock:
+                self._pending.discard(key)
+            self._execute(key, task, args)
+            self._queue.task_done()
+
+    def join(self) -> None:
+        """Wait until every submitted task ran"""
+        self._queue.join()
+
+
+# Side effects of run heartbeats and status updates: active runs index and materialized test statuses
+CLIENT_SIDE_EFFECTS = BackgroundTasks(name="client_side_effects")
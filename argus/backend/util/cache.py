@@ -0,0 +1,235 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, TypeVar
+from uuid import UUID
+
+from cassandra.cqlengine.query import LWTException
+from prometheus_client import Counter
+
+from argus.backend.models.runtime_store import RuntimeStore
+
+LOGGER = logging.getLogger(__name__)
+T = TypeVar("T")
+
+CACHE_HITS = Counter("argus_cache_hits_total", "Lookups served from an in-process cache", ["cache"])
+CACHE_MISSES = Counter("argus_cache_misses_total", "Lookups that had to load the value", ["cache"])
+
+
+class TTLCache(Generic[T]):
+    """
+        Thread-safe in-process LRU cache with per-entry expiry, shared by
+        every service instance in the worker. Hits and misses are exported
+        as prometheus counters labeled with the cache name.
+    """
+
+    def __init__(self, name: str, maxsize: int = 1024, ttl: float = 300):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[Hashable, tuple[float, T]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._invalidations = 0
+        self._hits = CACHE_HITS.labels(cache=name)
+        self._misses = CACHE_MISSES.labels(cache=name)
+
+    def get(self, key: Hashable) -> T | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self._hits.inc()
+                return entry[1]
+            if entry:
+                del self._entries[key]
+        self._misses.inc()
+        return None
+
+    def set(self, key: Hashable, value: T, ttl: float | None = None) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], T]) -> T:
+        value = self.get(key)
+        if value is None:
+            invalidations = self._invalidations
+            value = loader()
+            # Don't store a value that may have been loaded before a concurrent invalidation
+            if invalidations == self._invalidations:
+                self.set(key, value)
+        return value
+
+    def get_or_load_many(self, keys: list[Hashable],
+                         loader: Callable[[list[Hashable]], dict[Hashable, T]]) -> dict[Hashable, T]:
+        """Look up all keys, loading every missing one with a single loader call"""
+        values = {key: self.get(key) for key in keys}
+        missing = [key for key, value in values.items() if value is None]
+        if missing:
+            invalidations = self._invalidations
+            loaded = loader(missing)
+            if invalidations == self._invalidations:
+                for key, value in loaded.items():
+                    self.set(key, value)
+            values.update(loaded)
+        return values
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._invalidations += 1
+            self._entries.pop(key, None)
+
+    def invalidate_matching(self, predicate: Callable[[Hashable], bool]) -> None:
+        with self._lock:
+            self._invalidations += 1
+            for key in [key for key in self._entries if predicate(key)]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._invalidations += 1
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class CacheGeneration:
+    """
+        Cross-worker invalidation signal for in-process caches. Writers bump a
+        generation counter stored in RuntimeStore under `key` and every worker
+        compares it with the generation it has seen, reading it at most every
+        `check_interval` seconds.
+    """
+
+    def __init__(self, key: str, check_interval: float = 5):
+        self.key = key
+        self.check_interval = check_interval
+        self.generation = None
+        self.next_check = 0.0
+        self._lock = threading.Lock()
+
+    def _read(self) -> int:
+        try:
+            return RuntimeStore.get(key=self.key).value
+        except RuntimeStore.DoesNotExist:
+            return 0
+
+    def changed(self) -> bool:
+        """Whether another worker bumped the generation since the last call that returned True"""
+        if time.monotonic() < self.next_check:
+            return False
+        with self._lock:
+            if time.monotonic() < self.next_check:
+                return False
+            generation = self._read()
+            self.next_check = time.monotonic() + self.check_interval
+            if generation == self.generation:
+                return False
+            self.generation = generation
+            return True
+
+    def bump(self) -> None:
+        """
+            Signal other workers, the caller is expected to have updated its own cache already.
+            The increment is a conditional update retried on conflict, so concurrent bumps
+            are never merged into one.
+        """
+        while True:
+            try:
+                previous = RuntimeStore.get(key=self.key).value
+            except RuntimeStore.DoesNotExist:
+                previous = None
+            generation = ((previous or 0) + 1) % 2**31
+            try:
+                if previous is None:
+                    RuntimeStore.if_not_exists().create(key=self.key, value_type="int", value_int=generation)
+                else:
+                    RuntimeStore.objects(key=self.key).iff(value_int=previous).update(value_int=generation)
+                break
+            except LWTException:
+                continue
+        with self._lock:
+            # Only skip our own bump, a bump by another worker this one hasn't seen yet must still show up in changed()
+            if self.generation == (previous or 0):
+                self.generation = generation
+
+
+# Generation of TestSearchIndex, bumped whenever a release, group or test is written
+TEST_SEARCH_INDEX_GENERATION_KEY = "test_search_index_generation"
+
+# Runs details (ignored runs and packages) keyed by test_id, used by ResultsService graphs
+# and best results. Invalidated on package submission and investigation status changes.
+RUNS_DETAILS_CACHE: TTLCache = TTLCache(name="runs_details", maxsize=2048, ttl=600)
+
+# Aggregated result graphs per (test_id, table_name, period, start_date, end_date), built by ResultsService.get_test_graphs
+GRAPH_AGGREGATES_CACHE: TTLCache = TTLCache(name="graph_aggregates", maxsize=256, ttl=900)
+
+# Result tables metadata keyed by test_id, read by ResultsService for run results and graphs
+TABLES_METADATA_CACHE: TTLCache = TTLCache(name="tables_metadata", maxsize=2048, ttl=600)
+
+# Per-test slices of the version -> test -> test method matrix keyed by (test_id, sut_package_name),
+# built by ResultsService.get_tests_by_version
+VERSION_MATRIX_CACHE: TTLCache = TTLCache(name="version_matrix", maxsize=4096, ttl=600)
+
+# Users keyed by api token, resolved by load_logged_in_user for every API request. Unknown tokens are
+# cached too. Invalidated when a token is regenerated or its user is deleted or changes roles.
+API_TOKEN_CACHE: TTLCache = TTLCache(name="api_token_users", maxsize=4096, ttl=60)
+
+# Presigned S3 download urls keyed by (bucket, key, expires_in). Entries expire well before the url,
+# see TestRunService._presigned_url
+S3_PRESIGNED_URL_CACHE: TTLCache = TTLCache(name="s3_presigned_urls", maxsize=8192, ttl=300)
+
+# MIME types sniffed from the first bytes of S3 objects keyed by (bucket, key), used by TestRunService.proxy_s3_file
+S3_OBJECT_MIME_CACHE: TTLCache = TTLCache(name="s3_object_mime", maxsize=8192, ttl=3600)
+
+# Sizes of run artifacts keyed by link, resolved by TestRunService.resolve_artifact_size
+ARTIFACT_SIZE_CACHE: TTLCache = TTLCache(name="artifact_sizes", maxsize=8192, ttl=3600)
+
+# RunLocation (plugin_name, build_id, start_time) of runs keyed by run_id, see RunLocator.
+# A run never changes its primary key.
+RUN_LOCATION_CACHE: TTLCache = TTLCache(name="run_locations", maxsize=65536, ttl=3600)
+
+# CacheGeneration of the results caches of each test keyed by test_id, see invalidate_test_results_caches
+TEST_RESULTS_CACHE_GENERATIONS: TTLCache = TTLCache(name="test_results_cache_generations", maxsize=4096, ttl=3600)
+TEST_RESULTS_CACHE_GENERATION_KEY = "test_results_cache_generation"
+
+# Heartbeat bucket of ArgusActiveRun the run was last moved to by this worker, keyed by (plugin_name, run_id)
+HEARTBEAT_BUCKET_CACHE: TTLCache = TTLCache(name="heartbeat_buckets", maxsize=65536, ttl=3600)
+
+
+def _test_results_cache_generation(test_id: UUID) -> CacheGeneration:
+    return TEST_RESULTS_CACHE_GENERATIONS.get_or_load(
+        test_id, lambda: CacheGeneration(f"{TEST_RESULTS_CACHE_GENERATION_KEY}_{test_id}"))
+
+
+def _drop_test_results_caches(test_id: UUID) -> None:
+    RUNS_DETAILS_CACHE.invalidate(test_id)
+    TABLES_METADATA_CACHE.invalidate(test_id)
+    VERSION_MATRIX_CACHE.invalidate_matching(lambda key: key[0] == test_id)
+    GRAPH_AGGREGATES_CACHE.invalidate_matching(lambda key: key[0] == test_id)
+
+
+def sync_test_results_caches(test_id: UUID) -> None:
+    """Drops results of the test cached by this worker if another worker invalidated them"""
+    if _test_results_cache_generation(test_id).changed():
+        _drop_test_results_caches(test_id)
+
+
+def invalidate_test_results_caches(test_id: UUID) -> None:
+    """
+        Drops cached results of the test in this worker and bumps its generation, so other
+        workers drop theirs on the next sync_test_results_caches. Generations are kept per test,
+        frequent result submissions of one test don't flush the caches of the others.
+    """
+    _drop_test_results_caches(test_id)
+    _test_results_cache_generation(test_id).bump()
+
+
+def invalidate_version_matrix(test_id: UUID) -> None:
+    """Called when a run of the test is submitted or changes status, other workers drop their slices on sync"""
+    VERSION_MATRIX_CACHE.invalidate_matching(lambda key: key[0] == test_id)
+    _test_results_cache_generation(test_id).bump()
@@ -1,4 +1,6 @@
 import base64
+import logging
+import threading
 from typing import Any
 from uuid import UUID
 from dataclasses import asdict
@@ -9,6 +11,8 @@ from argus.client.base import ArgusClient
 from argus.client.sct.types import EventsInfo, LogLink, Package
 from argus.common.utils import clamp_ts_to_milliseconds
 
+LOGGER = logging.getLogger(__name__)
+
 
 class ArgusSCTClient(ArgusClient):
     test_type = "scylla-cluster-tests"
@@ -37,10 +41,23 @@ class ArgusSCTClient(ArgusClient):
         SUBMIT_CONFIG = "/$id/config/submit"
 
     def __init__(self, run_id: UUID, auth_token: str, base_url: str, api_version="v1", extra_headers: dict | None = None,
-                 timeout: int = 60, max_retries: int = 3, use_tunnel: bool | None = None) -> None:
+                 timeout: int = 60, max_retries: int = 3, use_tunnel: bool | None = None,
+                 event_batch_size: int = 0, event_flush_interval: float = 5.0, event_buffer_limit: int = 10000) -> None:
+        """
+            event_batch_size: buffer events passed to submit_event and send them together once this many
+                are buffered or event_flush_interval seconds passed since the oldest one. 0 sends every event
+                right away.
+            event_buffer_limit: most events kept buffered while sending fails, the oldest ones are dropped first.
+        """
         super().__init__(auth_token, base_url, api_version, extra_headers=extra_headers,
                          timeout=timeout, max_retries=max_retries, use_tunnel=use_tunnel)
         self.run_id = run_id
+        self.event_batch_size = event_batch_size
+        self.event_flush_interval = event_flush_interval
+        self.event_buffer_limit = event_buffer_limit
+        self._event_buffer: list[RawEventPayload] = []
+        self._event_lock = threading.Lock()
+        self._event_flush_timer: threading.Timer | None = None
 
     def submit_sct_run(self, job_name: str, job_url: str, started_by: str, commit_id: str,
                        origin_url: str, branch_name: str, sct_config: dict) -> None:
@@ -117,6 +134,65 @@ class ArgusSCTClient(ArgusClient):
         self.check_response(response)
 
     def submit_event(self, event_data: RawEventPayload | list[RawEventPayload]):
+        """
+            Submits an event or a list of events. With event buffering enabled (event_batch_size),
+            events are queued and sent in batches, see flush_events.
+        """
+        if not self.event_batch_size:
+            self._send_events(event_data)
+            return
+
+        events = event_data if isinstance(event_data, list) else [event_data]
+        with self._event_lock:
+            self._event_buffer.extend(events)
+            self._trim_event_buffer()
+            flush = len(self._event_buffer) >= self.event_batch_size
+            if not flush:
+                self._schedule_flush()
+        if flush:
+            self.flush_events()
+
+    def flush_events(self) -> None:
+        """
+            Sends all buffered events in one request. If the request fails, the events are put
+            back in front of the buffer to be retried on the next flush and the error is raised.
+        """
+        with self._event_lock:
+            events, self._event_buffer = self._event_buffer, []
+            if self._event_flush_timer:
+                self._event_flush_timer.cancel()
+                self._event_flush_timer = None
+        if not events:
+            return
+        try:
+            self._send_events(events)
+        except Exception:
+            with self._event_lock:
+                self._event_buffer[:0] = events
+                self._trim_event_buffer()
+                self._schedule_flush()
+            raise
+
+    def _trim_event_buffer(self) -> None:
+        """Drops the oldest events over event_buffer_limit, must be called with _event_lock held"""
+        if (overflow := len(self._event_buffer) - self.event_buffer_limit) > 0:
+            LOGGER.warning("Event buffer is full, dropping %s oldest events", overflow)
+            del self._event_buffer[:overflow]
+
+    def _schedule_flush(self) -> None:
+        """Starts the flush timer unless one is pending, must be called with _event_lock held"""
+        if not self._event_flush_timer:
+            self._event_flush_timer = threading.Timer(self.event_flush_interval, self._flush_events_on_timer)
+            self._event_flush_timer.daemon = True
+            self._event_flush_timer.start()
+
+    def _flush_events_on_timer(self) -> None:
+        try:
+            self.flush_events()
+        except Exception:  # noqa: BLE001
+            LOGGER.error("Failed to submit buffered events, retrying in %ss", self.event_flush_interval, exc_info=True)
+
+    def _send_events(self, event_data: RawEventPayload | list[RawEventPayload]) -> None:
         response = self.post(
             endpoint=self.Routes.SUBMIT_EVENT,
             location_params={"id": str(self.run_id)},
@@ -126,6 +202,12 @@ class ArgusSCTClient(ArgusClient):
             }
         )
         self.check_response(response)
+        if isinstance(event_data, list):
+            results = response.json().get("response")
+            rejected = [(event, result) for event, result in zip(event_data, results or [])
+                        if isinstance(result, dict) and result.get("status") != "ok"]
+            for event, result in rejected:
+                LOGGER.warning("Event %s was not submitted: %s", event.get("event_type"), result.get("message"))
 
     def submit_sct_logs(self, logs: list[LogLink]) -> None:
         """
@@ -139,8 +221,11 @@ class ArgusSCTClient(ArgusClient):
             Marks run as finished inside argus. Currently this only sets end time of the run,
             run status must be updated separately by .set_sct_run_status
         """
-        response = super().finalize_run(run_type=self.test_type, run_id=self.run_id)
-        self.check_response(response)
+        try:
+            self.flush_events()
+        finally:
+            response = super().finalize_run(run_type=self.test_type, run_id=self.run_id)
+            self.check_response(response)
 
     def submit_packages(self, packages: list[Package]):
         """
@@ -0,0 +1,98 @@
+"""Tests for client side buffering of SCT events."""
+import threading
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+
+from argus.client.sct.client import ArgusSCTClient
+
+
+def make_event(idx: int) -> dict:
+    return {"run_id": "run", "severity": "NORMAL", "ts": float(idx), "message": f"event {idx}", "event_type": "Info"}
+
+
+def make_client(**kwargs) -> ArgusSCTClient:
+    return ArgusSCTClient(run_id=uuid4(), auth_token="test_token", base_url="https://test.example.com",
+                          use_tunnel=False, **kwargs)
+
+
+def test_events_are_sent_right_away_without_buffering():
+    client = make_client()
+    with patch.object(client, "_send_events") as send:
+        client.submit_event(make_event(0))
+
+    send.assert_called_once_with(make_event(0))
+
+
+def test_buffered_events_are_sent_once_batch_is_full():
+    client = make_client(event_batch_size=3, event_flush_interval=60)
+    with patch.object(client, "_send_events") as send:
+        client.submit_event(make_event(0))
+        client.submit_event([make_event(1)])
+        send.assert_not_called()
+        client.submit_event(make_event(2))
+
+    send.assert_called_once_with([make_event(0), make_event(1), make_event(2)])
+    assert client._event_flush_timer is None
+
+
+def test_buffered_events_are_sent_after_flush_interval():
+    client = make_client(event_batch_size=100, event_flush_interval=0.05)
+    sent = threading.Event()
+    with patch.object(client, "_send_events", side_effect=lambda events: sent.set()) as send:
+        client.submit_event(make_event(0))
+        assert sent.wait(timeout=5)
+
+    send.assert_called_once_with([make_event(0)])
+
+
+def test_finalize_flushes_buffered_events():
+    client = make_client(event_batch_size=100, event_flush_interval=60)
+    with patch.object(client, "_send_events") as send, \
+            patch("argus.client.base.ArgusClient.finalize_run") as finalize, \
+            patch.object(client, "check_response"):
+        client.submit_event(make_event(0))
+        client.finalize_sct_run()
+
+    send.assert_called_once_with([make_event(0)])
+    finalize.assert_called_once()
+
+
+def test_failed_flush_keeps_events_for_next_flush():
+    client = make_client(event_batch_size=100, event_flush_interval=60)
+    client.submit_event(make_event(0))
+    with patch.object(client, "_send_events", side_effect=ConnectionError("Argus is unavailable")):
+        with pytest.raises(ConnectionError):
+            client.flush_events()
+    client.submit_event(make_event(1))
+    with patch.object(client, "_send_events") as send:
+        client.flush_events()
+
+    send.assert_called_once_with([make_event(0), make_event(1)])
+    assert client._event_flush_timer is None
+
+
+def test_failed_flush_drops_oldest_events_over_buffer_limit():
+    client = make_client(event_batch_size=100, event_flush_interval=60, event_buffer_limit=3)
+    client.submit_event([make_event(idx) for idx in range(2)])
+    with patch.object(client, "_send_events", side_effect=ConnectionError("Argus is unavailable")):
+        with pytest.raises(ConnectionError):
+            client.flush_events()
+        client.submit_event([make_event(idx) for idx in range(2, 4)])
+
+    assert client._event_buffer == [make_event(idx) for idx in range(1, 4)]
+    client._event_flush_timer.cancel()
+
+
+def test_finalize_is_sent_when_flush_fails():
+    client = make_client(event_batch_size=100, event_flush_interval=60)
+    with patch.object(client, "_send_events", side_effect=ConnectionError("Argus is unavailable")), \
+            patch("argus.client.base.ArgusClient.finalize_run") as finalize, \
+            patch.object(client, "check_response"):
+        client.submit_event(make_event(0))
+        with pytest.raises(ConnectionError):
+            client.finalize_sct_run()
+
+    finalize.assert_called_once()
+    client._event_flush_timer.cancel()
@@ -0,0 +1,236 @@
+"""
+Event Embeddings Backfill
+
+Offline tool that (re-)embeds historical ERROR and CRITICAL SCT events, e.g. after a sanitizer
+or embedding model change, without going through the unprocessed events queue:
+1. Streams SCTEvent rows token range by token range, reading the next range while the current one is embedded
+2. Sanitizes and embeds event messages in large batches
+3. Finds duplicates of each run and severity with matrix operations
+4. Rewrites embedding table partitions, duplicate links and queue entries with concurrent writes
+5. Stores the next token range in RuntimeStore, so an interrupted backfill resumes where it stopped
+
+Usage:
+    PYTHONPATH=.. uv run backfill_embeddings.py [--ranges N] [--name NAME] [--restart]
+"""
+
+import argparse
+import logging
+import signal
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from threading import Event
+from uuid import UUID
+
+from argus.backend.models.argus_ai import SCTCriticalEventEmbedding, SCTErrorEventEmbedding
+from argus.backend.models.runtime_store import RuntimeStore
+from argus.backend.plugins.sct.testrun import SCTEvent, SCTUnprocessedEvent
+from argus.backend.util.logsetup import setup_application_logging
+from argusAI.event_similarity_processor_v2 import (
+    CONCURRENCY,
+    DUPLICATE_MAX_DISTANCE,
+    BgeSmallEnEmbeddingModel,
+    EventSimilarityProcessorV2,
+    embed_messages,
+)
+from argusAI.utils.event_message_sanitizer import MessageSanitizer
+from argusAI.utils.queue_shards import token_ranges
+from argusAI.utils.run_embedding_index import find_duplicates
+from argusAI.utils.scylla_connection import ScyllaConnection
+
+LOGGER = logging.getLogger(__name__)
+SEVERITIES = ("ERROR", "CRITICAL")
+TOKEN_RANGES = 4096  # Number of token ranges the events table is read in, one checkpoint per range
+EMBED_BATCH_SIZE = 512  # Messages embedded with one model call
+FETCH_SIZE = 1000  # Page size when streaming events of a token range
+
+RunKey = tuple[UUID, str]
+
+
+class EmbeddingBackfill:
+    """
+    Re-embeds all ERROR and CRITICAL events of the SCTEvent table.
+
+    Each token range is processed idempotently: embedding rows of the scanned runs are replaced, duplicate
+    links are rewritten where they changed and queue entries of the scanned events are removed, so a range
+    interrupted half way is simply processed again on resume.
+    """
+
+    def __init__(
+        self,
+        name: str = BgeSmallEnEmbeddingModel.MODEL_NAME,
+        ranges: int = TOKEN_RANGES,
+        batch_size: int = EMBED_BATCH_SIZE,
+        stop_event: Event | None = None,
+    ) -> None:
+        """
+        Args:
+            name: Name of the backfill, part of the checkpoint key; use a new name to backfill again from scratch
+            ranges: Number of token ranges the events table is split into
+            batch_size: Number of messages embedded with one model call
+            stop_event: Optional threading.Event to stop after the current token range
+        """
+        self.embedding_model = BgeSmallEnEmbeddingModel()
+        self.sanitizer = MessageSanitizer()
+        self.db = ScyllaConnection()
+        self.ranges = token_ranges(ranges)
+        self.batch_size = batch_size
+        self.stop_event = stop_event or Event()
+        self.checkpoint_key = f"argusai_backfill_{name}_{ranges}"
+        self.keyspace = (
+            SCTCriticalEventEmbedding.__keyspace__
+            or SCTErrorEventEmbedding.__keyspace__
+            or self.db.config["SCYLLA_KEYSPACE_NAME"]
+        )
+        self.processed_count = 0
+        self.duplicate_count = 0
+        self.error_count = 0
+
+    def load_checkpoint(self) -> int:
+        """Return the index of the first token range that was not backfilled yet."""
+        table_name = RuntimeStore.column_family_name(include_keyspace=False)
+        result = self.db.execute(f"SELECT value_int FROM {table_name} WHERE key = ?", (self.checkpoint_key,))
+        if result is None:
+            raise RuntimeError(f"Failed to read backfill checkpoint {self.checkpoint_key}")
+        row = result.one()
+        return row.value_int if row and row.value_int else 0
+
+    def save_checkpoint(self, next_range: int) -> None:
+        table_name = RuntimeStore.column_family_name(include_keyspace=False)
+        self.db.execute(
+            f"INSERT INTO {table_name} (key, value_type, value_int) VALUES (?, ?, ?)",
+            (self.checkpoint_key, RuntimeStore._type_map[int], next_range),
+        )
+
+    def run(self, restart: bool = False) -> None:
+        """Backfill all token ranges starting from the checkpoint, or from the first range when restarting."""
+        start = 0 if restart else self.load_checkpoint()
+        LOGGER.info(f"Backfilling embeddings of {len(self.ranges) - start}/{len(self.ranges)} token ranges "
+                    f"(checkpoint {self.checkpoint_key})")
+        with ThreadPoolExecutor(max_workers=1) as reader:
+            next_partitions = reader.submit(self._read_range, start) if start < len(self.ranges) else None
+            for idx in range(start, len(self.ranges)):
+                if self.stop_event.is_set():
+                    LOGGER.info(f"Backfill stopped, resume from token range {idx}")
+                    break
+                partitions = next_partitions.result()
+                if idx + 1 < len(self.ranges):
+                    next_partitions = reader.submit(self._read_range, idx + 1)
+                self._backfill_partitions(partitions)
+                self.save_checkpoint(idx + 1)
+                LOGGER.info(f"Token range {idx + 1}/{len(self.ranges)} done: {self.processed_count} events embedded, "
+                            f"{self.duplicate_count} duplicates, {self.error_count} errors")
+
+    def _read_range(self, idx: int) -> dict[RunKey, list]:
+        """Read events of the token range, grouped by run and severity in timestamp order."""
+        query = (
+            f"SELECT run_id, severity, ts, event_id, message, duplicate_id FROM {SCTEvent.__table_name__} "
+            f"WHERE token(run_id, severity) >= ? AND token(run_id, severity) <= ?"
+        )
+        rows = self.db.execute(query, self.ranges[idx], fetch_size=FETCH_SIZE)
+        if rows is None:
+            raise RuntimeError(f"Failed to read events of token range {idx}")
+        partitions: dict[RunKey, list] = {}
+        for row in rows:
+            if row.severity in SEVERITIES:
+                partitions.setdefault((row.run_id, row.severity), []).append(row)
+        return partitions
+
+    def _backfill_partitions(self, partitions: dict[RunKey, list]) -> None:
+        """Embed events of the runs, find their duplicates and write the results."""
+        pending: list[tuple[RunKey, object, str]] = []
+        for key, rows in partitions.items():
+            for row in rows:
+                if not row.message:
+                    continue
+                try:
+                    sanitized_message = self.sanitizer.sanitize(row.run_id, row.message)
+                except Exception as e:
+                    LOGGER.error(f"Failed to sanitize message for event (run_id={row.run_id}): {e}", exc_info=True)
+                    self.error_count += 1
+                    continue
+                if sanitized_message.strip():
+                    pending.append((key, row, sanitized_message))
+
+        embedded: dict[RunKey, list[tuple[object, list[float]]]] = {}
+        for start in range(0, len(pending), self.batch_size):
+            batch = pending[start:start + self.batch_size]
+            embeddings = embed_messages(self.embedding_model, [message for _, _, message in batch])
+            for (key, row, _), embedding in zip(batch, embeddings):
+                if isinstance(embedding, Exception):
+                    LOGGER.error(f"Failed to embed event (run_id={row.run_id}, severity={row.severity}, "
+                                 f"ts={row.ts}): {embedding}")
+                    self.error_count += 1
+                    continue
+                embedded.setdefault(key, []).append((row, embedding))
+
+        inserts: dict[str, list[tuple[UUID, datetime, list[float]]]] = {}
+        cleared: dict[str, list[tuple[UUID, datetime]]] = {}
+        links: list[tuple[UUID | None, UUID, str, datetime]] = []
+        for (run_id, severity), events in embedded.items():
+            table_name = EventSimilarityProcessorV2._embedding_table_name(severity)
+            last_ts = partitions[(run_id, severity)][-1].ts
+            cleared.setdefault(table_name, []).append((run_id, last_ts))
+            duplicates = find_duplicates([embedding for _, embedding in events], DUPLICATE_MAX_DISTANCE)
+            for (row, embedding), duplicate in zip(events, duplicates):
+                duplicate_id = events[duplicate][0].event_id if duplicate is not None else None
+                if duplicate_id is None:
+                    inserts.setdefault(table_name, []).append((run_id, row.ts, embedding))
+                else:
+                    self.duplicate_count += 1
+                if row.duplicate_id != duplicate_id:
+                    links.append((duplicate_id, run_id, severity, row.ts))
+            self.processed_count += len(events)
+
+        # Old embeddings of the runs are removed first, up to the last scanned event so that
+        # embeddings of events stored meanwhile by the processor are kept
+        for table_name, params in cleared.items():
+            self._write(f"DELETE FROM {self.keyspace}.{table_name} WHERE run_id = ? AND ts <= ?", params)
+        for table_name, params in inserts.items():
+            self._write(f"INSERT INTO {self.keyspace}.{table_name} (run_id, ts, embedding) VALUES (?, ?, ?)", params)
+        self._write(
+            f"UPDATE {SCTEvent.__table_name__} SET duplicate_id = ? WHERE run_id = ? AND severity = ? AND ts = ?", links
+        )
+        self._write(
+            f"DELETE FROM {SCTUnprocessedEvent.__table_name__} WHERE run_id = ? AND severity = ? AND ts <= ?",
+            [(run_id, severity, rows[-1].ts) for (run_id, severity), rows in partitions.items()],
+        )
+
+    def _write(self, query: str, params: list[tuple]) -> None:
+        """Execute the write concurrently for all params, raising if any of them failed."""
+        failures = [result for success, result in self.db.execute_concurrent(query, params, CONCURRENCY)
+                    if not success]
+        if failures:
+            LOGGER.error(f"{len(failures)}/{len(params)} writes failed: {query}. First error: {failures[0]}")
+            raise failures[0]
+
+    def shutdown(self) -> None:
+        self.stop_event.set()
+        self.sanitizer.close()
+        self.db.shutdown()
+
+
+def main():
+    """Entry point of the embeddings backfill."""
+    parser = argparse.ArgumentParser(description="Backfill embeddings of historical SCT events")
+    parser.add_argument("--name", default=BgeSmallEnEmbeddingModel.MODEL_NAME,
+                        help="Backfill name used in the checkpoint key, change it to backfill again from scratch")
+    parser.add_argument("--ranges", type=int, default=TOKEN_RANGES, help="Number of token ranges to split events in")
+    parser.add_argument("--batch-size", type=int, default=EMBED_BATCH_SIZE, help="Messages embedded per model call")
+    parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint and start from the first range")
+    args = parser.parse_args()
+
+    setup_application_logging(log_level=logging.INFO)
+    stop_event = Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop_event.set())
+    backfill = EmbeddingBackfill(name=args.name, ranges=args.ranges, batch_size=args.batch_size,
+                                 stop_event=stop_event)
+    try:
+        backfill.run(restart=args.restart)
+    except KeyboardInterrupt:
+        LOGGER.info("Received keyboard interrupt, shutting down...")
+    finally:
+        backfill.shutdown()
+
+
+if __name__ == "__main__":
+    main()
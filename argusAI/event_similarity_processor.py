@@ -250,9 +250,9 @@ class EventSimilarityProcessor:
                             continue
 
                         event_type: str = event.severity
-                        event_texts: List[str] = [
-                            self._sanitizer.sanitize(test_run.id, event_text) for event_text in event.last_events
-                        ]
+                        event_texts: List[str] = self._sanitizer.sanitize_batch(
+                            (test_run.id, event_text) for event_text in event.last_events
+                        )
 
                         if not event_texts:
                             continue
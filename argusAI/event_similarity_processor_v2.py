@@ -7,33 +7,56 @@ This module processes SCT events by:
 3. Generating embeddings using BGE-Small-EN model
 4. Storing embeddings in separate tables (sct_error_event_embedding or sct_critical_event_embedding)
 5. Removing processed events from unprocessed queue
+
+The queue can be split into token range shards consumed by several worker processes,
+each holding leases on its shards (see argusAI/utils/queue_shards.py).
 """
 
-from collections import namedtuple
 import logging
+import math
+import multiprocessing
+import os
+import signal
 import time
 from pathlib import Path
 from threading import Event
 from typing import Literal
 from uuid import UUID
-from datetime import datetime
+from datetime import datetime, UTC
 
 from chromadb.utils.embedding_functions.onnx_mini_lm_l6_v2 import ONNXMiniLM_L6_V2
-from chromadb.utils.distance_functions import cosine
-from numpy import array
+from prometheus_client import Counter, Gauge, start_http_server
 
 from argus.backend.models.argus_ai import SCTCriticalEventEmbedding, SCTErrorEventEmbedding
 from argus.backend.plugins.sct.testrun import SCTUnprocessedEvent, SCTEvent
 from argus.backend.util.logsetup import setup_application_logging
 from argusAI.utils.scylla_connection import ScyllaConnection
 from argusAI.utils.event_message_sanitizer import MessageSanitizer
+from argusAI.utils.queue_shards import ShardLeases
+from argusAI.utils.run_embedding_index import RunEmbeddingIndex
 
 LOGGER = logging.getLogger(__name__)
 SLEEP_INTERVAL = 1  # Sleep for 1 second between processing cycles
+CONCURRENCY = 50  # Max in-flight statements when fetching messages and writing results in batched mode
+DUPLICATE_MAX_DISTANCE = 0.05  # Events of the same run closer than this cosine distance are duplicates
+MAX_INDEXED_RUNS = 256  # Runs whose embeddings are kept in memory for duplicate detection
+WORKERS: int = int(os.getenv("ARGUS_AI_WORKERS", "1"))
+QUEUE_SHARDS: int = int(os.getenv("ARGUS_AI_QUEUE_SHARDS", "0"))  # 0 disables sharding when running a single worker
+SHARDS_PER_WORKER: int = int(os.getenv("ARGUS_AI_SHARDS_PER_WORKER", "0"))  # 0 spreads shards evenly over WORKERS
+METRICS_PORT: int = int(os.getenv("ARGUS_AI_METRICS_PORT", "0"))  # worker N serves metrics on METRICS_PORT + N
+# Optional sanitized messages audit log path, "{worker}" is replaced with the worker name
+SANITIZER_AUDIT_LOG: str = os.getenv("ARGUS_AI_SANITIZER_AUDIT_LOG", "")
+
+EVENTS_PROCESSED = Counter(
+    "argusai_events_processed_total", "SCT events embedded or marked as duplicates", ["worker"]
+)
+EVENT_ERRORS = Counter("argusai_event_errors_total", "SCT event processing errors", ["worker"])
+QUEUE_LAG = Gauge(
+    "argusai_event_queue_lag_seconds", "Age of the oldest event in the last batch fetched from the queue", ["worker"]
+)
+OWNED_SHARDS = Gauge("argusai_event_queue_owned_shards", "Queue shards leased by the worker", ["worker"])
 
-SimilarEvent = namedtuple("SimilarEvent", ["run_id", "ts", "embedding", "added_ts"])
 Severity = Literal["ERROR", "CRITICAL"]
-RunIdStr = str
 
 
 class BgeSmallEnEmbeddingModel(ONNXMiniLM_L6_V2):
@@ -53,26 +76,72 @@ class BgeSmallEnEmbeddingModel(ONNXMiniLM_L6_V2):
     _MODEL_SHA256: str = "e7d1743b0c08f55c687cff6af696683398682f9ab4fb3cad1be644ee5553a72d"
 
 
+def embed_messages(embedding_model: BgeSmallEnEmbeddingModel, messages: list[str]) -> list:
+    """
+    Embed messages with one model call, falling back to one call per message if the batch fails
+    so that a single bad message only fails its own event. Failed entries hold the exception.
+    """
+    if not messages:
+        return []
+    try:
+        embeddings = embedding_model(messages)
+        if embeddings is None or len(embeddings) != len(messages):
+            raise ValueError("Embedding generation returned unexpected number of results")
+        return list(embeddings)
+    except Exception as e:
+        LOGGER.warning(f"Batch embedding of {len(messages)} messages failed, embedding one by one: {e}",
+                       exc_info=True)
+
+    results = []
+    for message in messages:
+        try:
+            embeddings = embedding_model([message])
+            if embeddings is None or len(embeddings) == 0:
+                raise ValueError("Embedding generation returned empty result")
+            results.append(embeddings[0])
+        except Exception as e:
+            LOGGER.error(f"Failed to generate embedding for message: {e}", exc_info=True)
+            results.append(e)
+    return results
+
+
 class EventSimilarityProcessorV2:
     """
     Processes unprocessed SCT events by generating embeddings and storing them in severity-specific tables.
     """
 
-    def __init__(self, stop_event: Event | None = None) -> None:
+    def __init__(
+        self,
+        stop_event: Event | None = None,
+        batched: bool = False,
+        total_shards: int = 0,
+        max_shards: int = 1,
+        worker: str = "0",
+    ) -> None:
         """
         Initialize the processor with embedding model and sanitizer.
 
         Args:
             stop_event: Optional threading.Event to signal shutdown
+            batched: Process each batch in bulk (concurrent reads/writes, single embedding call)
+                instead of event by event
+            total_shards: Number of token range shards the queue is split into, 0 consumes the whole queue
+            max_shards: Maximum number of shards leased by this processor
+            worker: Worker name used as the label of exported metrics
         """
         self.embedding_model = BgeSmallEnEmbeddingModel()
-        self.sanitizer = MessageSanitizer()
+        self.sanitizer = MessageSanitizer(audit_log_path=SANITIZER_AUDIT_LOG.format(worker=worker) or None)
         self.stop_event = stop_event or Event()
+        self.batched = batched
+        self.worker = worker
         self.db = ScyllaConnection()
+        self.leases = ShardLeases(self.db, total_shards, max_shards,
+                                  on_change=self._evict_shard_runs) if total_shards else None
         self.processed_count = 0
         self.error_count = 0
+        self._exported_counts = (0, 0)
         self.cache_clear_timer = 3600
-        self.similar_event_cache: dict[tuple[RunIdStr, Severity], list[SimilarEvent]] = {}
+        self.run_embeddings = RunEmbeddingIndex(max_runs=MAX_INDEXED_RUNS, ttl=self.cache_clear_timer)
         self.keyspace = (
             SCTCriticalEventEmbedding.__keyspace__
             or SCTErrorEventEmbedding.__keyspace__
@@ -80,84 +149,46 @@ class EventSimilarityProcessorV2:
         )
         LOGGER.info("EventSimilarityProcessorV2 initialized")
 
-    def _clear_stale_cache(self):
-        def cmp_ts(ts: datetime | float):
-            match ts:
-                case float():
-                    return ts + self.cache_clear_timer > time.time()
-                case datetime():
-                    return ts.timestamp() + self.cache_clear_timer > time.time()
-
-        for key in list(self.similar_event_cache.keys()):
-            full_cache = [event for event in self.similar_event_cache[key] if cmp_ts(getattr(event, "added_ts", 0.0))]
-            if len(full_cache) == 0:
-                self.similar_event_cache.pop(key)
+    def _evict_shard_runs(self, shards: set[int]) -> None:
+        """Drop indexed runs of shards lost or acquired, another worker may have stored their embeddings meanwhile."""
+        evicted = self.run_embeddings.evict(lambda key: self.leases.shard_of(key[0]) in shards)
+        if evicted:
+            LOGGER.info(f"Evicted {evicted} indexed runs of queue shards {sorted(shards)}")
 
-    @staticmethod
-    def is_stale(cache: SimilarEvent, rows: list[SimilarEvent]):
-        for row in rows:
-            if cache.run_id == row.run_id and cache.ts.timestamp() == row.ts.timestamp():
-                return True
-        return False
-
-    def _get_potential_duplicate_rows(self, embedding: list[float], table_name: str) -> list[SimilarEvent]:
-        query = f"""
-                SELECT run_id, ts, embedding
-                FROM {self.keyspace}.{table_name}
-                ORDER BY embedding ANN OF ?
-                LIMIT ?
-            """
-        bound_statement = self.db.session.prepare(query)
-        result_rows = list(self.db.session.execute(bound_statement, parameters=[embedding, 1000]))
-
-        return result_rows
-
-    def _merge_cache(
-        self, run_id: str, severity: str, result_rows: list[SimilarEvent]
-    ) -> tuple[list[SimilarEvent], list[SimilarEvent]]:
-        # Remove stale entries from cache if they exist in VS set
-        cached_events = self.similar_event_cache.get((run_id, severity), [])
-        new_cache = [cached for cached in cached_events if not self.is_stale(cached, result_rows)]
-        self.similar_event_cache[(run_id, severity)] = new_cache
-        rows = [*new_cache, *result_rows]
-
-        return rows, new_cache
-
-    def _mark_event_is_duplicate(self, run_id: str, ts: datetime, severity: str, embedding: list[float]) -> bool:
-        try:
+    def _seed_run_embeddings(self, keys: set[tuple[UUID, str]]) -> None:
+        """Load embeddings of runs missing from the in-memory index, reading their partitions concurrently."""
+        missing = [key for key in keys if key not in self.run_embeddings]
+        for severity in {severity for _, severity in missing}:
             table_name = (
                 SCTErrorEventEmbedding.__table_name__
                 if severity == "ERROR"
                 else SCTCriticalEventEmbedding.__table_name__
             )
-            rows, _ = self._merge_cache(run_id, severity, self._get_potential_duplicate_rows(embedding, table_name))
-            if len(rows) > 0:
-                dupe_embeddings = [
-                    (row, cosine(array(row.embedding, dtype=float), array(embedding, dtype=float)))
-                    for row in rows
-                    if row.run_id == run_id
-                ]
-                if len(dupe_embeddings) == 0:
-                    return False
-                dupe_embedding = next((row for row, distance in dupe_embeddings if -0.05 < distance < 0.05), None)
-                if not dupe_embedding:
-                    return False
-                q = f"SELECT event_id FROM {SCTEvent.__table_name__} WHERE run_id = ? AND severity = ? AND ts = ?"
-                bound_q = self.db.session.prepare(q)
-                dupe = self.db.session.execute(
-                    bound_q, parameters=(dupe_embedding.run_id, severity, dupe_embedding.ts)
-                ).one()
-                dupe_id = dupe.event_id
-                self._clear_unprocessed_event(SCTUnprocessedEvent.__table_name__, run_id, severity, ts)
-                update_query = f"UPDATE {SCTEvent.__table_name__} SET duplicate_id = ? WHERE run_id = ? AND severity = ? AND ts = ?"
-                self.db.execute(update_query, (dupe_id, run_id, severity, ts))
-                return True
+            query = f"SELECT ts, embedding FROM {self.keyspace}.{table_name} WHERE run_id = ?"
+            run_keys = [key for key in missing if key[1] == severity]
+            results = self.db.execute_concurrent(query, [(run_id,) for run_id, _ in run_keys], CONCURRENCY)
+            for key, (success, result) in zip(run_keys, results):
+                if not success:
+                    raise result
+                self.run_embeddings.seed(key, ((row.ts, row.embedding) for row in result))
+
+    def _mark_event_is_duplicate(self, run_id: UUID, ts: datetime, severity: str, embedding: list[float]) -> bool:
+        try:
+            self._seed_run_embeddings({(run_id, severity)})
+            dupe_ts = self.run_embeddings.find_duplicate((run_id, severity), embedding, DUPLICATE_MAX_DISTANCE)
+            if dupe_ts is None:
+                return False
+            q = f"SELECT event_id FROM {SCTEvent.__table_name__} WHERE run_id = ? AND severity = ? AND ts = ?"
+            dupe = self.db.execute(q, (run_id, severity, dupe_ts)).one()
+            dupe_id = dupe.event_id
+            self._clear_unprocessed_event(SCTUnprocessedEvent.__table_name__, run_id, severity, ts)
+            update_query = f"UPDATE {SCTEvent.__table_name__} SET duplicate_id = ? WHERE run_id = ? AND severity = ? AND ts = ?"
+            self.db.execute(update_query, (dupe_id, run_id, severity, ts))
+            return True
         except Exception as e:
             LOGGER.error(f"Duplicate search error: {e}", exc_info=True)
             raise
 
-        return False
-
     def _clear_unprocessed_event(self, table_name: str, run_id: str, severity: str, ts: datetime):
         delete_query = f"DELETE FROM {table_name} WHERE run_id = ? AND severity = ? AND ts = ?"
         self.db.execute(delete_query, (run_id, severity, ts))
@@ -168,11 +199,16 @@ class EventSimilarityProcessorV2:
         """
         LOGGER.info("Starting event processing loop")
         next_clear_ts = time.time() + self.cache_clear_timer
+        next_heartbeat_ts = 0.0
         while not self.stop_event.is_set():
             try:
+                if self.leases and time.time() > next_heartbeat_ts:
+                    self.leases.heartbeat()
+                    OWNED_SHARDS.labels(worker=self.worker).set(len(self.leases.owned))
+                    next_heartbeat_ts = time.time() + self.leases.ttl / 3
                 batch_processed = self._process_batch()
                 if time.time() > next_clear_ts:
-                    self._clear_stale_cache()
+                    self.run_embeddings.clear_expired()
                     next_clear_ts = time.time() + self.cache_clear_timer
                 if batch_processed == 0:
                     # No events to process, sleep before next iteration
@@ -183,6 +219,8 @@ class EventSimilarityProcessorV2:
                 LOGGER.error(f"Error in processing loop: {e}", exc_info=True)
                 self.error_count += 1
                 time.sleep(SLEEP_INTERVAL)
+            finally:
+                self._export_metrics()
 
         LOGGER.info(f"Processing loop stopped. Total processed: {self.processed_count}, Errors: {self.error_count}")
 
@@ -196,17 +234,20 @@ class EventSimilarityProcessorV2:
         Returns:
             Number of events processed in this batch
         """
-        # Fetch unprocessed events using raw query
-        query = f"SELECT run_id, severity, ts FROM {SCTUnprocessedEvent.__table_name__} LIMIT {batch_size}"
         try:
-            rows = self.db.execute(query)
-            unprocessed_events = list(rows)
+            unprocessed_events = self._fetch_unprocessed_events(batch_size)
         except Exception as e:
             LOGGER.error(f"Failed to fetch unprocessed events: {e}", exc_info=True)
             return 0
 
         if not unprocessed_events:
+            QUEUE_LAG.labels(worker=self.worker).set(0)
             return 0
+        oldest_ts = min(event.ts for event in unprocessed_events)
+        QUEUE_LAG.labels(worker=self.worker).set(max(0.0, time.time() - oldest_ts.replace(tzinfo=UTC).timestamp()))
+
+        if self.batched:
+            return self._process_events_bulk(unprocessed_events)
 
         processed_in_batch = 0
 
@@ -227,7 +268,6 @@ class EventSimilarityProcessorV2:
                     f"DELETE FROM {SCTUnprocessedEvent.__table_name__} WHERE run_id = ? AND severity = ? AND ts = ?"
                 )
                 self.db.execute(delete_query, (event_row.run_id, event_row.severity, event_row.ts))
-        self._clear_stale_cache()
         return processed_in_batch
 
     def _process_single_event(self, run_id: UUID, severity: str, ts: datetime) -> None:
@@ -255,21 +295,8 @@ class EventSimilarityProcessorV2:
             LOGGER.warning(f"Event not found in SCTEvent table: run_id={run_id}, severity={severity}, ts={ts}")
             raise
 
-        message = event.message
-        if not message:
-            LOGGER.warning(f"Event has no message: run_id={run_id}, severity={severity}, ts={ts}")
-            raise ValueError("Event message is empty")
-
         # Step 2: Sanitize event message
-        try:
-            sanitized_message = self.sanitizer.sanitize(run_id, message)
-        except Exception as e:
-            LOGGER.error(f"Failed to sanitize message for event (run_id={run_id}): {e}", exc_info=True)
-            raise
-
-        if not sanitized_message or not sanitized_message.strip():
-            LOGGER.warning(f"Sanitized message is empty for event: run_id={run_id}, severity={severity}, ts={ts}")
-            raise ValueError("Sanitized message is empty")
+        sanitized_message = self._sanitize_event_message(run_id, severity, ts, event.message)
 
         # Step 3: Generate embedding
         try:
@@ -287,22 +314,10 @@ class EventSimilarityProcessorV2:
 
         # Step 4: Store embedding in severity-specific table
         try:
-            if severity == "ERROR":
-                table_name = SCTErrorEventEmbedding.__table_name__
-            elif severity == "CRITICAL":
-                table_name = SCTCriticalEventEmbedding.__table_name__
-            else:
-                raise ValueError(f"Unsupported severity: {severity}")
-
-            insert_query = f"INSERT INTO {self.keyspace}.{table_name} (run_id, ts, embedding) VALUES (?, ?, ?)"
-            self.db.execute(insert_query, (run_id, ts, embedding))
+            table_name = self._embedding_table_name(severity)
+            self.db.execute(self._insert_query(table_name), (run_id, ts, embedding))
             LOGGER.debug(f"Stored embedding in {table_name} for event: run_id={run_id}, ts={ts}")
-            # cache event until it is visible in VS
-            cache = self.similar_event_cache.get((run_id, severity))
-            if not cache:
-                cache: list[SimilarEvent] = []
-            cache.append(SimilarEvent(run_id, ts, embedding, time.time()))
-            self.similar_event_cache[(run_id, severity)] = cache
+            self.run_embeddings.add((run_id, severity), ts, embedding)
         except Exception as e:
             LOGGER.error(f"Failed to store embedding for event (run_id={run_id}): {e}", exc_info=True)
             raise
@@ -315,21 +330,198 @@ class EventSimilarityProcessorV2:
             LOGGER.error(f"Failed to delete unprocessed event (run_id={run_id}): {e}", exc_info=True)
             raise
 
+    def _fetch_unprocessed_events(self, batch_size: int) -> list:
+        """Fetch unprocessed events from the whole queue or, when sharded, from the owned shards only."""
+        table_name = SCTUnprocessedEvent.__table_name__
+        if not self.leases:
+            # Fetch unprocessed events using raw query
+            query = f"SELECT run_id, severity, ts FROM {table_name} LIMIT {batch_size}"
+            return list(self.db.execute(query))
+
+        owned_ranges = self.leases.owned_ranges()
+        if not owned_ranges:
+            return []
+        limit = max(1, batch_size // len(owned_ranges))
+        query = (
+            f"SELECT run_id, severity, ts FROM {table_name} "
+            f"WHERE token(run_id) >= ? AND token(run_id) <= ? LIMIT {limit}"
+        )
+        events = []
+        for _, token_range in owned_ranges:
+            events.extend(self.db.execute(query, token_range))
+        return events
+
+    def _export_metrics(self) -> None:
+        processed, errors = self._exported_counts
+        EVENTS_PROCESSED.labels(worker=self.worker).inc(self.processed_count - processed)
+        EVENT_ERRORS.labels(worker=self.worker).inc(self.error_count - errors)
+        self._exported_counts = (self.processed_count, self.error_count)
+
+    def _process_events_bulk(self, unprocessed_events: list) -> int:
+        """
+        Process a batch of unprocessed events in bulk: read messages concurrently, embed all sanitized
+        messages with a single model call and write embeddings and queue deletions concurrently.
+
+        The embeddings of all runs in the batch are loaded into the RunEmbeddingIndex up front.
+        Duplicate detection then runs event by event against the index, and each new embedding is
+        added to it, so duplicates within the same batch are found exactly as in sequential processing.
+
+        Args:
+            unprocessed_events: Rows (run_id, severity, ts) read from the unprocessed events queue
+
+        Returns:
+            Number of events processed in this batch
+        """
+        keys = [(row.run_id, row.severity, row.ts) for row in unprocessed_events]
+        failed: list[tuple[UUID, str, datetime]] = []
+
+        # Step 1 and 2: Read and sanitize event messages
+        message_query = f"SELECT message FROM {SCTEvent.__table_name__} WHERE run_id = ? AND severity = ? AND ts = ?"
+        pending: list[tuple[tuple[UUID, str, datetime], str]] = []
+        for key, (success, result) in zip(keys, self.db.execute_concurrent(message_query, keys, CONCURRENCY)):
+            try:
+                if not success:
+                    raise result
+                event = result.one()
+                if not event:
+                    run_id, severity, ts = key
+                    LOGGER.warning(f"Event not found in SCTEvent table: run_id={run_id}, severity={severity}, ts={ts}")
+                    raise ValueError("Event not found")
+                pending.append((key, self._sanitize_event_message(*key, event.message)))
+            except Exception as e:
+                LOGGER.error(f"Failed to process event (run_id={key[0]}, severity={key[1]}, ts={key[2]}): {e}",
+                             exc_info=True)
+                self.error_count += 1
+                failed.append(key)
+
+        # Step 3: Generate embeddings for the whole batch
+        embedded = []
+        for (key, _), embedding in zip(pending, self._embed_messages([message for _, message in pending])):
+            if isinstance(embedding, Exception):
+                self._log_failed_event(key, embedding)
+                failed.append(key)
+            else:
+                embedded.append((key, embedding))
+
+        # Step 3.5: Check for duplicates, queue entries of duplicates are removed by the check itself
+        try:
+            self._seed_run_embeddings({key[:2] for key, _ in embedded})
+        except Exception as e:
+            # Runs that failed to load are retried one by one by the duplicate check
+            LOGGER.warning(f"Failed to load embeddings of the batch runs: {e}", exc_info=True)
+        processed_in_batch = 0
+        inserts: dict[str, list[tuple[UUID, datetime, list[float]]]] = {}
+        to_insert: dict[str, list[tuple[UUID, str, datetime]]] = {}
+        for key, embedding in embedded:
+            run_id, severity, ts = key
+            try:
+                if self._mark_event_is_duplicate(run_id, ts, severity, embedding):
+                    processed_in_batch += 1
+                    continue
+                table_name = self._embedding_table_name(severity)
+            except Exception as e:
+                LOGGER.error(f"Failed to process event (run_id={run_id}, severity={severity}, ts={ts}): {e}",
+                             exc_info=True)
+                self.error_count += 1
+                failed.append(key)
+                continue
+            # index event right away so that the rest of the batch is checked against it
+            self.run_embeddings.add((run_id, severity), ts, embedding)
+            inserts.setdefault(table_name, []).append((run_id, ts, embedding))
+            to_insert.setdefault(table_name, []).append(key)
+
+        # Step 4: Store embeddings in severity-specific tables
+        stored: list[tuple[UUID, str, datetime]] = []
+        for table_name, params in inserts.items():
+            results = self.db.execute_concurrent(self._insert_query(table_name), params, CONCURRENCY)
+            for key, (success, result) in zip(to_insert[table_name], results):
+                if success:
+                    stored.append(key)
+                    continue
+                self._log_failed_event(key, result)
+                self.run_embeddings.remove(key[:2], key[2])
+                failed.append(key)
+
+        # Step 5: Remove stored and failed events from the queue, failed ones to avoid infinite retries
+        delete_query = f"DELETE FROM {SCTUnprocessedEvent.__table_name__} WHERE run_id = ? AND severity = ? AND ts = ?"
+        results = self.db.execute_concurrent(delete_query, stored + failed, CONCURRENCY)
+        for idx, (key, (success, result)) in enumerate(zip(stored + failed, results)):
+            if not success:
+                LOGGER.error(f"Failed to delete unprocessed event (run_id={key[0]}): {result}")
+                self.error_count += 1
+            elif idx < len(stored):
+                processed_in_batch += 1
+
+        self.processed_count += processed_in_batch
+        return processed_in_batch
+
+    def _embed_messages(self, messages: list[str]) -> list:
+        return embed_messages(self.embedding_model, messages)
+
+    def _sanitize_event_message(self, run_id: UUID, severity: str, ts: datetime, message: str | None) -> str:
+        if not message:
+            LOGGER.warning(f"Event has no message: run_id={run_id}, severity={severity}, ts={ts}")
+            raise ValueError("Event message is empty")
+
+        try:
+            sanitized_message = self.sanitizer.sanitize(run_id, message)
+        except Exception as e:
+            LOGGER.error(f"Failed to sanitize message for event (run_id={run_id}): {e}", exc_info=True)
+            raise
+
+        if not sanitized_message or not sanitized_message.strip():
+            LOGGER.warning(f"Sanitized message is empty for event: run_id={run_id}, severity={severity}, ts={ts}")
+            raise ValueError("Sanitized message is empty")
+        return sanitized_message
+
+    @staticmethod
+    def _embedding_table_name(severity: str) -> str:
+        if severity == "ERROR":
+            return SCTErrorEventEmbedding.__table_name__
+        elif severity == "CRITICAL":
+            return SCTCriticalEventEmbedding.__table_name__
+        raise ValueError(f"Unsupported severity: {severity}")
+
+    def _insert_query(self, table_name: str) -> str:
+        return f"INSERT INTO {self.keyspace}.{table_name} (run_id, ts, embedding) VALUES (?, ?, ?)"
+
+    def _log_failed_event(self, key: tuple[UUID, str, datetime], error: Exception) -> None:
+        run_id, severity, ts = key
+        LOGGER.error(f"Failed to process event (run_id={run_id}, severity={severity}, ts={ts}): {error}")
+        self.error_count += 1
+
     def shutdown(self) -> None:
         """Shutdown the processor and cleanup resources."""
         self.stop_event.set()
+        if self.leases:
+            self.leases.release()
+        self.sanitizer.close()
         self.db.shutdown()
         LOGGER.info("EventSimilarityProcessorV2 shutdown complete")
 
 
-def main():
-    """Main entry point for the event similarity processor."""
-    setup_application_logging(log_level=logging.INFO)
+def run_worker(worker_index: int, total_shards: int, max_shards: int) -> None:
+    """
+    Run one processor with its own database connection and embedding model until interrupted.
 
-    LOGGER.info("Starting Event Similarity Processor V2...")
+    Args:
+        worker_index: Index of the worker, used for metrics label and port
+        total_shards: Number of queue shards, 0 consumes the whole queue
+        max_shards: Maximum number of shards leased by this worker
+    """
+    setup_application_logging(log_level=logging.INFO)
+    if METRICS_PORT:
+        start_http_server(METRICS_PORT + worker_index)
 
     stop_event = Event()
-    processor = EventSimilarityProcessorV2(stop_event=stop_event)
+    signal.signal(signal.SIGTERM, lambda *_: stop_event.set())
+    processor = EventSimilarityProcessorV2(
+        stop_event=stop_event,
+        batched=True,
+        total_shards=total_shards,
+        max_shards=max_shards,
+        worker=str(worker_index),
+    )
 
     try:
         processor.process_unprocessed_events()
@@ -337,7 +529,48 @@ def main():
         LOGGER.info("Received keyboard interrupt, shutting down...")
     finally:
         processor.shutdown()
-        LOGGER.info("Event Similarity Processor V2 stopped")
+
+
+def supervise_workers(total_shards: int, max_shards: int) -> None:
+    """Run WORKERS processor processes, restarting the ones that exit until interrupted."""
+    context = multiprocessing.get_context("spawn")
+    workers: dict[int, multiprocessing.Process] = {}
+    try:
+        while True:
+            for idx in range(WORKERS):
+                worker = workers.get(idx)
+                if worker and worker.is_alive():
+                    continue
+                if worker:
+                    LOGGER.warning(f"Worker {idx} exited with code {worker.exitcode}, restarting")
+                workers[idx] = context.Process(
+                    target=run_worker, args=(idx, total_shards, max_shards), name=f"event-processor-{idx}"
+                )
+                workers[idx].start()
+            time.sleep(SLEEP_INTERVAL * 10)
+    except KeyboardInterrupt:
+        LOGGER.info("Received keyboard interrupt, stopping workers...")
+    finally:
+        for worker in workers.values():
+            worker.terminate()
+        for worker in workers.values():
+            worker.join()
+
+
+def main():
+    """Main entry point for the event similarity processor."""
+    setup_application_logging(log_level=logging.INFO)
+
+    LOGGER.info("Starting Event Similarity Processor V2...")
+
+    total_shards = QUEUE_SHARDS or (WORKERS if WORKERS > 1 else 0)
+    max_shards = SHARDS_PER_WORKER or max(1, math.ceil(total_shards / WORKERS))
+    if WORKERS > 1:
+        LOGGER.info(f"Running {WORKERS} workers over {total_shards} queue shards")
+        supervise_workers(total_shards, max_shards)
+    else:
+        run_worker(0, total_shards, max_shards)
+    LOGGER.info("Event Similarity Processor V2 stopped")
 
 
 if __name__ == "__main__":
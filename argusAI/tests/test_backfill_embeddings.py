@@ -0,0 +1,151 @@
+"""
+Tests for the event embeddings backfill
+
+Test coverage:
+1. Vectorized duplicate detection matching event by event detection
+2. Resuming from the RuntimeStore checkpoint
+3. Embedding, duplicate link and queue writes of a token range
+4. Failed writes keeping the checkpoint
+"""
+
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, Mock, patch
+from uuid import uuid4
+
+import numpy as np
+import pytest
+
+from argus.backend.models.argus_ai import SCTErrorEventEmbedding
+from argusAI.backfill_embeddings import EmbeddingBackfill
+from argusAI.utils.run_embedding_index import RunEmbeddingIndex, find_duplicates
+
+
+def event_row(run_id, ts, message="message", severity="ERROR", duplicate_id=None):
+    return Mock(run_id=run_id, severity=severity, ts=ts, event_id=uuid4(), message=message, duplicate_id=duplicate_id)
+
+
+class TestFindDuplicates:
+    """Tests for duplicate detection of a whole run."""
+
+    @pytest.mark.parametrize("block_size", [1, 7, 256])
+    def test_find_duplicates_should_match_event_by_event_detection(self, block_size):
+        """Vectorized detection should mark the same duplicates as the RunEmbeddingIndex used by the processor."""
+        rng = np.random.default_rng(0)
+        centers = rng.normal(size=(5, 16))
+        embeddings = [centers[idx % 5] + rng.normal(scale=0.1, size=16) for idx in range(60)]
+        index = RunEmbeddingIndex()
+        key = (uuid4(), "ERROR")
+        index.seed(key, [])
+        expected = []
+        for idx, embedding in enumerate(embeddings):
+            dupe = index.find_duplicate(key, embedding, max_distance=0.05)
+            expected.append(dupe)
+            if dupe is None:
+                index.add(key, idx, embedding)
+
+        assert find_duplicates(embeddings, max_distance=0.05, block_size=block_size) == expected
+        assert any(dupe is not None for dupe in expected)
+
+    def test_find_duplicates_should_not_link_to_duplicates(self):
+        """Events should only be linked to earlier events that are not duplicates themselves."""
+        embeddings = [[1.0, 0.0], [1.0, 0.01], [1.0, 0.02], [0.0, 1.0]]
+
+        assert find_duplicates(embeddings, max_distance=0.05) == [None, 0, 0, None]
+
+
+class TestEmbeddingBackfill:
+    """Tests for backfilling token ranges."""
+
+    @pytest.fixture
+    def backfill(self):
+        """Create backfill with mocked dependencies."""
+        with (
+            patch("argusAI.backfill_embeddings.ScyllaConnection") as mock_scylla,
+            patch("argusAI.backfill_embeddings.BgeSmallEnEmbeddingModel") as mock_model,
+            patch("argusAI.backfill_embeddings.MessageSanitizer") as mock_sanitizer,
+        ):
+            mock_scylla.return_value = MagicMock()
+            mock_model.return_value = Mock(side_effect=lambda messages: [[1.0, 0.0] for _ in messages])
+            mock_sanitizer.return_value.sanitize.side_effect = lambda run_id, message: message
+            backfill = EmbeddingBackfill(name="test", ranges=4)
+            backfill.db.execute_concurrent.side_effect = lambda query, params, concurrency: [(True, [])] * len(params)
+            return backfill
+
+    def test_run_should_resume_from_checkpoint(self, backfill):
+        """Ranges before the checkpoint should be skipped and the checkpoint advanced after every range."""
+        backfill.db.execute.return_value.one.return_value = Mock(value_int=2)
+
+        with (
+            patch.object(backfill, "_read_range", return_value={}) as read_range,
+            patch.object(backfill, "save_checkpoint") as save_checkpoint,
+        ):
+            backfill.run()
+
+        assert [call.args[0] for call in read_range.call_args_list] == [2, 3]
+        assert [call.args[0] for call in save_checkpoint.call_args_list] == [3, 4]
+
+    def test_run_should_start_from_first_range_on_restart(self, backfill):
+        """Restart should ignore the stored checkpoint."""
+        with (
+            patch.object(backfill, "_read_range", return_value={}) as read_range,
+            patch.object(backfill, "save_checkpoint"),
+        ):
+            backfill.run(restart=True)
+
+        assert [call.args[0] for call in read_range.call_args_list] == [0, 1, 2, 3]
+        assert not backfill.db.execute.called
+
+    def test_read_range_should_group_error_and_critical_events_by_run(self, backfill):
+        """Events should be grouped per run and severity, other severities are skipped."""
+        run_id, ts = uuid4(), datetime.now()
+        backfill.db.execute.return_value = [
+            event_row(run_id, ts, severity="CRITICAL"),
+            event_row(run_id, ts, severity="ERROR"),
+            event_row(run_id, ts + timedelta(seconds=1), severity="ERROR"),
+            event_row(run_id, ts, severity="NORMAL"),
+        ]
+
+        partitions = backfill._read_range(1)
+
+        assert {key: len(rows) for key, rows in partitions.items()} == {(run_id, "CRITICAL"): 1, (run_id, "ERROR"): 2}
+        query, params = backfill.db.execute.call_args.args
+        assert "token(run_id, severity) >= ?" in query
+        assert params == backfill.ranges[1]
+
+    def test_backfill_partitions_should_write_embeddings_links_and_clear_queue(self, backfill):
+        """Only non-duplicates should be stored, and only changed duplicate links rewritten."""
+        run_id, ts = uuid4(), datetime.now()
+        first = event_row(run_id, ts)
+        second = event_row(run_id, ts + timedelta(seconds=1), duplicate_id=first.event_id)
+        third = event_row(run_id, ts + timedelta(seconds=2))
+
+        backfill._backfill_partitions({(run_id, "ERROR"): [first, second, third]})
+
+        writes = {
+            call.args[0].split(" WHERE")[0]: call.args[1] for call in backfill.db.execute_concurrent.call_args_list
+        }
+        table = f"{backfill.keyspace}.{SCTErrorEventEmbedding.__table_name__}"
+        assert writes[f"DELETE FROM {table}"] == [(run_id, third.ts)]
+        assert writes[f"INSERT INTO {table} (run_id, ts, embedding) VALUES (?, ?, ?)"] == [
+            (run_id, first.ts, [1.0, 0.0])
+        ]
+        assert writes["UPDATE sct_event SET duplicate_id = ?"] == [(first.event_id, run_id, "ERROR", third.ts)]
+        assert writes["DELETE FROM sct_unprocessed_events"] == [(run_id, "ERROR", third.ts)]
+        assert (backfill.processed_count, backfill.duplicate_count) == (3, 2)
+
+    def test_failed_write_should_keep_checkpoint(self, backfill):
+        """A range with failed writes should be processed again on resume."""
+        run_id = uuid4()
+        partitions = {(run_id, "ERROR"): [event_row(run_id, datetime.now())]}
+        backfill.db.execute_concurrent.side_effect = lambda query, params, concurrency: [
+            (False, Exception("timeout"))
+        ] * len(params)
+
+        with (
+            patch.object(backfill, "_read_range", return_value=partitions),
+            patch.object(backfill, "save_checkpoint") as save_checkpoint,
+            pytest.raises(Exception, match="timeout"),
+        ):
+            backfill.run(restart=True)
+
+        assert not save_checkpoint.called
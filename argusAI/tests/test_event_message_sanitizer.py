@@ -0,0 +1,104 @@
+"""
+Tests for MessageSanitizer
+
+Test coverage:
+1. Golden corpus output of the compiled pipeline
+2. Memoization and batches
+3. Optional audit log
+"""
+
+import json
+from pathlib import Path
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+
+from argusAI.utils.event_message_sanitizer import MessageSanitizer
+
+GOLDEN_CORPUS = json.loads((Path(__file__).parent / "data" / "sanitizer_golden.json").read_text())
+
+
+@pytest.fixture
+def sanitizer():
+    return MessageSanitizer()
+
+
+def sanitize_sequentially(sanitizer: MessageSanitizer, message: str) -> str:
+    for step in sanitizer.sanitizers:
+        message = step(message)
+    return message
+
+
+class TestGoldenCorpus:
+    """The compiled pipeline must produce byte-identical output to the sequential sanitizers."""
+
+    @pytest.mark.parametrize("entry", GOLDEN_CORPUS, ids=range(len(GOLDEN_CORPUS)))
+    def test_sanitize_should_match_golden_output(self, sanitizer, entry):
+        """Sanitized message should match the recorded output of the sequential pipeline."""
+        assert sanitizer.sanitize(uuid4(), entry["message"]) == entry["sanitized"]
+
+    @pytest.mark.parametrize("entry", GOLDEN_CORPUS, ids=range(len(GOLDEN_CORPUS)))
+    def test_sequential_sanitizers_should_match_golden_output(self, sanitizer, entry):
+        """The sequential pipeline should still produce the recorded output."""
+        assert sanitize_sequentially(sanitizer, entry["message"]) == entry["sanitized"]
+
+    @pytest.mark.parametrize("text", ["a\\nb", "a\\\\nb", "\\", "\\\\n\\", "no escapes", "\\n\\n"])
+    def test_remove_escapes_should_match_eol_and_backslash_removal(self, sanitizer, text):
+        """The merged escape pass should equal remove_eol followed by remove_backslashes."""
+        assert sanitizer.remove_escapes(text) == sanitizer.remove_backslashes(sanitizer.remove_eol(text))
+
+
+class TestMemoization:
+    """Tests for memoized sanitization."""
+
+    def test_repeated_message_should_be_sanitized_once(self, sanitizer):
+        """Identical messages should be served from the memo."""
+        message = GOLDEN_CORPUS[0]["message"]
+
+        with patch.object(sanitizer, "_sanitize", wraps=sanitizer._sanitize) as sanitize:
+            results = {sanitizer.sanitize(uuid4(), message) for _ in range(3)}
+
+        assert results == {GOLDEN_CORPUS[0]["sanitized"]}
+        assert sanitize.call_count == 1
+
+    def test_memo_should_evict_least_recently_used_messages(self):
+        """Memo should not grow above memo_size."""
+        sanitizer = MessageSanitizer(memo_size=2)
+
+        for entry in GOLDEN_CORPUS[:5]:
+            sanitizer.sanitize(uuid4(), entry["message"])
+
+        assert len(sanitizer._memo) == 2
+
+    def test_sanitize_batch_should_keep_order(self, sanitizer):
+        """Batch results should follow input order, including repeated messages."""
+        entries = [GOLDEN_CORPUS[1], GOLDEN_CORPUS[0], GOLDEN_CORPUS[1]]
+
+        results = sanitizer.sanitize_batch([(uuid4(), entry["message"]) for entry in entries])
+
+        assert results == [entry["sanitized"] for entry in entries]
+
+
+class TestAuditLog:
+    """Tests for the optional audit log of sanitized messages."""
+
+    def test_audit_log_should_be_disabled_by_default(self, tmp_path, monkeypatch):
+        """No log files should be created unless an audit log path is given."""
+        monkeypatch.chdir(tmp_path)
+
+        MessageSanitizer().sanitize(uuid4(), "message")
+
+        assert list(tmp_path.iterdir()) == []
+
+    def test_audit_log_should_write_sanitized_messages_on_close(self, tmp_path):
+        """Buffered audit records should be written to the log file when the sanitizer is closed."""
+        log_path = tmp_path / "logs" / "sanitized_messages.log"
+        sanitizer = MessageSanitizer(audit_log_path=str(log_path))
+        run_id = uuid4()
+
+        sanitizer.sanitize(run_id, GOLDEN_CORPUS[0]["message"])
+        sanitizer.sanitize(run_id, GOLDEN_CORPUS[0]["message"])
+        sanitizer.close()
+
+        assert log_path.read_text().splitlines() == [f"{run_id}: {GOLDEN_CORPUS[0]['sanitized']}"] * 2
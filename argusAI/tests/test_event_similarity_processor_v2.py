@@ -10,7 +10,6 @@ Test coverage:
 """
 
 import logging
-import time
 from datetime import datetime
 from threading import Event
 from unittest.mock import Mock, MagicMock, patch
@@ -20,7 +19,8 @@ import pytest
 
 from argus.backend.models.argus_ai import SCTErrorEventEmbedding, SCTCriticalEventEmbedding
 from argus.backend.plugins.sct.testrun import SCTUnprocessedEvent
-from argusAI.event_similarity_processor_v2 import EventSimilarityProcessorV2, BgeSmallEnEmbeddingModel, SimilarEvent
+from argusAI.event_similarity_processor_v2 import EventSimilarityProcessorV2, BgeSmallEnEmbeddingModel
+from argusAI.utils.run_embedding_index import RunEmbeddingIndex
 
 
 LOGGER = logging.getLogger(__name__)
@@ -330,6 +330,149 @@ class TestBatchProcessing:
         assert "LIMIT 50" in call_args
 
 
+class TestBulkBatchProcessing:
+    """Tests for batched mode: concurrent reads and writes with a single embedding call per batch."""
+
+    @pytest.fixture
+    def processor(self):
+        """Create batched processor whose concurrent statements all succeed."""
+        with (
+            patch("argusAI.event_similarity_processor_v2.ScyllaConnection") as mock_scylla,
+            patch("argusAI.event_similarity_processor_v2.BgeSmallEnEmbeddingModel") as mock_embedding,
+            patch("argusAI.event_similarity_processor_v2.MessageSanitizer") as mock_sanitizer,
+        ):
+            mock_db = MagicMock()
+            mock_scylla.return_value = mock_db
+            mock_embedding.return_value = MagicMock(side_effect=lambda messages: [[0.1] * 384 for _ in messages])
+            mock_sanitizer.return_value = MagicMock(sanitize=MagicMock(side_effect=lambda run_id, message: message))
+            processor = EventSimilarityProcessorV2(batched=True)
+
+        processor.db.execute_concurrent.side_effect = lambda query, params, concurrency=50: [
+            (True, [] if query.startswith("SELECT ts") else Mock(one=Mock(return_value=Mock(message=f"message {idx}"))))
+            for idx, _ in enumerate(params)
+        ]
+        return processor
+
+    @staticmethod
+    def concurrent_params(processor, statement: str) -> list:
+        return [
+            param
+            for call in processor.db.execute_concurrent.call_args_list
+            if call[0][0].startswith(statement)
+            for param in call[0][1]
+        ]
+
+    def test_bulk_batch_should_embed_once_and_write_concurrently(self, processor):
+        """All messages should be embedded in one call and written with concurrent inserts and deletes."""
+        events = [
+            Mock(run_id=uuid4(), severity="ERROR", ts=datetime.now()),
+            Mock(run_id=uuid4(), severity="CRITICAL", ts=datetime.now()),
+            Mock(run_id=uuid4(), severity="ERROR", ts=datetime.now()),
+        ]
+        processor.db.execute.return_value = events
+
+        result = processor._process_batch()
+
+        assert result == 3
+        assert processor.processed_count == 3
+        processor.embedding_model.assert_called_once_with(["message 0", "message 1", "message 2"])
+        inserts = {
+            call[0][0]: [param[0] for param in call[0][1]]
+            for call in processor.db.execute_concurrent.call_args_list
+            if call[0][0].startswith("INSERT")
+        }
+        assert inserts == {
+            processor._insert_query(SCTErrorEventEmbedding.__table_name__): [events[0].run_id, events[2].run_id],
+            processor._insert_query(SCTCriticalEventEmbedding.__table_name__): [events[1].run_id],
+        }
+        assert len(self.concurrent_params(processor, "DELETE")) == 3
+        assert not [call for call in processor.db.execute.call_args_list if not call[0][0].startswith("SELECT run_id")]
+
+    def test_bulk_batch_should_remove_events_without_message_from_queue(self, processor):
+        """Events that fail before embedding should be counted as errors and still removed from the queue."""
+        events = [Mock(run_id=uuid4(), severity="ERROR", ts=datetime.now()) for _ in range(2)]
+        processor.db.execute.return_value = events
+        processor.db.execute_concurrent.side_effect = lambda query, params, concurrency=50: (
+            [(True, Mock(one=Mock(return_value=None))), (False, Exception("read timeout"))]
+            if query.startswith("SELECT message")
+            else [(True, []) for _ in params]
+        )
+
+        result = processor._process_batch()
+
+        assert result == 0
+        assert processor.error_count == 2
+        assert not processor.embedding_model.called
+        assert [param[0] for param in self.concurrent_params(processor, "DELETE")] == [event.run_id for event in events]
+
+    def test_bulk_batch_should_fall_back_to_single_embeddings(self, processor):
+        """A failing batch embedding call should only fail the events whose own embedding fails."""
+        events = [Mock(run_id=uuid4(), severity="ERROR", ts=datetime.now()) for _ in range(3)]
+        processor.db.execute.return_value = events
+
+        def embed(messages):
+            if len(messages) > 1 or messages == ["message 1"]:
+                raise ValueError("tokenizer failure")
+            return [[0.1] * 384]
+
+        processor.embedding_model.side_effect = embed
+
+        result = processor._process_batch()
+
+        assert result == 2
+        assert processor.error_count == 1
+        assert processor.embedding_model.call_count == 4
+        assert [param[0] for param in self.concurrent_params(processor, "INSERT")] == [events[0].run_id,
+                                                                                       events[2].run_id]
+        assert len(self.concurrent_params(processor, "DELETE")) == 3
+
+    def test_bulk_batch_should_unindex_events_whose_insert_failed(self, processor):
+        """Failed inserts should be counted as errors, dropped from the run index and removed from the queue."""
+        event = Mock(run_id=uuid4(), severity="ERROR", ts=datetime.now())
+        processor.db.execute.return_value = [event]
+        insert_failure = [(False, Exception("write timeout"))]
+        execute_concurrent = processor.db.execute_concurrent.side_effect
+        processor.db.execute_concurrent.side_effect = lambda query, params, concurrency=50: (
+            insert_failure if query.startswith("INSERT") else execute_concurrent(query, params)
+        )
+
+        result = processor._process_batch()
+
+        assert result == 0
+        assert processor.error_count == 1
+        assert processor.run_embeddings.find_duplicate((event.run_id, "ERROR"), [0.1] * 384, 0.05) is None
+        assert len(self.concurrent_params(processor, "DELETE")) == 1
+
+    def test_bulk_batch_should_seed_batch_runs_concurrently_once(self, processor):
+        """Embeddings of every run in the batch should be loaded with one concurrent read per severity."""
+        events = [Mock(run_id=uuid4(), severity="ERROR", ts=datetime.now()) for _ in range(3)]
+        processor.db.execute.return_value = events
+
+        processor._process_batch()
+
+        seed_calls = [
+            call for call in processor.db.execute_concurrent.call_args_list if call[0][0].startswith("SELECT ts")
+        ]
+        assert len(seed_calls) == 1
+        assert sorted(seed_calls[0][0][1]) == sorted((event.run_id,) for event in events)
+
+    def test_bulk_batch_should_detect_duplicates_within_batch(self, processor):
+        """An event identical to an earlier event of the same run in the batch should be marked as duplicate."""
+        run_id = uuid4()
+        events = [Mock(run_id=run_id, severity="ERROR", ts=datetime(2024, 1, 1, second=idx)) for idx in range(2)]
+        processor.db.execute.side_effect = lambda query, params=None: (
+            events if "LIMIT" in query else Mock(one=Mock(return_value=Mock(event_id=uuid4())))
+        )
+
+        result = processor._process_batch()
+
+        assert result == 2
+        assert [param[1] for param in self.concurrent_params(processor, "INSERT")] == [events[0].ts]
+        updates = [call[0][1] for call in processor.db.execute.call_args_list if call[0][0].startswith("UPDATE")]
+        assert [params[3] for params in updates] == [events[1].ts]
+        assert [param[2] for param in self.concurrent_params(processor, "DELETE")] == [events[0].ts]
+
+
 class TestProcessingLoop:
     """Tests for main processing loop."""
 
@@ -548,49 +691,45 @@ class TestDeduplication:
             processor = EventSimilarityProcessorV2()
             return processor
 
+    @staticmethod
+    def stored_embeddings(processor, rows: list[tuple[datetime, list[float]]]) -> None:
+        """Make the embedding table partition of every run return rows."""
+        processor.db.execute_concurrent.side_effect = lambda query, params, concurrency=50: [
+            (True, [Mock(ts=ts, embedding=embedding) for ts, embedding in rows]) for _ in params
+        ]
+
     def test_mark_event_is_duplicate_should_return_false_when_no_rows_returned(self, processor):
-        """Should return False when ANN search returns no rows (no similar events in DB or cache)."""
+        """Should return False when the run has no stored embeddings."""
         run_id = uuid4()
         ts = datetime.now()
         embedding = [0.1] * 384
-
-        # ANN query returns no results
-        processor.db.session.execute.return_value = []
+        self.stored_embeddings(processor, [])
 
         result = processor._mark_event_is_duplicate(run_id, ts, "ERROR", embedding)
 
         assert result is False
 
-    def test_mark_event_is_duplicate_should_return_false_when_similar_embedding_belongs_to_different_run(
-        self, processor
-    ):
-        """Should return False when near-identical embedding exists but belongs to a different run."""
+    def test_mark_event_is_duplicate_should_only_load_embeddings_of_same_run(self, processor):
+        """Only the embedding table partition of the event run and severity should be read."""
         run_id = uuid4()
-        other_run_id = uuid4()
-        ts = datetime.now()
-        # Identical unit vectors — cosine distance would be ~0
-        embedding = [1.0] + [0.0] * 383
+        self.stored_embeddings(processor, [])
 
-        # DB returns a row with the same embedding but for a different run
-        other_run_row = SimilarEvent(run_id=other_run_id, ts=datetime.now(), embedding=embedding, added_ts=time.time())
-        processor.db.session.execute.return_value = [other_run_row]
+        processor._mark_event_is_duplicate(run_id, datetime.now(), "CRITICAL", [0.1] * 384)
 
-        result = processor._mark_event_is_duplicate(run_id, ts, "ERROR", embedding)
-
-        assert result is False
+        query, params = processor.db.execute_concurrent.call_args[0][:2]
+        table_name = SCTCriticalEventEmbedding.__table_name__
+        assert query.startswith(f"SELECT ts, embedding FROM {processor.keyspace}.{table_name}")
+        assert "WHERE run_id = ?" in query
+        assert params == [(run_id,)]
 
     def test_mark_event_is_duplicate_should_return_false_when_cosine_distance_too_large(self, processor):
         """Should return False when the closest embedding exceeds the similarity threshold."""
         run_id = uuid4()
         ts = datetime.now()
-        # Two orthogonal unit vectors — cosine distance = 1.0, well outside (-0.1, 0.1)
+        # Two orthogonal unit vectors — cosine distance = 1.0, well outside the threshold
         embedding = [1.0] + [0.0] * 383
         different_embedding = [0.0, 1.0] + [0.0] * 382
-
-        existing_row = SimilarEvent(
-            run_id=run_id, ts=datetime.now(), embedding=different_embedding, added_ts=time.time()
-        )
-        processor.db.session.execute.return_value = [existing_row]
+        self.stored_embeddings(processor, [(datetime.now(), different_embedding)])
 
         result = processor._mark_event_is_duplicate(run_id, ts, "ERROR", embedding)
 
@@ -600,31 +739,20 @@ class TestDeduplication:
         """Should return True and write duplicate_id when a near-identical embedding exists in the same run."""
         run_id = uuid4()
         ts = datetime.now()
-        ts_existing = datetime.now()
+        ts_existing = datetime(2024, 1, 1)
         existing_event_id = uuid4()
-        # Same unit vector — cosine distance = 0, clearly within (-0.1, 0.1)
         embedding = [1.0] + [0.0] * 383
-
-        existing_row = SimilarEvent(run_id=run_id, ts=ts_existing, embedding=embedding, added_ts=time.time())
-
-        # First session.execute call: ANN query → returns [existing_row]
-        # Second session.execute call: SELECT event_id → returns a mock dupe
-        mock_dupe = Mock(event_id=existing_event_id)
-        ann_result_exhausted = False
-
-        def session_execute_side_effect(*args, **kwargs):
-            nonlocal ann_result_exhausted
-            if not ann_result_exhausted:
-                ann_result_exhausted = True
-                return [existing_row]
-            return Mock(one=Mock(return_value=mock_dupe))
-
-        processor.db.session.execute.side_effect = session_execute_side_effect
+        self.stored_embeddings(processor, [(datetime(2023, 1, 1), [0.0, 1.0] + [0.0] * 382), (ts_existing, embedding)])
+        processor.db.execute.return_value = Mock(one=Mock(return_value=Mock(event_id=existing_event_id)))
 
         result = processor._mark_event_is_duplicate(run_id, ts, "ERROR", embedding)
 
         assert result is True
 
+        # Verify the duplicate event id was read for the most similar stored event
+        select_calls = [call for call in processor.db.execute.call_args_list if "SELECT event_id" in call[0][0]]
+        assert select_calls[0][0][1] == (run_id, "ERROR", ts_existing)
+
         # Verify unprocessed event was deleted
         delete_calls = [call for call in processor.db.execute.call_args_list if "DELETE FROM" in call[0][0]]
         assert len(delete_calls) == 1
@@ -660,19 +788,29 @@ class TestDeduplication:
         assert len(delete_calls) == 0
 
     def test_mark_event_is_duplicate_should_propagate_exceptions(self, processor):
-        """Exceptions raised during duplicate search should propagate to the caller."""
+        """Exceptions raised while loading the run embeddings should propagate to the caller."""
         run_id = uuid4()
         ts = datetime.now()
         embedding = [0.1] * 384
 
-        processor.db.session.execute.side_effect = RuntimeError("ScyllaDB timeout")
+        processor.db.execute_concurrent.return_value = [(False, RuntimeError("ScyllaDB timeout"))]
 
         with pytest.raises(RuntimeError, match="ScyllaDB timeout"):
             processor._mark_event_is_duplicate(run_id, ts, "ERROR", embedding)
 
+    def test_mark_event_is_duplicate_should_load_run_embeddings_once(self, processor):
+        """Subsequent checks of the same run should be served from the in-memory index."""
+        run_id = uuid4()
+        self.stored_embeddings(processor, [])
+
+        for _ in range(3):
+            processor._mark_event_is_duplicate(run_id, datetime.now(), "ERROR", [0.1] * 384)
+
+        assert processor.db.execute_concurrent.call_count == 1
+
 
-class TestCaching:
-    """Tests for the embedding cache used to bridge the vector-search indexing lag."""
+class TestRunEmbeddingIndex:
+    """Tests for the in-memory per-run embedding index used for duplicate detection."""
 
     @pytest.fixture
     def processor(self):
@@ -689,11 +827,12 @@ class TestCaching:
             processor = EventSimilarityProcessorV2()
             return processor
 
-    def test_processed_event_should_be_added_to_cache(self, processor):
-        """A successfully embedded event should appear in similar_event_cache immediately."""
+    def test_processed_event_should_be_added_to_index(self, processor):
+        """A successfully embedded event should be found as a duplicate immediately, before it is read back."""
         run_id = uuid4()
         severity = "ERROR"
         ts = datetime.now()
+        processor.run_embeddings.seed((run_id, severity), [])
 
         mock_event = Mock(message="Disk full on node")
         mock_result = Mock()
@@ -703,17 +842,13 @@ class TestCaching:
         with patch.object(processor, "_mark_event_is_duplicate", return_value=False):
             processor._process_single_event(run_id, severity, ts)
 
-        cache_key = (run_id, severity)
-        assert cache_key in processor.similar_event_cache
-        cached = processor.similar_event_cache[cache_key]
-        assert len(cached) == 1
-        assert cached[0].ts == ts
+        assert processor.run_embeddings.find_duplicate((run_id, severity), [0.1] * 384, 0.05) == ts
 
-    def test_duplicate_event_should_not_be_added_to_cache(self, processor):
-        """An event identified as a duplicate must not be inserted into the cache."""
+    def test_duplicate_event_should_not_be_added_to_index(self, processor):
+        """An event identified as a duplicate must not be added to the index."""
         run_id = uuid4()
         severity = "ERROR"
-        ts = datetime.now()
+        processor.run_embeddings.seed((run_id, severity), [])
 
         mock_event = Mock(message="Disk full on node")
         mock_result = Mock()
@@ -721,117 +856,70 @@ class TestCaching:
         processor.db.execute.return_value = mock_result
 
         with patch.object(processor, "_mark_event_is_duplicate", return_value=True):
-            processor._process_single_event(run_id, severity, ts)
+            processor._process_single_event(run_id, severity, datetime.now())
 
-        assert len(processor.similar_event_cache) == 0
+        assert processor.run_embeddings.find_duplicate((run_id, severity), [0.1] * 384, 0.05) is None
 
-    def test_merge_cache_should_remove_entries_now_visible_in_database(self, processor):
-        """Cache entries that the ANN query now returns (indexed) should be evicted from cache."""
-        run_id = uuid4()
-        severity = "ERROR"
-        ts = datetime.now()
+    def test_find_duplicate_should_return_most_similar_embedding(self):
+        """The closest embedding of the run within the threshold should be returned."""
+        index = RunEmbeddingIndex()
+        close, closest = datetime(2024, 1, 1), datetime(2024, 1, 2)
+        index.seed(("run", "ERROR"), [(close, [1.0, 0.3, 0.0]), (closest, [1.0, 0.1, 0.0])])
 
-        stale = SimilarEvent(run_id=run_id, ts=ts, embedding=[0.1] * 384, added_ts=time.time())
-        processor.similar_event_cache[(run_id, severity)] = [stale]
+        assert index.find_duplicate(("run", "ERROR"), [1.0, 0.0, 0.0], 0.05) == closest
+        assert index.find_duplicate(("run", "ERROR"), [0.0, 0.0, 1.0], 0.05) is None
+        assert index.find_duplicate(("other run", "ERROR"), [1.0, 0.0, 0.0], 0.05) is None
 
-        # Database now returns the same event (vector index has caught up)
-        combined_rows, remaining_cache = processor._merge_cache(run_id, severity, [stale])
+    def test_index_should_grow_and_remove_embeddings(self):
+        """Embeddings appended past the initial capacity should be searchable and removable."""
+        index = RunEmbeddingIndex()
+        index.seed(("run", "ERROR"), [])
+        for idx in range(40):
+            index.add(("run", "ERROR"), datetime(2024, 1, 1, minute=idx), [0.0] * idx + [1.0] + [0.0] * (39 - idx))
 
-        # Entry should have been evicted from the in-memory cache
-        assert len(remaining_cache) == 0
-        assert processor.similar_event_cache[(run_id, severity)] == []
-        # But it is still present in the combined view returned to the caller
-        assert stale in combined_rows
+        assert index.find_duplicate(("run", "ERROR"), [0.0] * 39 + [1.0], 0.05) == datetime(2024, 1, 1, minute=39)
 
-    def test_merge_cache_should_keep_entries_not_yet_indexed_by_database(self, processor):
-        """Cache entries absent from the ANN result set should be preserved and included in combined rows."""
-        run_id = uuid4()
-        severity = "ERROR"
-
-        unindexed = SimilarEvent(run_id=run_id, ts=datetime.now(), embedding=[0.2] * 384, added_ts=time.time())
-        processor.similar_event_cache[(run_id, severity)] = [unindexed]
-
-        # DB returns a different event (unindexed is not visible there yet)
-        db_row = SimilarEvent(run_id=run_id, ts=datetime.now(), embedding=[0.5] * 384, added_ts=time.time())
-
-        combined_rows, remaining_cache = processor._merge_cache(run_id, severity, [db_row])
-
-        # Unindexed cache entry should survive in cache and appear in combined rows
-        assert unindexed in remaining_cache
-        assert unindexed in combined_rows
-        assert db_row in combined_rows
-
-    def test_is_stale_should_return_true_when_event_present_in_db_rows(self, processor):
-        """is_stale should identify a cached event that is now returned by the database."""
-        run_id = uuid4()
-        ts = datetime.now()
-        cached = SimilarEvent(run_id=run_id, ts=ts, embedding=[0.1] * 384, added_ts=time.time())
-        db_row = SimilarEvent(run_id=run_id, ts=ts, embedding=[0.1] * 384, added_ts=time.time())
-
-        assert processor.is_stale(cached, [db_row]) is True
-
-    def test_is_stale_should_return_false_when_event_absent_from_db_rows(self, processor):
-        """is_stale should return False when the cached event is not yet returned by the database."""
-        run_id = uuid4()
-        cached = SimilarEvent(run_id=run_id, ts=datetime.now(), embedding=[0.1] * 384, added_ts=time.time())
-        other_row = SimilarEvent(run_id=run_id, ts=datetime.now(), embedding=[0.5] * 384, added_ts=time.time())
-
-        assert processor.is_stale(cached, [other_row]) is False
+        index.remove(("run", "ERROR"), datetime(2024, 1, 1, minute=39))
 
-    def test_clear_stale_cache_should_remove_keys_whose_entries_have_expired_added_ts(self, processor):
-        """Cache entries with an old added_ts (not in the future window) should be purged."""
-        run_id = uuid4()
-        severity = "ERROR"
-
-        # added_ts = 0.0 is far in the past; cmp_ts returns False → full_cache empty → key dropped
-        old_entry = SimilarEvent(run_id=run_id, ts=datetime.now(), embedding=[0.1] * 384, added_ts=0.0)
-        processor.similar_event_cache[(run_id, severity)] = [old_entry]
+        assert index.find_duplicate(("run", "ERROR"), [0.0] * 39 + [1.0], 0.05) is None
+        assert index.find_duplicate(("run", "ERROR"), [1.0] + [0.0] * 39, 0.05) == datetime(2024, 1, 1)
 
-        processor._clear_stale_cache()
-
-        assert (run_id, severity) not in processor.similar_event_cache
-
-    def test_clear_stale_cache_should_retain_keys_with_future_added_ts(self, processor):
-        """Cache entries whose added_ts lies beyond time.time() + cache_clear_timer should be retained."""
-        run_id = uuid4()
-        severity = "ERROR"
+    def test_add_should_ignore_runs_that_were_not_seeded(self):
+        """Runs missing from the index are loaded from the database, so adding to them is a no-op."""
+        index = RunEmbeddingIndex()
 
-        # added_ts > time.time() + cache_clear_timer so the entry survives
-        future_ts = time.time() + processor.cache_clear_timer + 60
-        fresh_entry = SimilarEvent(run_id=run_id, ts=datetime.now(), embedding=[0.1] * 384, added_ts=future_ts)
-        processor.similar_event_cache[(run_id, severity)] = [fresh_entry]
+        index.add(("run", "ERROR"), datetime.now(), [1.0, 0.0])
 
-        processor._clear_stale_cache()
+        assert ("run", "ERROR") not in index
 
-        assert (run_id, severity) in processor.similar_event_cache
-        assert len(processor.similar_event_cache[(run_id, severity)]) == 1
+    def test_index_should_evict_least_recently_used_runs(self):
+        """Only max_runs runs should be kept, dropping the least recently used one."""
+        index = RunEmbeddingIndex(max_runs=2)
+        index.seed(("a", "ERROR"), [(datetime.now(), [1.0, 0.0])])
+        index.seed(("b", "ERROR"), [(datetime.now(), [1.0, 0.0])])
+        index.find_duplicate(("a", "ERROR"), [1.0, 0.0], 0.05)
+        index.seed(("c", "ERROR"), [])
 
-    def test_deduplication_should_use_cache_when_db_has_not_indexed_new_event(self, processor):
-        """An event stored in cache (not yet in DB) should still trigger deduplication for a new identical event."""
-        run_id = uuid4()
-        severity = "ERROR"
-        ts_existing = datetime.now()
-        existing_event_id = uuid4()
-        # Identical unit vectors
-        embedding = [1.0] + [0.0] * 383
+        assert ("a", "ERROR") in index
+        assert ("b", "ERROR") not in index
+        assert len(index) == 2
 
-        # Pre-populate cache; DB ANN query returns nothing (not yet indexed)
-        cached_event = SimilarEvent(run_id=run_id, ts=ts_existing, embedding=embedding, added_ts=time.time() + 3600)
-        processor.similar_event_cache[(run_id, severity)] = [cached_event]
+    def test_evict_should_drop_matching_runs(self):
+        """Runs matching the predicate should be dropped and reloaded on next use."""
+        index = RunEmbeddingIndex()
+        index.seed(("a", "ERROR"), [])
+        index.seed(("b", "ERROR"), [])
 
-        mock_dupe = Mock(event_id=existing_event_id)
-        ann_call_done = False
+        assert index.evict(lambda key: key[0] == "a") == 1
 
-        def session_execute_side_effect(*args, **kwargs):
-            nonlocal ann_call_done
-            if not ann_call_done:
-                ann_call_done = True
-                return []  # ANN search sees nothing yet
-            return Mock(one=Mock(return_value=mock_dupe))
+        assert ("a", "ERROR") not in index
+        assert ("b", "ERROR") in index
 
-        processor.db.session.execute.side_effect = session_execute_side_effect
+    def test_clear_expired_should_drop_idle_runs(self):
+        """Runs not used for longer than ttl should be dropped and reloaded on next use."""
+        index = RunEmbeddingIndex(ttl=-1)
+        index.seed(("run", "ERROR"), [])
 
-        new_ts = datetime.now()
-        result = processor._mark_event_is_duplicate(run_id, new_ts, severity, embedding)
+        index.clear_expired()
 
-        assert result is True
+        assert len(index) == 0
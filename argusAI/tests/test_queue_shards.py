@@ -0,0 +1,203 @@
+"""
+Tests for sharded consumption of the SCT unprocessed events queue
+
+Test coverage:
+1. Token ring split into shards
+2. Lease acquisition, renewal, takeover and release
+3. Processor fetching events from owned shards only
+4. Eviction of indexed runs of shards changing owner
+"""
+
+from datetime import datetime
+from unittest.mock import MagicMock, Mock, patch
+from uuid import uuid4
+
+import pytest
+from cassandra.metadata import Murmur3Token
+
+from argusAI.event_similarity_processor_v2 import EVENTS_PROCESSED, EventSimilarityProcessorV2
+from argusAI.utils.queue_shards import MAX_TOKEN, MIN_TOKEN, ShardLeases, token_ranges
+
+
+class TestTokenRanges:
+    """Tests for splitting the token ring."""
+
+    @pytest.mark.parametrize("total_shards", [1, 3, 8])
+    def test_token_ranges_should_cover_ring_without_overlap(self, total_shards):
+        """Ranges should be contiguous and cover the whole Murmur3 token ring."""
+        ranges = token_ranges(total_shards)
+
+        assert len(ranges) == total_shards
+        assert ranges[0][0] == MIN_TOKEN
+        assert ranges[-1][1] == MAX_TOKEN
+        for (_, end), (start, _) in zip(ranges, ranges[1:]):
+            assert start == end + 1
+
+
+class TestShardLeases:
+    """Tests for lease handling of queue shards."""
+
+    @staticmethod
+    def lwt_result(applied: bool) -> Mock:
+        return Mock(was_applied=applied)
+
+    def test_heartbeat_should_acquire_free_shards_up_to_limit(self):
+        """Heartbeat should claim free shards until the worker owns max_shards."""
+        db = MagicMock()
+        db.execute.side_effect = lambda query, params: self.lwt_result(params[0] != 1)
+        leases = ShardLeases(db, total_shards=4, max_shards=2, owner="worker-a")
+
+        leases.heartbeat()
+
+        assert len(leases.owned) == 2
+        assert 1 not in leases.owned
+        assert all("IF NOT EXISTS" in call[0][0] for call in db.execute.call_args_list)
+
+    def test_heartbeat_should_drop_shards_taken_over_by_other_worker(self):
+        """A lease that can't be renewed should no longer be consumed and a free shard should be claimed."""
+        db = MagicMock()
+        leases = ShardLeases(db, total_shards=2, max_shards=1, owner="worker-a")
+        leases.owned = {0}
+
+        def execute(query, params):
+            if query.startswith("UPDATE"):
+                return self.lwt_result(False)
+            return self.lwt_result(params[0] == 1)
+
+        db.execute.side_effect = execute
+
+        leases.heartbeat()
+
+        assert leases.owned == {1}
+        assert leases.owned_ranges() == [(1, leases.ranges[1])]
+
+    def test_heartbeat_should_rewrite_owner_when_renewing(self):
+        """Renewal should rewrite owner with the new TTL, otherwise the owner cell expires and the lease is lost."""
+        db = MagicMock()
+        db.execute.return_value = self.lwt_result(True)
+        leases = ShardLeases(db, total_shards=1, max_shards=1, owner="worker-a", ttl=30)
+        leases.owned = {0}
+
+        leases.heartbeat()
+
+        query, params = db.execute.call_args_list[0][0]
+        assert "USING TTL 30 SET owner = ?, heartbeat_at = ?" in query
+        assert query.endswith("IF owner = ?")
+        assert params[0] == "worker-a"
+        assert params[2:] == (0, "worker-a")
+        assert leases.owned == {0}
+
+    def test_heartbeat_should_keep_shards_when_renewal_errors(self):
+        """Database errors during renewal should not drop owned shards."""
+        db = MagicMock()
+        db.execute.side_effect = Exception("timeout")
+        leases = ShardLeases(db, total_shards=2, max_shards=1, owner="worker-a")
+        leases.owned = {0}
+
+        leases.heartbeat()
+
+        assert leases.owned == {0}
+
+    def test_heartbeat_should_report_lost_and_acquired_shards(self):
+        """on_change should get the shards whose ownership changed, renewed shards are left out."""
+        db = MagicMock()
+        changes = []
+        leases = ShardLeases(db, total_shards=4, max_shards=2, owner="worker-a", on_change=changes.append)
+        leases.owned = {0, 1}
+
+        def execute(query, params):
+            if query.startswith("UPDATE"):
+                return self.lwt_result(params[2] != 1)
+            return self.lwt_result(params[0] == 3)
+
+        db.execute.side_effect = execute
+
+        leases.heartbeat()
+        leases.heartbeat()
+
+        assert leases.owned == {0, 3}
+        assert changes == [{1, 3}]
+
+    def test_shard_of_should_match_token_ranges(self):
+        """Runs should map to the shard whose token range holds the Murmur3 token of run_id."""
+        leases = ShardLeases(MagicMock(), total_shards=8, max_shards=1, owner="worker-a")
+
+        for _ in range(100):
+            run_id = uuid4()
+            start, end = leases.ranges[leases.shard_of(run_id)]
+            assert start <= Murmur3Token.hash_fn(run_id.bytes) <= end
+
+    def test_release_should_delete_owned_leases(self):
+        """Release should conditionally delete every owned lease."""
+        db = MagicMock()
+        leases = ShardLeases(db, total_shards=4, max_shards=2, owner="worker-a")
+        leases.owned = {0, 3}
+
+        leases.release()
+
+        assert [call[0][1] for call in db.execute.call_args_list] == [(0, "worker-a"), (3, "worker-a")]
+        assert leases.owned == set()
+
+
+class TestShardedProcessor:
+    """Tests for processors consuming owned shards."""
+
+    @pytest.fixture
+    def processor(self):
+        """Create sharded processor with mocked dependencies."""
+        with (
+            patch("argusAI.event_similarity_processor_v2.ScyllaConnection") as mock_scylla,
+            patch("argusAI.event_similarity_processor_v2.BgeSmallEnEmbeddingModel"),
+            patch("argusAI.event_similarity_processor_v2.MessageSanitizer"),
+        ):
+            mock_scylla.return_value = MagicMock()
+            processor = EventSimilarityProcessorV2(total_shards=4, max_shards=2, worker=f"test-{uuid4().hex}")
+            return processor
+
+    def test_fetch_should_read_owned_token_ranges_only(self, processor):
+        """Events should be fetched per owned shard with the batch size split between shards."""
+        processor.leases.owned = {1, 2}
+        processor.db.execute.return_value = [Mock(run_id=uuid4(), severity="ERROR", ts=datetime.now())]
+
+        events = processor._fetch_unprocessed_events(batch_size=100)
+
+        assert len(events) == 2
+        queries = processor.db.execute.call_args_list
+        assert all("token(run_id) >= ?" in call[0][0] and "LIMIT 50" in call[0][0] for call in queries)
+        assert [call[0][1] for call in queries] == [processor.leases.ranges[1], processor.leases.ranges[2]]
+
+    def test_fetch_should_return_nothing_without_leases(self, processor):
+        """A worker that owns no shards should not consume the queue."""
+        assert processor._fetch_unprocessed_events(batch_size=100) == []
+        assert not processor.db.execute.called
+
+    def test_shutdown_should_release_leases(self, processor):
+        """Shutdown should give up owned shards so other workers can take them over right away."""
+        processor.leases.owned = {1}
+
+        processor.shutdown()
+
+        assert processor.leases.owned == set()
+        assert processor.db.execute.call_args[0][0].startswith("DELETE")
+
+    def test_changed_shards_should_evict_their_indexed_runs(self, processor):
+        """Indexed runs of lost or re-acquired shards should be dropped, runs of other shards kept."""
+        run_ids = [uuid4() for _ in range(20)]
+        for run_id in run_ids:
+            processor.run_embeddings.seed((run_id, "ERROR"), [])
+        changed_shard = processor.leases.shard_of(run_ids[0])
+
+        processor._evict_shard_runs({changed_shard})
+
+        for run_id in run_ids:
+            evicted = processor.leases.shard_of(run_id) == changed_shard
+            assert ((run_id, "ERROR") in processor.run_embeddings) is not evicted
+
+    def test_export_metrics_should_count_processed_events(self, processor):
+        """Processed event counter should follow processor counts."""
+        processor.processed_count = 3
+        processor._export_metrics()
+        processor.processed_count = 5
+        processor._export_metrics()
+
+        assert EVENTS_PROCESSED.labels(worker=processor.worker)._value.get() == 5
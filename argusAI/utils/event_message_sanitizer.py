@@ -1,8 +1,11 @@
+import hashlib
+import logging
 import os
 import re
-from datetime import datetime
+from collections import OrderedDict
+from logging.handlers import MemoryHandler, RotatingFileHandler
 
-from typing import Pattern, List, Callable
+from typing import Iterable, Pattern, List, Callable
 from uuid import UUID
 
 
@@ -11,10 +14,11 @@ class MessageSanitizer:
     A class used to sanitize event messages by removing or replacing sensitive information
     such as IP addresses, URLs, file paths, and other identifiable data.
 
-    Sanitized messages are written to a file for further analysis.
+    Sanitized output is memoized by message hash, since the same messages are often repeated many times.
+    Sanitized messages can optionally be written to a rotating audit log for further analysis.
     """
 
-    def __init__(self):
+    def __init__(self, audit_log_path: str | None = None, memo_size: int = 4096):
         self.event_pattern: Pattern = re.compile(r"Severity\.(ERROR|CRITICAL|WARNING|INFO)\)")
         self.event_id_pattern: Pattern = re.compile(
             r"(?:event_id=)?[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}"
@@ -63,6 +67,7 @@ class MessageSanitizer:
         self.special_chars = re.compile(r"[|[\]:,]")
         self.eol_pattern = re.compile(r"\\n")
         self.backslashes_pattern = re.compile(r"\\")
+        self.escapes_pattern = re.compile(r"\\n|\\")
         self.repetitions_pattern = re.compile(r"(\b\w+\b)(?:\s+\1)+")
         self.backtrace_unwanted_lines = {
             "seastar::backtrace",
@@ -108,18 +113,83 @@ class MessageSanitizer:
             self.remove_special_chars,
             self.normalize_whitespace,
         ]
-        os.makedirs("logs", exist_ok=True)
-        self.sanitized_messages_fp = open(
-            "logs/sanitized_messages_" + datetime.now().strftime("%Y-%m-%d_%H-%M-%S") + ".log", "w"
-        )
+        # Compiled form of self.sanitizers producing the same output: a step is skipped when the text contains
+        # none of its literals, as every match of its patterns needs one of them, and remove_eol and
+        # remove_backslashes run as a single pass.
+        self.steps: List[tuple[tuple[str, ...], Callable[[str], str]]] = [
+            (("(",), self.remove_preface),
+            (("+",), self.remove_iso_timestamps),
+            (("Severity.",), self.remove_severity_levels),
+            (("period_type=", "node=", "executable=/", "line_number"), self.remove_specific_fields),
+            (("-",), self.remove_event_ids),
+            ((".", ":"), self.remove_ip_addresses),
+            (("://",), self.remove_urls),
+            ((":",), self.remove_metadata),
+            (("backtrace",), self.remove_backtrace_unwanted_lines),
+            ((" from rpm ",), self.remove_modules),
+            (("message",), self.remove_message_prefix),
+            (("Please report: at ",), self.remove_report_at),
+            ((" + 0x",), self.remove_lib_address),
+            (("[scylla[",), self.remove_process_ids),
+            (("0x",), self.remove_memory_addresses),
+            (('File "', "Traceback (most recent call last):"), self.truncate_traceback),
+            (("0x", "Stack trace of thread "), self.simplify_stack_trace),
+            (("(", "="), self.remove_redundant_punctuation),
+            (("'", '"'), self.remove_quotes),
+            (("\\",), self.remove_escapes),
+            ((), self.truncate_long_words),
+            (("-node-",), self.remove_node_names),
+            (("/scylla/data/",), self.remove_scylla_data_paths),
+            (("/scylla-cluster-tests/",), self.remove_sct_paths),
+            ((), self.remove_repetitions),
+            ((".",), self.simplify_namespaces),
+            (("+",), self.remove_iso_timestamps),
+            (("|", "[", "]", ":", ","), self.remove_special_chars),
+            ((), self.normalize_whitespace),
+        ]
+        self.memo_size = memo_size
+        self._memo: OrderedDict[bytes, str] = OrderedDict()
+        self.audit_log: logging.Logger | None = None
+        if audit_log_path:
+            os.makedirs(os.path.dirname(audit_log_path) or ".", exist_ok=True)
+            file_handler = RotatingFileHandler(audit_log_path, maxBytes=50 * 1024 * 1024, backupCount=5)
+            file_handler.setFormatter(logging.Formatter("%(message)s"))
+            self.audit_log = logging.Logger("argusAI.sanitized_messages")
+            self.audit_log.addHandler(MemoryHandler(capacity=1000, flushLevel=logging.ERROR, target=file_handler))
 
     def sanitize(self, run_id: UUID, message: str) -> str:
+        key = hashlib.blake2b(message.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+        result = self._memo.get(key)
+        if result is None:
+            result = self._sanitize(message)
+            self._memo[key] = result
+            if len(self._memo) > self.memo_size:
+                self._memo.popitem(last=False)
+        else:
+            self._memo.move_to_end(key)
+        if self.audit_log:
+            self.audit_log.info("%s: %s", run_id, result)
+        return result
+
+    def sanitize_batch(self, messages: Iterable[tuple[UUID, str]]) -> list[str]:
+        """Sanitize (run_id, message) pairs, repeated messages are sanitized only once."""
+        return [self.sanitize(run_id, message) for run_id, message in messages]
+
+    def _sanitize(self, message: str) -> str:
         result = message
-        for sanitizer in self.sanitizers:
-            result = sanitizer(result)
-        self.sanitized_messages_fp.write(f"{run_id}: {result}\n")
+        for literals, sanitizer in self.steps:
+            if not literals or any(literal in result for literal in literals):
+                result = sanitizer(result)
         return result
 
+    def close(self) -> None:
+        """Flush and close the audit log."""
+        if self.audit_log:
+            for handler in self.audit_log.handlers:
+                handler.flush()
+                handler.target.close()
+                handler.close()
+
     def remove_preface(self, text: str) -> str:
         try:
             date = text.split(" ", 1)[0]
@@ -227,6 +297,10 @@ class MessageSanitizer:
     def remove_eol(self, text: str) -> str:
         return self.eol_pattern.sub(" ", text)
 
+    def remove_escapes(self, text: str) -> str:
+        """Same as remove_eol followed by remove_backslashes, in a single pass."""
+        return self.escapes_pattern.sub(lambda match: " " if len(match.group()) == 2 else "", text)
+
     def remove_repetitions(self, text: str) -> str:
         return self.repetitions_pattern.sub(r"\1", text)
 
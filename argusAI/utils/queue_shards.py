@@ -0,0 +1,112 @@
+import bisect
+import logging
+import os
+import socket
+import zlib
+from datetime import datetime, UTC
+from typing import Callable
+from uuid import UUID, uuid4
+
+from cassandra.metadata import Murmur3Token
+
+from argus.backend.plugins.sct.testrun import SCTUnprocessedEventLease
+from argusAI.utils.scylla_connection import ScyllaConnection
+
+LOGGER = logging.getLogger(__name__)
+MIN_TOKEN = -(2**63)
+MAX_TOKEN = 2**63 - 1
+
+TokenRange = tuple[int, int]
+
+
+def token_ranges(total_shards: int) -> list[TokenRange]:
+    """
+    Split the Murmur3 token ring into `total_shards` contiguous, inclusive (start, end) ranges.
+    All events of a run share a partition key and therefore always land in the same shard.
+    """
+    step = (MAX_TOKEN - MIN_TOKEN) // total_shards
+    starts = [MIN_TOKEN + shard * step for shard in range(total_shards)]
+    return [(start, end - 1) for start, end in zip(starts, starts[1:])] + [(starts[-1], MAX_TOKEN)]
+
+
+class ShardLeases:
+    """
+    Tracks the queue shards owned by one processor worker.
+
+    Shards are claimed with a lightweight transaction and a TTL on SCTUnprocessedEventLease rows.
+    Every heartbeat renews owned leases, drops the ones taken over by another worker and claims
+    free shards up to `max_shards`, which is how shards of crashed workers get picked up.
+    `on_change` is called with the shards lost or acquired by a heartbeat, other workers may have
+    consumed their events while this one didn't own them.
+    """
+
+    def __init__(self, db: ScyllaConnection, total_shards: int, max_shards: int, ttl: int = 60,
+                 owner: str | None = None, on_change: Callable[[set[int]], None] | None = None) -> None:
+        self.db = db
+        self.on_change = on_change
+        self.total_shards = total_shards
+        self.max_shards = max_shards
+        self.ttl = ttl
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+        self.owned: set[int] = set()
+        self.ranges = token_ranges(total_shards)
+        self._range_starts = [start for start, _ in self.ranges]
+        table = SCTUnprocessedEventLease.__table_name__
+        self._acquire_query = (
+            f"INSERT INTO {table} (shard, owner, heartbeat_at) VALUES (?, ?, ?) IF NOT EXISTS USING TTL {ttl}"
+        )
+        # owner is rewritten too, so its TTL is extended along with heartbeat_at instead of expiring
+        # ttl seconds after the shard was acquired
+        self._renew_query = (
+            f"UPDATE {table} USING TTL {ttl} SET owner = ?, heartbeat_at = ? WHERE shard = ? IF owner = ?"
+        )
+        self._release_query = f"DELETE FROM {table} WHERE shard = ? IF owner = ?"
+
+    def heartbeat(self) -> None:
+        """Renew owned leases and claim free shards until `max_shards` are owned."""
+        changed: set[int] = set()
+        for shard in sorted(self.owned):
+            try:
+                params = (self.owner, datetime.now(UTC), shard, self.owner)
+                renewed = self.db.execute(self._renew_query, params).was_applied
+            except Exception:
+                LOGGER.warning("Failed to renew lease on queue shard %s", shard, exc_info=True)
+                continue
+            if not renewed:
+                LOGGER.warning("Lost lease on queue shard %s to another worker", shard)
+                self.owned.discard(shard)
+                changed.add(shard)
+
+        # Start from a different shard per owner so that workers don't race for the same leases
+        offset = zlib.crc32(self.owner.encode()) % self.total_shards
+        for idx in range(self.total_shards):
+            if len(self.owned) >= self.max_shards:
+                break
+            shard = (offset + idx) % self.total_shards
+            if shard in self.owned:
+                continue
+            try:
+                if self.db.execute(self._acquire_query, (shard, self.owner, datetime.now(UTC))).was_applied:
+                    LOGGER.info("Acquired lease on queue shard %s", shard)
+                    self.owned.add(shard)
+                    changed.add(shard)
+            except Exception:
+                LOGGER.warning("Failed to acquire lease on queue shard %s", shard, exc_info=True)
+        if changed and self.on_change:
+            self.on_change(changed)
+
+    def release(self) -> None:
+        for shard in sorted(self.owned):
+            try:
+                self.db.execute(self._release_query, (shard, self.owner))
+            except Exception:
+                LOGGER.warning("Failed to release lease on queue shard %s", shard, exc_info=True)
+        self.owned.clear()
+
+    def owned_ranges(self) -> list[tuple[int, TokenRange]]:
+        return [(shard, self.ranges[shard]) for shard in sorted(self.owned)]
+
+    def shard_of(self, run_id: UUID) -> int:
+        """Shard holding the queue partition of the run, computed from the Murmur3 token of run_id."""
+        token = Murmur3Token.hash_fn(run_id.bytes)
+        return bisect.bisect_right(self._range_starts, token) - 1
@@ -0,0 +1,159 @@
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable, Iterable
+from uuid import UUID
+
+import numpy as np
+
+RunKey = tuple[UUID, str]
+
+
+class _RunEmbeddings:
+    """Unit-normalized embeddings of one run and severity, stored as rows of a growable matrix."""
+
+    def __init__(self) -> None:
+        self.matrix: np.ndarray | None = None
+        self.timestamps: list[datetime] = []
+        self.accessed_at = time.monotonic()
+
+    def append(self, ts: datetime, embedding: np.ndarray) -> None:
+        count = len(self.timestamps)
+        if self.matrix is None:
+            self.matrix = np.empty((16, embedding.shape[0]), dtype=np.float32)
+        elif count == self.matrix.shape[0]:
+            self.matrix = np.concatenate([self.matrix, np.empty_like(self.matrix)])
+        self.matrix[count] = embedding
+        self.timestamps.append(ts)
+
+    def remove(self, ts: datetime) -> None:
+        keep = [idx for idx, row_ts in enumerate(self.timestamps) if row_ts != ts]
+        if len(keep) == len(self.timestamps):
+            return
+        self.matrix = self.matrix[keep] if keep else None
+        self.timestamps = [self.timestamps[idx] for idx in keep]
+
+    def rows(self) -> np.ndarray:
+        return self.matrix[:len(self.timestamps)]
+
+
+def normalize(embedding: Iterable[float]) -> np.ndarray:
+    vector = np.asarray(embedding, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+class RunEmbeddingIndex:
+    """
+    Bounded LRU of per-run embedding matrices used for duplicate detection.
+
+    Duplicates are only searched within the same run and severity, so each (run_id, severity) entry holds
+    the embeddings of that run. Entries are seeded from the embedding table partition of the run the first
+    time it is seen, appended to as new events are stored, and dropped when the run has been idle for `ttl`
+    seconds or when more than `max_runs` runs are active.
+    """
+
+    def __init__(self, max_runs: int = 256, ttl: float = 3600) -> None:
+        self.max_runs = max_runs
+        self.ttl = ttl
+        self._runs: OrderedDict[RunKey, _RunEmbeddings] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, key: RunKey) -> bool:
+        with self._lock:
+            return key in self._runs
+
+    def __len__(self) -> int:
+        return len(self._runs)
+
+    def seed(self, key: RunKey, rows: Iterable[tuple[datetime, Iterable[float]]]) -> None:
+        """Replace the embeddings of a run with the rows (ts, embedding) read from the database."""
+        entry = _RunEmbeddings()
+        for ts, embedding in rows:
+            entry.append(ts, normalize(embedding))
+        with self._lock:
+            self._runs[key] = entry
+            self._runs.move_to_end(key)
+            while len(self._runs) > self.max_runs:
+                self._runs.popitem(last=False)
+
+    def add(self, key: RunKey, ts: datetime, embedding: Iterable[float]) -> None:
+        """Append an embedding to a seeded run, unseeded runs are loaded with it from the database later."""
+        with self._lock:
+            if entry := self._runs.get(key):
+                entry.append(ts, normalize(embedding))
+                entry.accessed_at = time.monotonic()
+
+    def remove(self, key: RunKey, ts: datetime) -> None:
+        with self._lock:
+            if entry := self._runs.get(key):
+                entry.remove(ts)
+
+    def find_duplicate(self, key: RunKey, embedding: Iterable[float], max_distance: float) -> datetime | None:
+        """
+        Return the timestamp of the most similar embedding of the run if its cosine distance
+        to `embedding` is below `max_distance`, computed as a single matrix-vector product.
+        """
+        with self._lock:
+            entry = self._runs.get(key)
+            if not entry or not entry.timestamps:
+                return None
+            self._runs.move_to_end(key)
+            entry.accessed_at = time.monotonic()
+            similarities = entry.rows() @ normalize(embedding)
+            best = int(np.argmax(similarities))
+            if 1.0 - similarities[best] < max_distance:
+                return entry.timestamps[best]
+        return None
+
+    def evict(self, predicate: Callable[[RunKey], bool]) -> int:
+        """Drop the runs matching `predicate`, they are seeded again from the database on next use."""
+        with self._lock:
+            keys = [key for key in self._runs if predicate(key)]
+            for key in keys:
+                del self._runs[key]
+        return len(keys)
+
+    def clear_expired(self) -> None:
+        deadline = time.monotonic() - self.ttl
+        with self._lock:
+            for key in [key for key, entry in self._runs.items() if entry.accessed_at < deadline]:
+                del self._runs[key]
+
+
+def find_duplicates(embeddings: list[Iterable[float]], max_distance: float, block_size: int = 256) -> list[int | None]:
+    """
+    Find duplicates among the embeddings of one run and severity, ordered by event timestamp.
+
+    Gives the same result as checking the events one by one against a RunEmbeddingIndex holding the
+    non-duplicate events: for each embedding returns the index of the most similar earlier non-duplicate
+    embedding when their cosine distance is below `max_distance`, otherwise None. Similarities are computed
+    with one matrix product per block of `block_size` rows to keep memory bounded for large runs.
+    """
+    if not embeddings:
+        return []
+    matrix = np.stack([normalize(embedding) for embedding in embeddings])
+    kept = np.zeros(len(matrix), dtype=bool)
+    duplicates: list[int | None] = []
+    for start in range(0, len(matrix), block_size):
+        rows = matrix[start:start + block_size]
+        kept_before = np.flatnonzero(kept[:start])
+        previous = rows @ matrix[kept_before].T
+        inner = rows @ rows.T
+        for offset in range(len(rows)):
+            best, best_similarity = None, -np.inf
+            if kept_before.size:
+                column = int(np.argmax(previous[offset]))
+                best, best_similarity = int(kept_before[column]), previous[offset, column]
+            kept_inner = np.flatnonzero(kept[start:start + offset])
+            if kept_inner.size:
+                column = int(kept_inner[np.argmax(inner[offset, kept_inner])])
+                if inner[offset, column] > best_similarity:
+                    best, best_similarity = start + column, inner[offset, column]
+            if best is not None and 1.0 - best_similarity < max_distance:
+                duplicates.append(best)
+            else:
+                kept[start + offset] = True
+                duplicates.append(None)
+    return duplicates
@@ -1,5 +1,6 @@
 import logging
 from cassandra.cluster import Cluster, ExecutionProfile, EXEC_PROFILE_DEFAULT
+from cassandra.concurrent import ExecutionResult, execute_concurrent_with_args
 from cassandra.policies import WhiteListRoundRobinPolicy
 from cassandra.auth import PlainTextAuthProvider
 from cassandra.query import ConsistencyLevel
@@ -52,17 +53,21 @@ class ScyllaConnection:
             LOGGER.error(f"Failed to initialize ScyllaDB connection: {e}")
             raise
 
+    def prepare(self, query: str, fetch_size=10):
+        """Prepare a query once and return the cached prepared statement."""
+        if query not in self.prepared_statements:
+            prepared = self.session.prepare(query)
+            prepared.consistency_level = ConsistencyLevel.QUORUM
+            prepared.fetch_size = fetch_size
+            self.prepared_statements[query] = prepared
+            LOGGER.debug(f"Prepared and cached new statement: {query}")
+
+        return self.prepared_statements[query]
+
     def execute(self, query: str, params: tuple = None, fetch_size=10):
         """Execute a query, handling unprepared statements by re-preparing if needed."""
         try:
-            if query not in self.prepared_statements:
-                prepared = self.session.prepare(query)
-                prepared.consistency_level = ConsistencyLevel.QUORUM
-                prepared.fetch_size = fetch_size
-                self.prepared_statements[query] = prepared
-                LOGGER.debug(f"Prepared and cached new statement: {query}")
-
-            prepared_statement = self.prepared_statements[query]
+            prepared_statement = self.prepare(query, fetch_size)
             return self.session.execute(prepared_statement, params)
         except PreparedQueryNotFound as e:
             # Handle case where the prepared statement is no longer valid on the server
@@ -83,6 +88,18 @@ class ScyllaConnection:
             LOGGER.error(f"Error type: {type(e)}")
             LOGGER.error(f"Params: {params}")
 
+    def execute_concurrent(self, query: str, params: list[tuple], concurrency: int = 50) -> list[ExecutionResult]:
+        """
+        Execute a query once per parameter tuple with at most `concurrency` requests in flight.
+        Returns (success, result_or_exception) pairs in the order of params; failures are not raised.
+        """
+        if not params:
+            return []
+        prepared_statement = self.prepare(query)
+        return execute_concurrent_with_args(
+            self.session, prepared_statement, params, concurrency=concurrency, raise_on_first_error=False
+        )
+
     def shutdown(self):
         """Properly shut down the ScyllaDB session and cluster."""
         try: